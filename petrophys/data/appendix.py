@@ -0,0 +1,184 @@
+import re
+from pathlib import Path
+
+import pandas as pd
+
+
+# Normalised column names renamed to the names used across petrophys
+COLUMN_ALIASES = {
+    'put': 'well',
+    'youngs_modulus_e_gpa': 'youngs_modulus_gpa',
+    'bulk_modulus_kb_gpa': 'bulk_modulus_gpa',
+    'shear_modulus_mu_gpa': 'shear_modulus_gpa',
+    'poison_ratio_pr': 'poisson_ratio',
+    'tvdss_bottom_m': 'tvdss_bottom',
+    'pct_log_data_over_interval_for_e_kb_mu': 'pct_log_data_moduli',
+    'pct_log_data_over_interval_for_pr_vp_vs_vpvs_only_listed_if_'
+    'different_from_column_j': 'pct_log_data_velocities',
+}
+
+CATEGORICAL = ('well', 'lithology_type', 'target_formation',
+               'lithostratigraphic_group')
+
+
+def normalize_column(name):
+    """Return <name> as a snake_case identifier.
+
+    E.g. 'Young’s Modulus E (GPa)' becomes 'youngs_modulus_e_gpa' and
+    'TVCSS_Top' becomes 'tvcss_top'.
+    """
+    name = str(name).replace('%', ' pct ')
+    name = re.sub(r"[’'`]", '', name)
+    name = re.sub(r'[^0-9a-zA-Z]+', '_', name).strip('_').lower()
+    return name
+
+
+def _read_rows(path, sheet):
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        if isinstance(sheet, int):
+            worksheet = workbook.worksheets[sheet]
+        else:
+            worksheet = workbook[sheet]
+        header, records = None, []
+        for row in worksheet.iter_rows(values_only=True):
+            if all(value is None for value in row):
+                continue
+            if header is None:
+                header = row
+            else:
+                records.append(row)
+    finally:
+        workbook.close()
+    return header or (), records
+
+
+def _frame(header, records):
+    frame = pd.DataFrame.from_records(records, columns=range(len(header)))
+    names = {}
+    for i, name in enumerate(header):
+        if name is None:
+            if frame[i].isna().all():
+                continue
+            name = f'column_{i}'
+        name = normalize_column(name)
+        names[i] = COLUMN_ALIASES.get(name, name)
+    frame = frame[list(names)].rename(columns=names)
+
+    frame = frame.infer_objects()
+    for column in frame.columns:
+        if not pd.api.types.is_numeric_dtype(frame[column]):
+            frame[column] = frame[column].map(
+                lambda v: v.strip() if isinstance(v, str) else v)
+    return frame
+
+
+def _cache_file(path, sheet, cache_dir):
+    stat = path.stat()
+    sheet = normalize_column(sheet) if not isinstance(sheet, int) else sheet
+    cache_dir = Path(cache_dir) if cache_dir else path.parent / '.cache'
+    stem = f'{path.stem}-{sheet}'
+    return cache_dir, stem, f'{stem}-{stat.st_mtime_ns}-{stat.st_size}.pkl'
+
+
+def read_sheet(path, sheet=0, categorical=CATEGORICAL, cache_dir=None,
+               use_cache=True):
+    """Read one sheet of an Excel workbook with normalised columns.
+
+    The sheet is streamed with openpyxl in read-only mode. Empty rows and
+    empty unnamed columns are dropped, text is stripped and the columns
+    in <categorical> are encoded once as pandas categoricals. The result
+    is cached as a pickle that is rebuilt when the workbook changes.
+
+    Parameters
+    ----------
+    path: str or Path
+        Excel workbook
+    sheet: int or str
+        Index or name of the sheet
+        Default is 0
+    categorical: tuple of str
+        Normalised names of the columns to encode as categoricals
+        Default is CATEGORICAL
+    cache_dir: str or Path
+        Directory of the cached copies
+        Default is a .cache directory next to the workbook
+    use_cache: Boolean
+        Defines wether or not to read and write the cached copy
+        Default is True
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    path = Path(path)
+    if use_cache:
+        directory, stem, filename = _cache_file(path, sheet, cache_dir)
+        cached = directory / filename
+        if cached.exists():
+            return pd.read_pickle(cached)
+
+    frame = _frame(*_read_rows(path, sheet))
+    for column in categorical:
+        if column in frame.columns:
+            frame[column] = frame[column].astype('category')
+
+    if use_cache:
+        directory.mkdir(parents=True, exist_ok=True)
+        for stale in directory.glob(f'{stem}-*.pkl'):
+            stale.unlink()
+        frame.to_pickle(cached)
+    return frame
+
+
+def read_appendix_a(path, cache_dir=None, use_cache=True):
+    """Read appendix A, the list of wells and data files used.
+
+    The well name is only given on the first row of every well, it is
+    filled down so every data file row carries its well.
+
+    Parameters
+    ----------
+    path: str or Path
+        appendix_a_list_of_wells_and_data_files_used.xlsx
+    cache_dir: str or Path
+        See `read_sheet`
+    use_cache: Boolean
+        See `read_sheet`
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    frame = read_sheet(path, 0, categorical=(), cache_dir=cache_dir,
+                       use_cache=use_cache)
+    frame = frame.copy()
+    for column in ('well', 'target_formation'):
+        frame[column] = frame[column].ffill().astype('category')
+    return frame
+
+
+def read_appendix_b(path, cache_dir=None, use_cache=True):
+    """Read the summary data sheet of appendix B.
+
+    Columns are normalised, e.g. 'Young’s Modulus E (GPa)' becomes
+    youngs_modulus_gpa, 'TVCSS_Top' tvcss_top and 'Lithology_type'
+    lithology_type (categorical, use .cat.codes for colouring).
+
+    Parameters
+    ----------
+    path: str or Path
+        appendix_b_summary_data_sheet.xlsx
+    cache_dir: str or Path
+        See `read_sheet`
+    use_cache: Boolean
+        See `read_sheet`
+
+    Returns
+    -------
+    pd.DataFrame
+    """
+    return read_sheet(path, 'summary_data_sheet', cache_dir=cache_dir,
+                      use_cache=use_cache)
@@ -0,0 +1,239 @@
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+
+def _standardize(values):
+    """Scale every curve (row) to zero median and unit noise level."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[None, :]
+    with np.errstate(invalid='ignore'):
+        center = np.nanmedian(values, axis=1, keepdims=True)
+        # noise from the differences of neighbouring samples, robust to
+        # the bed boundaries themselves
+        noise = np.nanmedian(np.abs(np.diff(values, axis=1)), axis=1,
+                             keepdims=True) / (0.6745 * np.sqrt(2))
+    noise = np.where(np.isfinite(noise) & (noise > 0), noise, 1.0)
+    return (values - center) / noise
+
+
+def _cumulative(values):
+    # running sums of the values and counts with a leading 0
+    valid = ~np.isnan(values)
+    pad = ((0, 0), (1, 0))
+    return (np.pad(np.cumsum(np.where(valid, values, 0.0), axis=1), pad),
+            np.pad(np.cumsum(valid, axis=1), pad))
+
+
+def _explained(total, count):
+    # total**2 / count, the part of the sum of squares explained by a mean
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total * total / count, 0.0)
+
+
+def _best_split(sums, start, stop, min_samples):
+    """Return the gain and position of the best split of start:stop.
+
+    Splitting a segment lowers its sum of squared deviations by
+    sum(left**2 / n_left + right**2 / n_right - whole**2 / n_whole), read
+    from the running sums for all candidate splits at once.
+    """
+    if stop - start < 2 * min_samples:
+        return 0.0, None
+    s1, count = sums
+    splits = slice(start + min_samples, stop - min_samples + 1)
+    first, last = slice(start, start + 1), slice(stop, stop + 1)
+    left = _explained(s1[:, splits] - s1[:, first],
+                      count[:, splits] - count[:, first])
+    right = _explained(s1[:, last] - s1[:, splits],
+                       count[:, last] - count[:, splits])
+    whole = _explained(s1[:, last] - s1[:, first],
+                       count[:, last] - count[:, first])
+    gain = (left + right - whole).sum(axis=0)
+    best = int(np.argmax(gain))
+    return float(gain[best]), start + min_samples + best
+
+
+def segment(values, penalty=None, min_samples=5, max_beds=None):
+    """Find bed boundaries by binary segmentation on cumulative sums.
+
+    The curves are standardized by their noise level and the segment
+    costs (squared deviations from the bed mean) are read from running
+    sums, so every candidate split of a segment is scored in one
+    vectorized pass. The split with the largest gain over all segments is
+    made until no gain exceeds <penalty>.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis, NaN is ignored
+    penalty: float
+        Smallest cost reduction accepted for a new boundary
+        Default is 10 * ncurves * log(n), in squared noise levels
+    min_samples: integer
+        Thinnest bed in samples
+        Default is 5
+    max_beds: integer
+        Largest number of beds
+        Default is None (no limit)
+
+    Returns
+    -------
+    np.ndarray
+        Indices of the bed boundaries, starting with 0 and ending with n
+    """
+    values = _standardize(values)
+    ncurves, n = values.shape
+    if penalty is None:
+        penalty = 10.0 * ncurves * np.log(max(n, 2))
+    min_samples = max(int(min_samples), 1)
+    sums = _cumulative(values)
+
+    bounds = [0, n]
+    heap = []
+    gain, split = _best_split(sums, 0, n, min_samples)
+    if split is not None:
+        heap.append((-gain, split, 0, n))
+    while heap and (max_beds is None or len(bounds) - 1 < max_beds):
+        gain, split, start, stop = heapq.heappop(heap)
+        if -gain < penalty:
+            break
+        bounds.append(split)
+        for a, b in ((start, split), (split, stop)):
+            gain, split_ab = _best_split(sums, a, b, min_samples)
+            if split_ab is not None:
+                heapq.heappush(heap, (-gain, split_ab, a, b))
+    return np.array(sorted(bounds))
+
+
+def block_values(values, bounds):
+    """Return the NaN-aware mean of <values> in every bed.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    bounds: np.ndarray
+        Output of `segment`
+
+    Returns
+    -------
+    np.ndarray
+        One value per bed (per curve)
+    """
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    starts = bounds[:-1]
+    total = np.add.reduceat(np.where(valid, values, 0.0), starts, axis=-1)
+    count = np.add.reduceat(valid.astype(np.int64), starts, axis=-1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count > 0, total / count, np.nan)
+
+
+def step_curve(top, base, values):
+    """Return the points drawing per-bed <values> as a step track.
+
+    Parameters
+    ----------
+    top: np.ndarray
+        Top depth of every bed
+    base: np.ndarray
+        Base depth of every bed
+    values: np.ndarray
+        Value of every bed
+
+    Returns
+    -------
+    tuple of np.ndarray
+        x and depth of 2 points per bed, e.g. for
+        subplot_curve(xdata=x, ydata=depth)
+    """
+    depth = np.column_stack((top, base)).ravel()
+    return np.repeat(np.asarray(values, dtype=float), 2), depth
+
+
+def block_well(data, curves, depth='DEPT', penalty=None, min_samples=5,
+               max_beds=None):
+    """Segment the curves of a well into beds and average them per bed.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    curves: list of str
+        Curves segmented together, e.g. ['GR', 'RHOB']
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    penalty: float
+        See `segment`
+    min_samples: integer
+        See `segment`
+        Default is 5
+    max_beds: integer
+        See `segment`
+        Default is None
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per bed from shallow to deep with top, base and the mean
+        of every curve. The base of a bed is the top of the next, the
+        last base is the deepest sample.
+    """
+    depth_values = np.asarray(data[depth], dtype=float)
+    values = np.stack([np.asarray(data[c], dtype=float) for c in curves])
+    if depth_values[0] > depth_values[-1]:
+        # logged bottom up
+        depth_values, values = depth_values[::-1], values[:, ::-1]
+    bounds = segment(values, penalty, min_samples, max_beds)
+    means = block_values(values, bounds)
+    beds = pd.DataFrame({
+        'top': depth_values[bounds[:-1]],
+        'base': np.append(depth_values[bounds[1:-1]], depth_values[-1]),
+    })
+    for mnemonic, mean in zip(curves, means):
+        beds[mnemonic] = mean
+    return beds
+
+
+def blocked_curve(depth, beds, mnemonic):
+    """Return the blocked value of <mnemonic> at every sample of <depth>."""
+    depth = np.asarray(depth, dtype=float)
+    idx = np.searchsorted(beds['top'].to_numpy(), depth, side='right') - 1
+    values = beds[mnemonic].to_numpy(dtype=float)
+    return np.where(idx >= 0, values[np.clip(idx, 0, None)], np.nan)
+
+
+def block_field(wells, curves, max_workers=None, **kwargs):
+    """Run `block_well` on many wells in parallel.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset or mapping of curves
+    curves: list of str
+        See `block_well`
+    max_workers: int
+        Number of threads
+        Default is chosen by ThreadPoolExecutor
+    kwargs:
+        Passed to `block_well`
+
+    Returns
+    -------
+    pd.DataFrame
+        The beds of all wells with a well column
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {name: pool.submit(block_well, data, curves, **kwargs)
+                   for name, data in wells.items()}
+        beds = [future.result().assign(well=name)
+                for name, future in futures.items()]
+    if not beds:
+        return pd.DataFrame()
+    beds = pd.concat(beds, ignore_index=True)
+    return beds[['well'] + [c for c in beds.columns if c != 'well']]
@@ -0,0 +1,351 @@
+import sqlite3
+from pathlib import Path
+
+import lasio
+import numpy as np
+import pandas as pd
+
+from petrophys.data.store import well_name
+from petrophys.data.tops import read_tops
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS wells (
+    well TEXT PRIMARY KEY,
+    ubid TEXT,
+    top REAL,
+    base REAL,
+    step REAL,
+    null_value REAL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS aliases (
+    alias TEXT PRIMARY KEY,
+    well TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS curves (
+    well TEXT NOT NULL,
+    mnemonic TEXT NOT NULL,
+    unit TEXT,
+    top REAL,
+    base REAL,
+    source TEXT,
+    PRIMARY KEY (well, mnemonic, source)
+);
+CREATE TABLE IF NOT EXISTS cores (
+    well TEXT NOT NULL,
+    top REAL NOT NULL,
+    base REAL NOT NULL,
+    formation TEXT
+);
+CREATE TABLE IF NOT EXISTS tops (
+    well TEXT NOT NULL,
+    unit TEXT NOT NULL,
+    top REAL NOT NULL,
+    base REAL
+);
+CREATE TABLE IF NOT EXISTS files (
+    well TEXT NOT NULL,
+    file TEXT NOT NULL,
+    top REAL,
+    base REAL,
+    formation TEXT
+);
+CREATE INDEX IF NOT EXISTS curves_mnemonic ON curves (mnemonic, top, base);
+CREATE INDEX IF NOT EXISTS curves_well ON curves (well);
+CREATE INDEX IF NOT EXISTS cores_well ON cores (well, top, base);
+CREATE INDEX IF NOT EXISTS tops_unit ON tops (unit, well);
+CREATE INDEX IF NOT EXISTS files_well ON files (well);
+"""
+
+ALL_WELLS = ('SELECT well FROM wells UNION SELECT well FROM cores '
+             'UNION SELECT well FROM tops UNION SELECT well FROM files')
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _extreme(func, *values):
+    values = [v for v in values if v is not None]
+    return func(values) if values else None
+
+
+def _header(section, mnemonic):
+    return section[mnemonic].value if mnemonic in section.keys() else None
+
+
+class WellCatalog:
+    """Index of the wells, curves, cores and tops of a field in SQLite.
+
+    The index is built once from the LAS headers and the cores, tops and
+    appendix A files, after which selections such as "wells with RHOB and
+    cores between 3000 and 3200 m" are answered from the indexes without
+    opening any data file.
+
+    Well names of the different sources can be tied together with
+    `add_alias`, e.g. 'CAP-01' for 'CAPELLE-01'.
+
+    Parameters
+    ----------
+    path: str or Path
+        SQLite file of the catalog
+        Default is ':memory:'
+    """
+
+    def __init__(self, path=':memory:'):
+        self.path = str(path)
+        self.db = sqlite3.connect(self.path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def resolve(self, well):
+        """Return the catalog name of <well>, following aliases."""
+        row = self.db.execute('SELECT well FROM aliases WHERE alias = ?',
+                              (well,)).fetchone()
+        return row[0] if row else well
+
+    def add_alias(self, alias, well):
+        """Register <alias> as another name of <well>."""
+        with self.db:
+            self.db.execute('INSERT OR REPLACE INTO aliases VALUES (?, ?)',
+                            (alias, self.resolve(well)))
+
+    def add_las(self, path, well=None, headers_only=False):
+        """Index the ~Well header and curves of a LAS file.
+
+        Parameters
+        ----------
+        path: str or Path
+        well: str
+            Name of the well in the catalog
+            Default is derived from the WELL header
+        headers_only: Boolean
+            If true the data section is not read and curve depth ranges
+            are the STRT/STOP of the well, otherwise the depth range of
+            the non-absent values of every curve is indexed
+            Default is False
+
+        Returns
+        -------
+        str
+            Name of the well in the catalog
+        """
+        las = lasio.read(path, ignore_data=headers_only)
+        return self.index_las(las, path, well=well)
+
+    def index_las(self, las, source, well=None):
+        """Index an already read lasio dataset, see `add_las`.
+
+        Parameters
+        ----------
+        las: lasio dataset
+        source: str or Path
+            File the dataset was read from
+        well: str
+            Name of the well in the catalog
+            Default is derived from the WELL header
+
+        Returns
+        -------
+        str
+        """
+        well = self.resolve(well or well_name(las))
+        strt = _float(_header(las.well, 'STRT'))
+        stop = _float(_header(las.well, 'STOP'))
+        top, base = _extreme(min, strt, stop), _extreme(max, strt, stop)
+        ubid = _header(las.params, 'UBID') or _header(las.well, 'UBID')
+        source = str(Path(source))
+
+        curves = []
+        depth = np.asarray(las.index)
+        for curve in las.curves:
+            ctop, cbase = top, base
+            if depth.size:
+                missing = np.isnan(np.asarray(curve.data, dtype=float))
+                valid = depth[~missing]
+                if valid.size:
+                    ctop, cbase = float(valid.min()), float(valid.max())
+                else:
+                    ctop = cbase = None
+            curves.append((well, curve.mnemonic, curve.unit, ctop, cbase,
+                           source))
+
+        with self.db:
+            row = self.db.execute('SELECT top, base FROM wells WHERE well = ?',
+                                  (well,)).fetchone()
+            if row is not None:
+                # several files of one well: keep the union of the ranges
+                top = _extreme(min, top, row[0])
+                base = _extreme(max, base, row[1])
+            self.db.execute(
+                'INSERT OR REPLACE INTO wells VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (well, None if ubid is None else str(ubid), top, base,
+                 _float(_header(las.well, 'STEP')),
+                 _float(_header(las.well, 'NULL')), source))
+            self.db.executemany(
+                'INSERT OR REPLACE INTO curves VALUES (?, ?, ?, ?, ?, ?)',
+                curves)
+        return well
+
+    def add_cores(self, path, well):
+        """Index the core intervals of a cores file such as CAP-01_cores.csv.
+
+        Parameters
+        ----------
+        path: str or Path
+        well: str
+            Name or alias of the well
+        """
+        well = self.resolve(well)
+        frame = pd.read_csv(path).rename(columns=str.strip)
+        frame = frame.dropna(subset=['Top', 'Bottom'])
+        formation = frame['Formations'] if 'Formations' in frame else None
+        rows = [
+            (well, float(top), float(base),
+             None if formation is None else str(formation.iloc[i]).strip())
+            for i, (top, base) in enumerate(zip(frame['Top'],
+                                                frame['Bottom']))
+        ]
+        with self.db:
+            self.db.execute('DELETE FROM cores WHERE well = ?', (well,))
+            self.db.executemany('INSERT INTO cores VALUES (?, ?, ?, ?)', rows)
+
+    def add_tops(self, path, well):
+        """Index a stratigraphy file, e.g. Diepte_stratigrafische_eenheden.csv.
+
+        Parameters
+        ----------
+        path: str or Path
+        well: str
+            Name or alias of the well
+        """
+        well = self.resolve(well)
+        tops = read_tops(path)
+        rows = [(well, unit, float(top), _float(base)) for unit, top, base in
+                zip(tops['unit'], tops['top'], tops['base'])]
+        with self.db:
+            self.db.execute('DELETE FROM tops WHERE well = ?', (well,))
+            self.db.executemany('INSERT INTO tops VALUES (?, ?, ?, ?)', rows)
+
+    def add_appendix_a(self, frame):
+        """Index the well list of appendix A.
+
+        Parameters
+        ----------
+        frame: pd.DataFrame
+            Output of petrophys.data.appendix.read_appendix_a
+        """
+        rows = [
+            (self.resolve(str(well)), str(file), _float(top), _float(base),
+             None if pd.isna(formation) else str(formation))
+            for well, file, top, base, formation in zip(
+                frame['well'], frame['file_name'], frame['interval_top'],
+                frame['interval_base'], frame['target_formation'])
+            if not pd.isna(well) and not pd.isna(file)
+        ]
+        with self.db:
+            # indexing the appendix again replaces the files of its wells
+            self.db.executemany('DELETE FROM files WHERE well = ?',
+                                [(w,) for w in {row[0] for row in rows}])
+            self.db.executemany('INSERT INTO files VALUES (?, ?, ?, ?, ?)',
+                                rows)
+
+    def wells(self):
+        """Return the names of all wells known to the catalog."""
+        rows = self.db.execute(f'SELECT well FROM ({ALL_WELLS}) ORDER BY well')
+        return [row[0] for row in rows]
+
+    def select(self, curves=(), top=None, base=None, cores=False, unit=None,
+               wells=None):
+        """Return the wells matching all the given conditions.
+
+        Parameters
+        ----------
+        curves: list of str
+            Mnemonics the well must have (with data in the depth range)
+            Default is empty
+        top: float
+            Top of the depth range in m
+            Default is None
+        base: float
+            Base of the depth range in m
+            Default is None
+        cores: Boolean
+            If true the well must have a core in the depth range
+            Default is False
+        unit: str
+            Stratigraphic unit the well must have a top for
+            Default is None
+        wells: list of str
+            Only consider these wells (names or aliases)
+            Default is all wells
+
+        Returns
+        -------
+        list of str
+        """
+        low = -np.inf if top is None else float(top)
+        high = np.inf if base is None else float(base)
+
+        sql = [f'SELECT well FROM ({ALL_WELLS}) w WHERE 1']
+        args = []
+        for mnemonic in curves:
+            sql.append('AND EXISTS (SELECT 1 FROM curves c WHERE '
+                       'c.mnemonic = ? AND c.well = w.well '
+                       'AND c.top <= ? AND c.base >= ?)')
+            args += [mnemonic, high, low]
+        if cores:
+            sql.append('AND EXISTS (SELECT 1 FROM cores k WHERE '
+                       'k.well = w.well AND k.top <= ? AND k.base >= ?)')
+            args += [high, low]
+        if unit is not None:
+            sql.append('AND EXISTS (SELECT 1 FROM tops t WHERE '
+                       't.well = w.well AND t.unit = ?)')
+            args.append(unit)
+        if wells is not None:
+            names = [self.resolve(w) for w in wells]
+            sql.append(f'AND w.well IN ({", ".join("?" * len(names))})')
+            args += names
+        sql.append('ORDER BY w.well')
+        return [row[0] for row in self.db.execute(' '.join(sql), args)]
+
+    def sources(self, well, mnemonic=None):
+        """Return the LAS files of <well>, or only those with <mnemonic>."""
+        well = self.resolve(well)
+        if mnemonic is None:
+            rows = self.db.execute(
+                'SELECT DISTINCT source FROM curves WHERE well = ?', (well,))
+        else:
+            rows = self.db.execute(
+                'SELECT DISTINCT source FROM curves WHERE well = ? '
+                'AND mnemonic = ?', (well, mnemonic))
+        return [row[0] for row in rows]
+
+    def curve_range(self, well, mnemonic):
+        """Return (top, base) of the data of <mnemonic> in <well>."""
+        row = self.db.execute(
+            'SELECT MIN(top), MAX(base) FROM curves WHERE well = ? '
+            'AND mnemonic = ?', (self.resolve(well), mnemonic)).fetchone()
+        return row
+
+    def unit_interval(self, well, unit):
+        """Return (top, base) of stratigraphic <unit> in <well>.
+
+        The unit name is case insensitive, like tops.top_depth.
+        """
+        return self.db.execute(
+            'SELECT top, base FROM tops WHERE well = ? '
+            'AND unit = ? COLLATE NOCASE',
+            (self.resolve(well), unit.strip())).fetchone()
@@ -0,0 +1,132 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+# Dutch headers of the core measurement exports mapped to canonical names
+CORE_COLUMNS = {
+    'nummer': 'plug',
+    'deipte (m)': 'depth',
+    'diepte (m)': 'depth',
+    'Porositeit (%)': 'porosity',
+    'hor. Perm (mD)': 'permeability',
+    'Korreldichtheid (g/cm³)': 'grain_density',
+}
+
+# values written for a missing measurement
+CORE_NA_VALUES = ['-', '--', '']
+
+
+def plug_name(plugs):
+    """Return the plug names without the variant suffix, K-0001C -> K-0001.
+
+    Parameters
+    ----------
+    plugs: pd.Series of str
+
+    Returns
+    -------
+    pd.Series of str
+    """
+    return plugs.str.strip().str.replace(r'[A-Za-z]+$', '', regex=True)
+
+
+def aggregate_plugs(frame):
+    """Combine the variants of a plug (K-0001, K-0001C, K-0001N) per depth.
+
+    Porosity and grain density are averaged, permeability is averaged
+    geometrically. Absent values are ignored.
+
+    Parameters
+    ----------
+    frame: pd.DataFrame
+        Output of `read_core_measurements` with aggregate=False
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per plug and depth with the number of variants in plugs
+    """
+    frame = frame.assign(plug=plug_name(frame['plug']))
+    if 'permeability' in frame:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_perm = np.log10(frame['permeability'].where(
+                frame['permeability'] > 0))
+        frame = frame.assign(permeability=log_perm)
+    columns = [c for c in frame.columns if c not in ('plug', 'depth')
+               and pd.api.types.is_numeric_dtype(frame[c])]
+    groups = frame.groupby(['plug', 'depth'], sort=False)
+    result = groups[columns].mean()
+    result['plugs'] = groups.size()
+    if 'permeability' in result:
+        result['permeability'] = 10 ** result['permeability']
+    return result.reset_index().sort_values('depth', ignore_index=True)
+
+
+def read_core_measurements(path, aggregate=True):
+    """Read a core measurement file such as CAP-01_kernmetingen.csv.
+
+    The measurements are parsed straight into float columns with '-'
+    read as NaN, and the Dutch headers renamed to plug, depth, porosity
+    (%), permeability (mD) and grain_density (g/cm3). The result can be
+    passed on directly, e.g.
+    petro_measure_curve(lasfile, km['depth'], km['grain_density'],
+    km['porosity'], cores).
+
+    Parameters
+    ----------
+    path: str or Path
+    aggregate: Boolean
+        If true the variants of a plug are combined, see `aggregate_plugs`
+        Default is True
+
+    Returns
+    -------
+    pd.DataFrame
+        Sorted by depth
+    """
+    dtypes = {header: float for header, name in CORE_COLUMNS.items()
+              if name != 'plug'}
+    dtypes.update({header: str for header, name in CORE_COLUMNS.items()
+                   if name == 'plug'})
+    frame = pd.read_csv(path, na_values=CORE_NA_VALUES,
+                        keep_default_na=False, dtype=dtypes)
+    frame = frame.rename(columns=lambda c: CORE_COLUMNS.get(c.strip(), c))
+    frame = frame.dropna(subset=['depth'])
+    if aggregate:
+        return aggregate_plugs(frame)
+    return frame.sort_values('depth', ignore_index=True)
+
+
+def read_core_files(paths, aggregate=True, max_workers=None):
+    """Read many core measurement files in parallel into one frame.
+
+    Parameters
+    ----------
+    paths: list of str or Path
+        Files named <well>_kernmetingen.csv
+    aggregate: Boolean
+        See `read_core_measurements`
+        Default is True
+    max_workers: int
+        Number of threads
+        Default is chosen by ThreadPoolExecutor
+
+    Returns
+    -------
+    pd.DataFrame
+        The measurements of all files with a categorical well column
+    """
+    paths = [Path(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        frames = list(pool.map(
+            lambda p: read_core_measurements(p, aggregate=aggregate), paths))
+    if not frames:
+        return pd.DataFrame()
+    names = [p.stem.split('_')[0] for p in paths]
+    wells = np.repeat(names, [len(f) for f in frames])
+    frame = pd.concat(frames, ignore_index=True)
+    frame.insert(0, 'well', pd.Categorical(wells))
+    return frame
@@ -0,0 +1,289 @@
+import ast
+import hashlib
+
+import numpy as np
+
+
+# Functions available inside expressions, all elementwise
+FUNCTIONS = {
+    'abs': np.abs,
+    'clip': np.clip,
+    'exp': np.exp,
+    'log': np.log,
+    'log10': np.log10,
+    'maximum': np.maximum,
+    'minimum': np.minimum,
+    'sqrt': np.sqrt,
+    'where': np.where,
+    'isnan': np.isnan,
+    'nan': np.nan,
+}
+
+# Curves derived in most wells, with their default parameters
+STANDARD_CURVES = {
+    'VSH_GR': ('clip((GR - gr_clean) / (gr_shale - gr_clean), 0, 1)',
+               {'gr_clean': 20.0, 'gr_shale': 120.0}),
+    'PHID': ('(rho_ma - RHOB) / (rho_ma - rho_fl)',
+             {'rho_ma': 2.65, 'rho_fl': 1.0}),
+    'PHIND': ('(NPHI + PHID) / 2', {}),
+    'PHIE': ('PHIND * (1 - VSH_GR)', {}),
+}
+
+
+def _names(expression):
+    tree = ast.parse(expression, mode='eval')
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+
+
+def _fingerprint(*parts):
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(repr(part).encode())
+    return h.hexdigest()
+
+
+def _array_fingerprint(arr):
+    arr = np.ascontiguousarray(arr)
+    h = hashlib.blake2b(digest_size=16)
+    h.update(repr((arr.dtype.str, arr.shape)).encode())
+    h.update(arr.view(np.uint8).data)
+    return h.hexdigest()
+
+
+class DerivedCurves:
+    """Curves of one well defined as expressions over other curves.
+
+    Expressions use mnemonics, parameters and the elementwise functions of
+    FUNCTIONS, e.g. '(GR - gr_clean) / (gr_shale - gr_clean)'. Results
+    are memoized on a fingerprint of the input curves, the parameters
+    used and the expression, so after changing a parameter only the
+    curves downstream of it are recomputed. The latest result of every
+    curve is kept.
+
+    Expressions are evaluated with eval, only define trusted ones.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    params: dict
+        Initial parameter values
+        Default is None
+    """
+
+    def __init__(self, data, params=None):
+        self.data = data
+        self.params = dict(params or {})
+        self.expressions = {}
+        self._depends = {}
+        self._code = {}
+        self._base_fingerprints = {}
+        self._cache = {}
+
+    def define(self, name, expression, **defaults):
+        """Define curve <name> as <expression>.
+
+        Keyword arguments give default values of parameters, they do not
+        override values already set.
+
+        Raises
+        ------
+        ValueError
+            On a reserved name or a circular definition
+        KeyError
+            When the expression uses an unknown name
+        """
+        if name in FUNCTIONS:
+            raise ValueError(f'{name!r} is a reserved function name')
+        previous = (self.expressions.get(name), self._depends.get(name),
+                    self._code.get(name))
+        added = [key for key in defaults if key not in self.params]
+
+        self.expressions[name] = expression
+        self._depends[name] = _names(expression) - set(FUNCTIONS)
+        self._code[name] = compile(expression, f'<{name}>', 'eval')
+        for key in added:
+            self.params[key] = defaults[key]
+        try:
+            self.order(name)
+        except (KeyError, ValueError):
+            for key in added:
+                del self.params[key]
+            for table, value in zip(
+                    (self.expressions, self._depends, self._code), previous):
+                if value is None:
+                    table.pop(name)
+                else:
+                    table[name] = value
+            raise
+
+    def set_params(self, **params):
+        """Change parameter values, cached curves stay valid."""
+        self.params.update(params)
+
+    def set_curve(self, mnemonic, values):
+        """Replace base curve <mnemonic> (forgets its fingerprint)."""
+        self.data[mnemonic] = values
+        self._base_fingerprints.pop(mnemonic, None)
+
+    def _is_base(self, name):
+        return name not in self.expressions and name in self.data.keys()
+
+    def order(self, name):
+        """Return the derived curves needed for <name> in evaluation order.
+
+        Raises
+        ------
+        ValueError
+            On a circular definition
+        KeyError
+            When a name is neither a curve, a derived curve nor a parameter
+        """
+        order, state = [], {}
+
+        def visit(node, path):
+            if state.get(node) == 'done':
+                return
+            if state.get(node) == 'busy':
+                raise ValueError('circular definition: '
+                                 + ' -> '.join(path + [node]))
+            state[node] = 'busy'
+            for dep in self._depends[node]:
+                if dep in self.expressions:
+                    visit(dep, path + [node])
+                elif not self._is_base(dep) and dep not in self.params:
+                    raise KeyError(f'{dep!r} used by {node!r} is not a '
+                                   'curve or a parameter')
+            state[node] = 'done'
+            order.append(node)
+
+        visit(name, [])
+        return order
+
+    def fingerprint(self, name):
+        """Return the fingerprint of curve <name> and all its inputs."""
+        if self._is_base(name):
+            if name not in self._base_fingerprints:
+                self._base_fingerprints[name] = _array_fingerprint(
+                    np.asarray(self.data[name]))
+            return self._base_fingerprints[name]
+
+        parts = [self.expressions[name]]
+        for dep in sorted(self._depends[name]):
+            if dep in self.expressions or self._is_base(dep):
+                parts.append((dep, self.fingerprint(dep)))
+            else:
+                parts.append((dep, self.params[dep]))
+        return _fingerprint(*parts)
+
+    def _namespace(self, name, values, rows):
+        namespace = dict(FUNCTIONS)
+        for dep in self._depends[name]:
+            if dep in values:
+                namespace[dep] = values[dep]
+            elif self._is_base(dep):
+                namespace[dep] = np.asarray(self.data[dep][rows], dtype=float)
+            else:
+                namespace[dep] = self.params[dep]
+        return namespace
+
+    def _size(self, order):
+        for node in order:
+            for dep in self._depends[node]:
+                if self._is_base(dep):
+                    return len(self.data[dep])
+        return 0
+
+    def evaluate(self, name, chunk_size=None):
+        """Return curve <name>, computing what is missing from the cache.
+
+        Parameters
+        ----------
+        name: str
+        chunk_size: int
+            When given, derived curves that are not cached are evaluated in
+            depth chunks of this many samples, so intermediate arrays are
+            never larger than a chunk
+            Default is None
+
+        Returns
+        -------
+        np.ndarray
+        """
+        if self._is_base(name):
+            return self.data[name]
+
+        order = self.order(name)
+        keys = {node: self.fingerprint(node) for node in order}
+        if keys[name] in self._cache:
+            return self._cache[keys[name]][1]
+
+        size = self._size(order)
+        if chunk_size is None:
+            chunks = [slice(None)]
+        else:
+            chunks = [slice(start, start + chunk_size)
+                      for start in range(0, size, chunk_size)]
+
+        out = None
+        for rows in chunks:
+            values = {}
+            for node in order:
+                if keys[node] in self._cache:
+                    values[node] = self._cache[keys[node]][1][rows]
+                    continue
+                result = eval(self._code[node], {'__builtins__': {}},
+                              self._namespace(node, values, rows))
+                values[node] = np.asarray(result, dtype=float)
+                if chunk_size is None:
+                    # whole curves are cheap to keep, chunks are not
+                    values[node] = self._store(node, keys[node], values[node])
+            if chunk_size is None:
+                return values[name]
+            if out is None:
+                out = np.empty(size, dtype=float)
+            out[rows] = values[name]
+        return self._store(name, keys[name], out)
+
+    def _store(self, name, key, values):
+        # a view, so the curve an expression returned unchanged stays
+        # writeable in the well data
+        values = values.view()
+        values.flags.writeable = False
+        # keep only the latest result of every curve
+        for old in [k for k, v in self._cache.items() if v[0] == name]:
+            del self._cache[old]
+        self._cache[key] = (name, values)
+        return values
+
+    def __getitem__(self, name):
+        return self.evaluate(name)
+
+    def keys(self):
+        """Return the names of the base and derived curves."""
+        return list(self.data.keys()) + list(self.expressions)
+
+
+def standard_curves(data, **params):
+    """Return a DerivedCurves with the STANDARD_CURVES of <data> defined.
+
+    Only curves whose inputs exist in the well are defined.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+    params:
+        Parameter values overriding the defaults, e.g. gr_clean=30
+
+    Returns
+    -------
+    DerivedCurves
+    """
+    curves = DerivedCurves(data)
+    for name, (expression, defaults) in STANDARD_CURVES.items():
+        try:
+            curves.define(name, expression, **defaults)
+        except KeyError:
+            continue
+    curves.set_params(**params)
+    return curves
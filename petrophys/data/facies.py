@@ -0,0 +1,325 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import lasio
+import numpy as np
+import pandas as pd
+
+from petrophys.data.units import CurveRegistry
+
+
+FACIES_CURVES = ('GR', 'RHOB', 'NPHI', 'DT')
+
+# Common units of the facies curves, so every well is clustered alike
+FACIES_UNITS = {'GR': 'gAPI', 'RHOB': 'g/cm3', 'NPHI': 'v/v', 'DT': 'us/m'}
+
+
+def _load(source):
+    # paths are read when used, so only one well is in memory per thread
+    if isinstance(source, (str, Path)):
+        return lasio.read(source)
+    return source
+
+
+def curve_rows(data, curves=FACIES_CURVES, units=None):
+    """Return the curves of a well as (n, ncurves) rows in common units.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    curves: list of str
+        Default is GR, RHOB, NPHI and DT
+    units: dict
+        Unit per mnemonic the curves are converted to, curves without a
+        unit in their header are used as they are, absent curves and
+        curves in a unit that cannot be converted (e.g. GR in CPS) are NaN
+        Default is FACIES_UNITS
+    """
+    units = FACIES_UNITS if units is None else units
+    registry = CurveRegistry(data)
+    present = list(data.keys())
+    size = len(data[present[0]]) if present else 0
+    columns = []
+    for mnemonic in curves:
+        unit = units.get(mnemonic)
+        if mnemonic not in present:
+            columns.append(np.full(size, np.nan))
+        elif unit and registry.unit(mnemonic):
+            try:
+                columns.append(registry.get(mnemonic, unit))
+            except ValueError:
+                columns.append(np.full(size, np.nan))
+        else:
+            columns.append(data[mnemonic])
+    return np.column_stack([np.asarray(c, dtype=float) for c in columns])
+
+
+def iter_chunks(wells, curves=FACIES_CURVES, units=None, chunk_size=4096):
+    """Yield the complete rows (no NaN) of many wells in chunks.
+
+    Wells are read one at a time, so memory is bounded by the largest
+    well and not by the field.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset, mapping of curves or path of a LAS file
+    curves: list of str
+        See `curve_rows`
+    units: dict
+        See `curve_rows`
+    chunk_size: integer
+        Largest number of rows per chunk
+        Default is 4096
+    """
+    for source in wells.values():
+        rows = curve_rows(_load(source), curves, units)
+        rows = rows[~np.isnan(rows).any(axis=1)]
+        for start in range(0, len(rows), chunk_size):
+            yield rows[start:start + chunk_size]
+
+
+class RunningStats:
+    """Mean and standard deviation of curves updated chunk by chunk.
+
+    Chunks are merged with the parallel variance formula of Chan et al.,
+    so the result equals the statistics of all rows at once. NaN is
+    ignored per curve.
+
+    Parameters
+    ----------
+    ncurves: integer
+    """
+
+    def __init__(self, ncurves):
+        self.count = np.zeros(ncurves)
+        self.mean = np.zeros(ncurves)
+        self._m2 = np.zeros(ncurves)
+
+    def update(self, rows):
+        """Add an (n, ncurves) chunk of rows."""
+        rows = np.asarray(rows, dtype=float).reshape(-1, len(self.count))
+        valid = ~np.isnan(rows)
+        n = valid.sum(axis=0)
+        if not n.any():
+            return self
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(n > 0, np.where(valid, rows, 0.0).sum(axis=0) / n,
+                            0.0)
+            m2 = np.where(valid, (rows - mean) ** 2, 0.0).sum(axis=0)
+            total = self.count + n
+            delta = mean - self.mean
+            self.mean = np.where(n > 0, self.mean + delta * n / total,
+                                 self.mean)
+            self._m2 = np.where(n > 0, self._m2 + m2
+                                + delta ** 2 * self.count * n / total,
+                                self._m2)
+        self.count = total
+        return self
+
+    @property
+    def std(self):
+        """Standard deviation, 1.0 for constant or absent curves."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self._m2 / self.count)
+        return np.where(np.isfinite(std) & (std > 0), std, 1.0)
+
+
+def _nearest(x, centers):
+    # |x - c|**2 = |x|**2 - 2 x.c + |c|**2, the |x|**2 term does not
+    # change the nearest centre
+    distance = (centers ** 2).sum(axis=1) - 2.0 * x @ centers.T
+    return np.argmin(distance, axis=1)
+
+
+def _kmeans_plus_plus(x, k, rng):
+    """Pick <k> spread out starting centres from the rows of <x>."""
+    centers = [x[rng.integers(len(x))]]
+    closest = ((x - centers[0]) ** 2).sum(axis=1)
+    for _ in range(1, k):
+        total = closest.sum()
+        i = rng.choice(len(x), p=closest / total) if total > 0 \
+            else rng.integers(len(x))
+        centers.append(x[i])
+        closest = np.minimum(closest, ((x - x[i]) ** 2).sum(axis=1))
+    return np.array(centers)
+
+
+class Electrofacies:
+    """Electrofacies from mini-batch k-means on standardized curves.
+
+    `fit` streams the wells twice: once to gather the mean and standard
+    deviation of every curve (`RunningStats`) and a bounded random
+    sample to seed the centres, then per epoch to update the centres
+    chunk by chunk. Prediction is one vectorized distance computation per
+    well. Facies are numbered by increasing mean of the first curve (GR
+    by default), so facies 0 is the cleanest.
+
+    Parameters
+    ----------
+    n_facies: integer
+        Number of facies (clusters)
+        Default is 5
+    curves: list of str
+        Default is GR, RHOB, NPHI and DT
+    units: dict
+        See `curve_rows`
+        Default is FACIES_UNITS
+    chunk_size: integer
+        Rows per mini-batch
+        Default is 4096
+    sample_size: integer
+        Rows kept to seed the centres
+        Default is 20000
+    seed: integer
+        Seed of the random generator
+        Default is None
+    """
+
+    def __init__(self, n_facies=5, curves=FACIES_CURVES, units=None,
+                 chunk_size=4096, sample_size=20000, seed=None):
+        self.n_facies = n_facies
+        self.curves = list(curves)
+        self.units = units
+        self.chunk_size = chunk_size
+        self.sample_size = sample_size
+        self.stats = RunningStats(len(self.curves))
+        self.centers = None
+        self.counts = None
+        self._rng = np.random.default_rng(seed)
+
+    def _chunks(self, wells):
+        return iter_chunks(wells, self.curves, self.units, self.chunk_size)
+
+    def standardize(self, rows):
+        """Scale <rows> with the stored mean and standard deviation."""
+        return (np.asarray(rows, dtype=float) - self.stats.mean) \
+            / self.stats.std
+
+    def _sample(self, sample, keys, rows):
+        # keep the rows with the smallest random keys, a uniform sample
+        # of everything seen so far of at most sample_size rows
+        new = self._rng.random(len(rows))
+        sample = np.concatenate((sample, rows))
+        keys = np.concatenate((keys, new))
+        if len(keys) > self.sample_size:
+            keep = np.argpartition(keys, self.sample_size)[:self.sample_size]
+            sample, keys = sample[keep], keys[keep]
+        return sample, keys
+
+    def partial_fit(self, rows):
+        """Update the centres with one chunk of complete rows.
+
+        Every centre moves to the running mean of all rows assigned to
+        it, the mini-batch k-means update of Sculley (2010).
+        """
+        x = self.standardize(rows)
+        if self.centers is None:
+            if len(x) < self.n_facies:
+                raise ValueError(f'{len(x)} rows cannot seed '
+                                 f'{self.n_facies} facies')
+            self.centers = _kmeans_plus_plus(x, self.n_facies, self._rng)
+            self.counts = np.zeros(self.n_facies)
+        labels = _nearest(x, self.centers)
+        n = np.bincount(labels, minlength=self.n_facies)
+        sums = np.zeros_like(self.centers)
+        np.add.at(sums, labels, x)
+        self.counts += n
+        hit = n > 0
+        self.centers[hit] += (sums[hit] - n[hit, None] * self.centers[hit]) \
+            / self.counts[hit, None]
+        return self
+
+    def fit(self, wells, n_epochs=3):
+        """Train on many wells streamed chunk by chunk.
+
+        Parameters
+        ----------
+        wells: dict
+            Well name to lasio dataset, mapping of curves or path of a LAS
+            file
+        n_epochs: integer
+            Number of passes over the wells updating the centres
+            Default is 3
+
+        Returns
+        -------
+        Electrofacies
+        """
+        self.stats = RunningStats(len(self.curves))
+        sample = np.empty((0, len(self.curves)))
+        keys = np.empty(0)
+        for rows in self._chunks(wells):
+            self.stats.update(rows)
+            sample, keys = self._sample(sample, keys, rows)
+        if len(sample) < self.n_facies:
+            raise ValueError(f'{len(sample)} complete rows cannot make '
+                             f'{self.n_facies} facies')
+        self.centers = _kmeans_plus_plus(self.standardize(sample),
+                                         self.n_facies, self._rng)
+        self.counts = np.zeros(self.n_facies)
+        for _ in range(n_epochs):
+            for rows in self._chunks(wells):
+                self.partial_fit(self._rng.permutation(rows))
+        order = np.argsort(self.centers[:, 0])
+        self.centers, self.counts = self.centers[order], self.counts[order]
+        return self
+
+    def predict(self, data):
+        """Return the facies code of every sample of a well.
+
+        Parameters
+        ----------
+        data: lasio dataset, mapping of curves or path of a LAS file
+
+        Returns
+        -------
+        np.ndarray
+            Facies codes 0 to n_facies - 1 as floats, NaN where a curve
+            is absent, e.g. for the cdata of youngs_modulus_vs_depth
+        """
+        if self.centers is None:
+            raise ValueError('the facies model is not fitted')
+        rows = curve_rows(_load(data), self.curves, self.units)
+        valid = ~np.isnan(rows).any(axis=1)
+        codes = np.full(len(rows), np.nan)
+        codes[valid] = _nearest(self.standardize(rows[valid]), self.centers)
+        return codes
+
+    def predict_field(self, wells, max_workers=None):
+        """Run `predict` on many wells in parallel.
+
+        Parameters
+        ----------
+        wells: dict
+            Well name to lasio dataset, mapping of curves or path of a LAS
+            file
+        max_workers: int
+            Number of threads
+            Default is chosen by ThreadPoolExecutor
+
+        Returns
+        -------
+        dict
+            Well name to facies codes
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {name: pool.submit(self.predict, data)
+                       for name, data in wells.items()}
+            return {name: future.result() for name, future in futures.items()}
+
+    def table(self):
+        """Return the centre of every facies in the units of the curves.
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per facies with the number of training rows and the
+            centre of every curve
+        """
+        centers = self.centers * self.stats.std + self.stats.mean
+        table = pd.DataFrame(centers, columns=self.curves)
+        table.insert(0, 'count', self.counts.astype(np.int64))
+        table.insert(0, 'facies', np.arange(self.n_facies))
+        return table
@@ -0,0 +1,269 @@
+from math import factorial
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def _check_window(window):
+    if window < 1 or window % 2 == 0:
+        raise ValueError(f'window must be a positive odd number, not {window}')
+
+
+def _windows(values, window):
+    """Return the centred windows of the last axis, padded with NaN."""
+    values = np.asarray(values, dtype=float)
+    half = window // 2
+    pad = [(0, 0)] * (values.ndim - 1) + [(half, half)]
+    padded = np.pad(values, pad, mode='constant', constant_values=np.nan)
+    return sliding_window_view(padded, window, axis=-1)
+
+
+def _quantile_sorted(ordered, count, q):
+    """Quantile <q> of sorted windows holding <count> valid values first."""
+    position = q * (count - 1)
+    below = np.clip(np.floor(position).astype(np.intp), 0, None)
+    above = np.clip(np.ceil(position).astype(np.intp), 0, None)
+    low = np.take_along_axis(ordered, below[..., None], -1)[..., 0]
+    high = np.take_along_axis(ordered, above[..., None], -1)[..., 0]
+    result = low + (high - low) * (position - below)
+    return np.where(count > 0, result, np.nan)
+
+
+def rolling_mean(values, window=11, min_periods=1):
+    """Return the centred rolling mean, ignoring NaN.
+
+    Computed from cumulative sums, so the cost does not depend on the
+    window length.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    min_periods: integer
+        Smallest number of valid samples in a window, fewer give NaN
+        Default is 1
+    """
+    _check_window(window)
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    half = window // 2
+    pad = [(0, 0)] * (values.ndim - 1) + [(half + 1, half)]
+    sums = np.cumsum(np.pad(np.where(valid, values, 0.0), pad), axis=-1)
+    counts = np.cumsum(np.pad(valid.astype(np.int64), pad), axis=-1)
+    total = sums[..., window:] - sums[..., :-window]
+    count = counts[..., window:] - counts[..., :-window]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(count >= max(min_periods, 1), total / count, np.nan)
+
+
+def rolling_percentile(values, window=11, q=50.0):
+    """Return the centred rolling percentile <q>, ignoring NaN.
+
+    Every window is sorted once (NaN sort last), so the cost is
+    O(n * w log w) without Python loops.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    q: float or list of float
+        Percentile from 0-100, several give a stacked result
+        Default is 50.0
+    """
+    _check_window(window)
+    windows = _windows(values, window)
+    ordered = np.sort(windows, axis=-1)
+    count = window - np.isnan(windows).sum(axis=-1)
+    if np.ndim(q):
+        return np.stack([_quantile_sorted(ordered, count, p / 100.0)
+                         for p in q])
+    return _quantile_sorted(ordered, count, q / 100.0)
+
+
+def rolling_median(values, window=11):
+    """Return the centred rolling median, ignoring NaN.
+
+    See `rolling_percentile`.
+    """
+    return rolling_percentile(values, window, 50.0)
+
+
+def rolling_mad(values, window=11):
+    """Return the centred rolling median and median absolute deviation.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    window: integer
+        Window length in samples, odd
+        Default is 11
+
+    Returns
+    -------
+    tuple of np.ndarray
+        median and MAD
+    """
+    _check_window(window)
+    windows = _windows(values, window)
+    count = window - np.isnan(windows).sum(axis=-1)
+    median = _quantile_sorted(np.sort(windows, axis=-1), count, 0.5)
+    deviation = np.sort(np.abs(windows - median[..., None]), axis=-1)
+    return median, _quantile_sorted(deviation, count, 0.5)
+
+
+def savgol_coefficients(window=11, order=2, deriv=0):
+    """Return the Savitzky-Golay weights of a centred window.
+
+    Parameters
+    ----------
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    order: integer
+        Order of the fitted polynomial, smaller than window
+        Default is 2
+    deriv: integer
+        Order of the derivative, per sample
+        Default is 0
+    """
+    _check_window(window)
+    if order >= window:
+        raise ValueError('order must be smaller than the window')
+    half = window // 2
+    offsets = np.arange(-half, half + 1, dtype=float)
+    vandermonde = offsets[:, None] ** np.arange(order + 1)
+    # row <deriv> of the pseudo-inverse fits the polynomial coefficient
+    return np.linalg.pinv(vandermonde)[deriv] * factorial(deriv)
+
+
+def savgol(values, window=11, order=2):
+    """Return the Savitzky-Golay smoothed curve.
+
+    A local polynomial of <order> is fitted in every window by one matrix
+    product over the sliding windows. Windows with NaN (gaps and the ends
+    of the curve) keep the original sample.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    order: integer
+        Order of the fitted polynomial
+        Default is 2
+    """
+    values = np.asarray(values, dtype=float)
+    smoothed = _windows(values, window) @ savgol_coefficients(window, order)
+    return np.where(np.isnan(smoothed), values, smoothed)
+
+
+def despike(values, window=11, threshold=5.0):
+    """Replace spikes by the rolling median.
+
+    Samples deviating from the rolling median by more than <threshold>
+    scaled MADs (1.4826 * MAD) are spikes.
+
+    Parameters
+    ----------
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    threshold: float
+        Default is 5.0
+
+    Returns
+    -------
+    tuple of np.ndarray
+        despiked values and the mask of the replaced samples
+    """
+    values = np.asarray(values, dtype=float)
+    median, mad = rolling_mad(values, window)
+    # a zero MAD (flat window) would flag every change as a spike
+    scale = np.where(mad > 0, 1.4826 * mad, np.inf)
+    with np.errstate(invalid='ignore'):
+        spikes = np.abs(values - median) > threshold * scale
+    return np.where(spikes, median, values), spikes
+
+
+def _despiked(values, window=11, threshold=5.0):
+    return despike(values, window, threshold)[0]
+
+
+FILTERS = {
+    'mean': rolling_mean,
+    'median': rolling_median,
+    'percentile': rolling_percentile,
+    'savgol': savgol,
+    'despike': _despiked,
+}
+
+
+def filter_curve(values, method='median', window=11, **kwargs):
+    """Return <values> filtered by <method>, one of FILTERS.
+
+    Parameters
+    ----------
+    values: np.ndarray
+    method: str
+        mean, median, percentile, savgol or despike
+        Default is median
+    window: integer
+        Window length in samples, odd
+        Default is 11
+    kwargs:
+        Passed to the filter, e.g. q for percentile or order for savgol
+    """
+    if method not in FILTERS:
+        raise ValueError(f'unknown filter {method!r}, use one of '
+                         f'{", ".join(FILTERS)}')
+    return FILTERS[method](values, window=window, **kwargs)
+
+
+def filter_well(data, curves=None, method='median', window=11, depth='DEPT',
+                **kwargs):
+    """Filter many curves of a well at once.
+
+    The curves are stacked into one array and filtered in a single
+    vectorized call.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic, of equal length
+    curves: list of str
+        Curves to filter
+        Default is all curves except the depth
+    method: str
+        See `filter_curve`
+        Default is median
+    window: integer
+        Default is 11
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    kwargs:
+        Passed to the filter
+
+    Returns
+    -------
+    dict
+        Mnemonic to filtered curve
+    """
+    if curves is None:
+        curves = [c for c in data.keys() if c != depth]
+    if not curves:
+        return {}
+    stacked = np.stack([np.asarray(data[c], dtype=float) for c in curves])
+    filtered = filter_curve(stacked, method, window, **kwargs)
+    return dict(zip(curves, filtered))
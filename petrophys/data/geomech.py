@@ -0,0 +1,211 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from petrophys.data.units import CurveRegistry
+
+
+# Mnemonics searched, in order, for each input of the elastic properties
+VP_SLOWNESS = ('DT', 'DTC', 'DTCO', 'SON', 'AC')
+VS_SLOWNESS = ('DTS', 'DTSM', 'DTSH')
+VP_VELOCITY = ('VP', 'V_P-WAVE_PS', 'V_P-WAVE')
+VS_VELOCITY = ('VS', 'V_S-WAVE_PS', 'V_S-WAVE')
+DENSITY = ('RHOB', 'RHOZ', 'DEN')
+
+
+def castagna_vs(vp):
+    """Estimate Vs (m/s) from Vp (m/s) with the mudrock line of Castagna.
+
+    Vs = 0.8621 * Vp - 1172.4
+    """
+    vs = 0.8621 * np.asarray(vp, dtype=float) - 1172.4
+    vs[vs <= 0] = np.nan
+    return vs
+
+
+def elastic_properties(vp, vs, rho):
+    """Compute dynamic elastic properties from velocities and density.
+
+    All inputs are arrays of equal shape, NaN where absent. The shape is
+    free, so a stack of wells resampled to one depth grid is computed in
+    the same expressions as a single well.
+
+    Parameters
+    ----------
+    vp: np.ndarray
+        compressional velocity in m/s
+    vs: np.ndarray
+        shear velocity in m/s
+    rho: np.ndarray
+        bulk density in kg/m3
+
+    Returns
+    -------
+    dict of np.ndarray
+        G (shear), K (bulk) and E (Young's) modulus in GPa and Poisson's
+        ratio PR
+    """
+    vp = np.asarray(vp, dtype=float)
+    vs = np.asarray(vs, dtype=float)
+    rho = np.asarray(rho, dtype=float)
+
+    vp2 = vp * vp
+    vs2 = vs * vs
+    with np.errstate(divide='ignore', invalid='ignore'):
+        diff = vp2 - vs2
+        G = rho * vs2
+        K = rho * (vp2 - 4.0 / 3.0 * vs2)
+        E = G * (3.0 * vp2 - 4.0 * vs2) / diff
+        PR = (vp2 - 2.0 * vs2) / (2.0 * diff)
+
+    # Vs >= Vp is not physical
+    invalid = ~(diff > 0)
+    for arr in (E, PR):
+        arr[invalid] = np.nan
+
+    return {
+        'G': G / 1e9,
+        'K': K / 1e9,
+        'E': E / 1e9,
+        'PR': PR,
+    }
+
+
+def _first(registry, mnemonics):
+    keys = registry.data.keys()
+    for mnemonic in mnemonics:
+        if mnemonic in keys:
+            return mnemonic
+    return None
+
+
+def well_elastic_properties(data, units=None, vs_estimate=None):
+    """Compute the elastic properties along one well.
+
+    Vp comes from a compressional velocity curve or the sonic slowness
+    (e.g. DT), Vs from a shear velocity curve (e.g. DAPGEO V_S-WAVE_PS)
+    or shear slowness. Units are taken from the curve headers.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    units: dict
+        Units per mnemonic when data has no curve headers
+        Default is None
+    vs_estimate: str
+        'castagna' estimates Vs from Vp when no shear curve is present,
+        otherwise the moduli are NaN without shear data
+        Default is None
+
+    Returns
+    -------
+    dict of np.ndarray
+        DEPT, Vp and Vs (m/s), rho (kg/m3), G, K, E (GPa) and PR
+    """
+    registry = data if isinstance(data, CurveRegistry) else \
+        CurveRegistry(data, units=units)
+    if hasattr(registry.data, 'curves'):
+        depth = registry.data.index
+    else:
+        depth = registry.data['DEPT']
+
+    def curve(velocities, slownesses):
+        mnemonic = _first(registry, velocities)
+        if mnemonic is not None:
+            return registry.get(mnemonic, 'm/s')
+        mnemonic = _first(registry, slownesses)
+        if mnemonic is not None:
+            return registry.get(mnemonic, 'm/s')
+        return np.full(len(depth), np.nan)
+
+    vp = curve(VP_VELOCITY, VP_SLOWNESS)
+    vs = curve(VS_VELOCITY, VS_SLOWNESS)
+    if vs_estimate == 'castagna' and np.isnan(vs).all():
+        vs = castagna_vs(vp)
+    elif vs_estimate not in (None, 'castagna'):
+        raise ValueError(f'unknown vs_estimate {vs_estimate!r}')
+
+    mnemonic = _first(registry, DENSITY)
+    if mnemonic is None:
+        rho = np.full(len(depth), np.nan)
+    else:
+        rho = registry.get(mnemonic, 'kg/m3')
+
+    out = {'DEPT': np.asarray(depth), 'Vp': vp, 'Vs': vs, 'rho': rho}
+    out.update(elastic_properties(vp, vs, rho))
+    return out
+
+
+def field_elastic_properties(wells, units=None, vs_estimate=None,
+                             max_workers=None):
+    """Compute the elastic properties of many wells in parallel.
+
+    The work is NumPy bound and releases the GIL, so a thread pool runs
+    the wells concurrently without copying their curves to processes.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset or mapping of curves
+    units: dict
+        Units per mnemonic for wells without curve headers
+        Default is None
+    vs_estimate: str
+        See `well_elastic_properties`
+    max_workers: int
+        Number of threads
+        Default is chosen by ThreadPoolExecutor
+
+    Returns
+    -------
+    dict
+        Well name to the output of `well_elastic_properties`
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            name: pool.submit(well_elastic_properties, data, units,
+                              vs_estimate)
+            for name, data in wells.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
+
+
+def zone_values(depth, top, bottom, values, fill=np.nan):
+    """Assign per-zone <values> to every sample of <depth>.
+
+    Zones are given by their top and bottom depth, e.g. the intervals of
+    appendix B, and must not overlap. Samples outside every zone get
+    <fill>.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    top: array-like
+    bottom: array-like
+    values: array-like
+        Value per zone, e.g. lithology codes
+    fill: float
+        Value of samples outside the zones
+        Default is NaN
+
+    Returns
+    -------
+    np.ndarray
+    """
+    depth = np.asarray(depth, dtype=float)
+    top = np.asarray(top, dtype=float)
+    bottom = np.asarray(bottom, dtype=float)
+    values = np.asarray(values)
+
+    order = np.argsort(top)
+    top, bottom, values = top[order], bottom[order], values[order]
+
+    idx = np.searchsorted(top, depth, side='right') - 1
+    inside = idx >= 0
+    inside[inside] &= depth[inside] <= bottom[idx[inside]]
+
+    out = np.full(depth.shape, fill,
+                  dtype=np.result_type(values, np.asarray(fill)))
+    out[inside] = values[idx[inside]]
+    return out
@@ -4,6 +4,11 @@ import logging
 from pathlib import Path
 from dotenv import find_dotenv, load_dotenv
 
+import lasio
+
+from petrophys.data.catalog import WellCatalog
+from petrophys.data.store import write_well
+
 
 @click.command()
 @click.argument('input_filepath', type=click.Path(exists=True))
@@ -15,6 +20,14 @@ def main(input_filepath, output_filepath):
     logger = logging.getLogger(__name__)
     logger.info('making final data set from raw data')
 
+    Path(output_filepath).mkdir(parents=True, exist_ok=True)
+    with WellCatalog(Path(output_filepath) / 'catalog.sqlite') as catalog:
+        for path in sorted(Path(input_filepath).rglob('*.las')):
+            las = lasio.read(path)
+            directory = write_well(las, output_filepath)
+            catalog.index_las(las, path, well=directory.name)
+            logger.info('stored %s in %s', path.name, directory)
+
 
 if __name__ == '__main__':
     log_fmt = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -0,0 +1,261 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from petrophys.data.units import convert, normalize_unit
+
+
+@dataclass(frozen=True)
+class PoroPermTransform:
+    """Fitted relation log10(perm) = slope * porosity + intercept.
+
+    Parameters
+    ----------
+    slope: float
+    intercept: float
+    r2: float
+        Coefficient of determination of the fit
+    n: integer
+        Number of core plugs used
+    unit: str
+        Unit of the porosity the transform was fitted on
+        Default is %
+    samples: np.ndarray
+        Bootstrap (slope, intercept) pairs of shape (n_boot, 2)
+        Default is None
+    """
+    slope: float
+    intercept: float
+    r2: float = np.nan
+    n: int = 0
+    unit: str = '%'
+    samples: np.ndarray = field(default=None, compare=False)
+
+    def _porosity(self, porosity, unit):
+        porosity = np.asarray(porosity, dtype=float)
+        if unit is None or normalize_unit(unit) == normalize_unit(self.unit):
+            return porosity
+        return convert(porosity, unit, self.unit)
+
+    def apply(self, porosity, unit=None):
+        """Return the permeability (mD) of <porosity>.
+
+        Parameters
+        ----------
+        porosity: np.ndarray
+        unit: str
+            Unit of <porosity>, converted to the unit of the transform
+            Default is the unit of the transform
+        """
+        porosity = self._porosity(porosity, unit)
+        return 10 ** (self.slope * porosity + self.intercept)
+
+    def band(self, porosity, ci=0.9, unit=None):
+        """Return the low and high permeability of the bootstrap interval.
+
+        Parameters
+        ----------
+        porosity: np.ndarray
+        ci: float
+            Width of the confidence interval, from 0.0-1.0
+            Default is 0.9
+        unit: str
+            See `apply`
+
+        Returns
+        -------
+        tuple of np.ndarray
+        """
+        if self.samples is None:
+            raise ValueError('the transform has no bootstrap samples')
+        porosity = self._porosity(porosity, unit)
+        # (n_boot, n_porosity) log permeabilities in one product
+        log_perm = np.outer(self.samples[:, 0], porosity) \
+            + self.samples[:, 1:2]
+        low, high = np.nanquantile(log_perm, [(1 - ci) / 2, (1 + ci) / 2],
+                                   axis=0)
+        return 10 ** low, 10 ** high
+
+
+def _valid(porosity, permeability):
+    porosity = np.asarray(porosity, dtype=float)
+    permeability = np.asarray(permeability, dtype=float)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_perm = np.log10(permeability)
+    keep = np.isfinite(porosity) & np.isfinite(log_perm)
+    return porosity[keep], log_perm[keep]
+
+
+def _least_squares(x, y):
+    """Fit y = slope * x + intercept along the last axis of x and y."""
+    n = x.shape[-1]
+    mean_x = x.mean(axis=-1)
+    mean_y = y.mean(axis=-1)
+    dx = x - mean_x[..., None]
+    dy = y - mean_y[..., None]
+    sxx = (dx * dx).sum(axis=-1)
+    sxy = (dx * dy).sum(axis=-1)
+    syy = (dy * dy).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = sxy / sxx
+        r2 = sxy * sxy / (sxx * syy)
+    return slope, mean_y - slope * mean_x, r2, n
+
+
+def fit_poroperm(porosity, permeability, n_boot=0, unit='%', seed=None):
+    """Fit log10(permeability) against porosity by least squares.
+
+    Absent values and non-positive permeabilities are left out. The
+    bootstrap resamples the plugs <n_boot> times and fits all resamples
+    in one batched pass.
+
+    Parameters
+    ----------
+    porosity: np.ndarray
+    permeability: np.ndarray
+        Permeability in mD
+    n_boot: integer
+        Number of bootstrap resamples
+        Default is 0
+    unit: str
+        Unit of <porosity>
+        Default is %
+    seed: integer
+        Seed of the bootstrap
+        Default is None
+
+    Returns
+    -------
+    PoroPermTransform
+    """
+    x, y = _valid(porosity, permeability)
+    if x.size < 2:
+        return PoroPermTransform(np.nan, np.nan, np.nan, int(x.size), unit)
+    slope, intercept, r2, n = _least_squares(x, y)
+
+    samples = None
+    if n_boot:
+        rng = np.random.default_rng(seed)
+        idx = rng.integers(0, n, size=(n_boot, n))
+        b_slope, b_intercept, _, _ = _least_squares(x[idx], y[idx])
+        samples = np.column_stack((b_slope, b_intercept))
+    return PoroPermTransform(float(slope), float(intercept), float(r2), n,
+                             unit, samples)
+
+
+def fit_groups(frame, by=('well', 'zone'), porosity='porosity',
+               permeability='permeability', n_boot=0, unit='%',
+               min_samples=3, seed=None, max_workers=None):
+    """Fit a transform for every group of core plugs, e.g. per well and zone.
+
+    Parameters
+    ----------
+    frame: pd.DataFrame
+        Core plugs, e.g. from petrophys.data.cores.read_core_files
+    by: str or list of str
+        Columns defining the groups, absent columns are ignored so the
+        default works with and without zones
+        Default is ('well', 'zone')
+    porosity: str
+        Column of the porosity
+        Default is porosity
+    permeability: str
+        Column of the permeability in mD
+        Default is permeability
+    n_boot: integer
+        See `fit_poroperm`
+        Default is 0
+    unit: str
+        Unit of the porosity column
+        Default is %
+    min_samples: integer
+        Groups with fewer valid plugs are left out
+        Default is 3
+    seed: integer
+        Seed of the bootstrap, every group gets its own stream
+        Default is None
+    max_workers: int
+        Number of threads running the bootstraps
+        Default is chosen by ThreadPoolExecutor
+
+    Returns
+    -------
+    dict
+        Group key to PoroPermTransform, with the key a tuple of the
+        values of <by> (the plain value for a single column and an empty
+        tuple without any)
+    """
+    by = [by] if isinstance(by, str) else [c for c in by if c in frame]
+    if not by:
+        groups = [((), frame)]
+    else:
+        groups = list(frame.groupby(by if len(by) > 1 else by[0],
+                                    observed=True, sort=True))
+    seeds = np.random.SeedSequence(seed).spawn(len(groups))
+
+    def fit(group, group_seed):
+        return fit_poroperm(group[porosity], group[permeability],
+                            n_boot=n_boot, unit=unit,
+                            seed=np.random.default_rng(group_seed))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        fits = pool.map(fit, [g for _, g in groups], seeds)
+        transforms = {key: t for (key, _), t in zip(groups, fits)}
+    return {key: t for key, t in transforms.items() if t.n >= min_samples}
+
+
+def transform_table(transforms):
+    """Return the transforms of `fit_groups` as a DataFrame."""
+    rows = []
+    for key, t in transforms.items():
+        row = {'group': key, 'slope': t.slope, 'intercept': t.intercept,
+               'r2': t.r2, 'n': t.n}
+        if t.samples is not None:
+            row['slope_std'], row['intercept_std'] = t.samples.std(axis=0)
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def permeability_curve(porosity, transforms, zones=None, unit=None):
+    """Apply poro-perm transforms to a log porosity curve in one pass.
+
+    Parameters
+    ----------
+    porosity: np.ndarray
+        Log porosity, e.g. PHIE
+    transforms: PoroPermTransform or dict
+        One transform, or zone name to transform
+    zones: np.ndarray
+        Zone name of every sample, e.g. from
+        petrophys.data.geomech.zone_values, required with a dict.
+        Samples in zones without a transform are NaN.
+        Default is None
+    unit: str
+        Unit of <porosity>, e.g. 'v/v'
+        Default is the unit of the transforms
+
+    Returns
+    -------
+    np.ndarray
+        Permeability in mD
+    """
+    if isinstance(transforms, PoroPermTransform):
+        return transforms.apply(porosity, unit)
+    if zones is None:
+        raise ValueError('a dict of transforms needs the zone of every sample')
+
+    names = list(transforms)
+    units = {normalize_unit(t.unit) for t in transforms.values()}
+    if len(units) > 1:
+        raise ValueError(f'transforms in different units: {sorted(units)}')
+    porosity = np.asarray(porosity, dtype=float)
+    if unit is not None and names:
+        porosity = transforms[names[0]]._porosity(porosity, unit)
+
+    # per sample coefficients by indexing, NaN outside the fitted zones
+    codes = pd.Index(names).get_indexer(np.asarray(zones))
+    slope = np.append([transforms[z].slope for z in names], np.nan)
+    intercept = np.append([transforms[z].intercept for z in names], np.nan)
+    return 10 ** (slope[codes] * porosity + intercept[codes])
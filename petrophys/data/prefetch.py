@@ -0,0 +1,178 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import lasio
+import numpy as np
+
+
+def data_nbytes(data):
+    """Return the memory held by the curves of a well, in bytes.
+
+    Memory-mapped curves (e.g. from petrophys.data.store.read_well) cost
+    nothing until they are read and count as 0.
+    """
+    if isinstance(data, lasio.LASFile):
+        # the curves themselves, data.data would stack a copy of them
+        return int(sum(curve.data.nbytes for curve in data.curves))
+    if isinstance(data, np.memmap):
+        return 0
+    if isinstance(data, np.ndarray):
+        return int(data.nbytes)
+    if not hasattr(data, 'keys'):
+        return int(getattr(data, 'nbytes', 0))
+    total = 0
+    for key in data.keys():
+        values = data[key]
+        if isinstance(values, np.memmap):
+            continue
+        total += getattr(values, 'nbytes', 0)
+    return int(total)
+
+
+class WellBrowser:
+    """Step through an ordered list of wells with the next ones prefetched.
+
+    While a well is viewed, the next <ahead> wells (and the previous
+    one) are read on background threads, so moving on returns a well
+    that is already parsed. Jumping elsewhere cancels the prefetches that
+    have not started, and loaded wells farthest from the current one are
+    dropped once <max_bytes> is exceeded.
+
+    Parameters
+    ----------
+    sources: list
+        Wells in browsing order, e.g. LAS file paths or store well names
+    loader: function
+        Reads one source, e.g. functools.partial(read_well, root) to
+        memory-map wells of the processed store
+        Default is lasio.read
+    ahead: integer
+        Number of wells prefetched after the current one
+        Default is 2
+    max_bytes: integer
+        Memory budget of the loaded wells, the current well is always kept
+        Default is 512 MB
+    max_workers: integer
+        Number of loading threads
+        Default is 2
+    """
+
+    def __init__(self, sources, loader=lasio.read, ahead=2,
+                 max_bytes=512 * 2 ** 20, max_workers=2):
+        self.sources = list(sources)
+        self.loader = loader
+        self.ahead = ahead
+        self.max_bytes = max_bytes
+        self.position = 0
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+        self._futures = {}
+        self._loaded = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.sources)
+
+    def window(self, position=None):
+        """Return the indices kept around <position>, nearest first."""
+        position = self.position if position is None else position
+        indices = [position] + \
+            [position + i for i in range(1, self.ahead + 1)] + [position - 1]
+        return [i for i in indices if 0 <= i < len(self.sources)]
+
+    def _load(self, index):
+        data = self.loader(self.sources[index])
+        with self._lock:
+            self._loaded[index] = data
+            self._trim()
+        return data
+
+    def _trim(self):
+        # drop the loaded wells farthest from the current one
+        total = sum(data_nbytes(d) for d in self._loaded.values())
+        for index in sorted(self._loaded,
+                            key=lambda i: -abs(i - self.position)):
+            if total <= self.max_bytes or index == self.position:
+                break
+            total -= data_nbytes(self._loaded.pop(index))
+            self._futures.pop(index, None)
+
+    def _prefetch(self):
+        window = self.window()
+        with self._lock:
+            for index, future in list(self._futures.items()):
+                if index not in window and future.cancel():
+                    del self._futures[index]
+            for index in window:
+                if index not in self._futures and index not in self._loaded:
+                    self._futures[index] = self._pool.submit(self._load,
+                                                             index)
+
+    def is_loaded(self, index):
+        """Return wether well <index> is parsed and in memory."""
+        with self._lock:
+            return index in self._loaded
+
+    def get(self, index):
+        """Return well <index> and make it the current well.
+
+        Parameters
+        ----------
+        index: integer
+            Position in <sources>, negative counts from the end
+
+        Returns
+        -------
+        lasio dataset or whatever <loader> returns
+        """
+        if index < 0:
+            index += len(self.sources)
+        if not 0 <= index < len(self.sources):
+            raise IndexError(f'well {index} outside 0-{len(self.sources)}')
+        self.position = index
+        # stale prefetches are cancelled before waiting, and the current
+        # well is queued ahead of the new ones
+        self._prefetch()
+        with self._lock:
+            data = self._loaded.get(index)
+            future = self._futures.get(index)
+        if data is None:
+            if future is None:
+                future = self._pool.submit(self._load, index)
+            data = future.result()
+        return data
+
+    __getitem__ = get
+
+    def current(self):
+        """Return the current well."""
+        return self.get(self.position)
+
+    def next(self):
+        """Return the next well, or None at the end of the list."""
+        if self.position + 1 >= len(self.sources):
+            return None
+        return self.get(self.position + 1)
+
+    def previous(self):
+        """Return the previous well, or None at the start of the list."""
+        if self.position == 0:
+            return None
+        return self.get(self.position - 1)
+
+    def __iter__(self):
+        for index in range(len(self.sources)):
+            yield self.sources[index], self.get(index)
+
+    def close(self):
+        """Cancel the pending prefetches and stop the loading threads."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            self._futures.clear()
+            self._loaded.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
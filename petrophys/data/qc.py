@@ -0,0 +1,210 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from petrophys.data.filters import despike
+
+
+def run_lengths(mask):
+    """Return the starts and lengths of the runs of True in <mask>.
+
+    Parameters
+    ----------
+    mask: np.ndarray of bool
+
+    Returns
+    -------
+    tuple of np.ndarray
+        start index and length of every run
+    """
+    mask = np.asarray(mask, dtype=np.int8)
+    edges = np.diff(np.concatenate(([0], mask, [0])))
+    starts = np.flatnonzero(edges == 1)
+    stops = np.flatnonzero(edges == -1)
+    return starts, stops - starts
+
+
+def _expand(starts, lengths, size):
+    # mark the samples of the given runs
+    marks = np.zeros(size + 1, dtype=np.int32)
+    np.add.at(marks, starts, 1)
+    np.add.at(marks, starts + lengths, -1)
+    return np.cumsum(marks[:-1]) > 0
+
+
+def nan_mask(values):
+    """Return where <values> is absent."""
+    return np.isnan(np.asarray(values, dtype=float))
+
+
+def flat_mask(values, min_length=10, tol=0.0):
+    """Return the samples in runs of at least <min_length> constant values.
+
+    Parameters
+    ----------
+    values: np.ndarray
+    min_length: int
+        Shortest run reported as a flatline, in samples
+        Default is 10
+    tol: float
+        Largest change between samples still counted as constant
+        Default is 0.0
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size < 2:
+        return np.zeros(values.shape, dtype=bool)
+    same = np.abs(np.diff(values)) <= tol
+    starts, lengths = run_lengths(same)
+    # a run of n equal steps covers n + 1 samples
+    keep = lengths + 1 >= min_length
+    return _expand(starts[keep], lengths[keep] + 1, values.size)
+
+
+def spike_mask(values, window=11, threshold=5.0):
+    """Return the samples that deviate from a rolling median by many MADs.
+
+    The rolling median and median absolute deviation are computed on
+    sliding_window_view windows centred on every sample, see
+    petrophys.data.filters.despike.
+
+    Parameters
+    ----------
+    values: np.ndarray
+    window: int
+        Window length in samples, odd
+        Default is 11
+    threshold: float
+        Number of scaled MADs (1.4826 * MAD) a spike deviates
+        Default is 5.0
+    """
+    values = np.asarray(values, dtype=float)
+    if values.size < window:
+        return np.zeros(values.shape, dtype=bool)
+    return despike(values, window, threshold)[1]
+
+
+def depth_report(depth, tol=0.01):
+    """Check that <depth> is monotonic with a consistent step.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    tol: float
+        Largest relative deviation from the median step
+        Default is 0.01
+
+    Returns
+    -------
+    dict
+        monotonic, step (median), irregular_steps (count) and
+        first_irregular (depth of the first irregular step or NaN)
+    """
+    depth = np.asarray(depth, dtype=float)
+    steps = np.diff(depth)
+    if steps.size == 0:
+        return {'monotonic': True, 'step': np.nan, 'irregular_steps': 0,
+                'first_irregular': np.nan}
+    monotonic = bool((steps > 0).all() or (steps < 0).all())
+    step = float(np.median(steps))
+    irregular = np.abs(steps - step) > tol * abs(step)
+    first = depth[np.argmax(irregular)] if irregular.any() else np.nan
+    return {
+        'monotonic': monotonic,
+        'step': step,
+        'irregular_steps': int(irregular.sum()),
+        'first_irregular': float(first),
+    }
+
+
+def qc_masks(values, flat_length=10, spike_window=11, spike_threshold=5.0):
+    """Return the nan, flat and spike masks of one curve."""
+    return {
+        'nan': nan_mask(values),
+        'flat': flat_mask(values, flat_length),
+        'spike': spike_mask(values, spike_window, spike_threshold),
+    }
+
+
+def qc_well(data, curves=None, depth='DEPT', flat_length=10,
+            spike_window=11, spike_threshold=5.0):
+    """Scan the curves of one well and report their quality.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    curves: list of str
+        Curves to scan
+        Default is all curves except the depth
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    flat_length: int
+        See `flat_mask`
+    spike_window: int
+        See `spike_mask`
+    spike_threshold: float
+        See `spike_mask`
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per curve, with the depth checks repeated on every row
+    """
+    if curves is None:
+        curves = [c for c in data.keys() if c != depth]
+    depth_values = np.asarray(data[depth], dtype=float)
+    checks = depth_report(depth_values)
+
+    rows = []
+    for mnemonic in curves:
+        values = np.asarray(data[mnemonic], dtype=float)
+        masks = qc_masks(values, flat_length, spike_window, spike_threshold)
+        _, nan_lengths = run_lengths(masks['nan'])
+        _, flat_lengths = run_lengths(masks['flat'])
+        valid = ~masks['nan']
+        rows.append({
+            'curve': mnemonic,
+            'samples': values.size,
+            'pct_nan': 100.0 * masks['nan'].mean() if values.size else 0.0,
+            'longest_nan_run': int(nan_lengths.max(initial=0)),
+            'flat_runs': flat_lengths.size,
+            'longest_flat_run': int(flat_lengths.max(initial=0)),
+            'spikes': int(masks['spike'].sum()),
+            'top': float(depth_values[valid].min()) if valid.any()
+            else np.nan,
+            'base': float(depth_values[valid].max()) if valid.any()
+            else np.nan,
+            **checks,
+        })
+    return pd.DataFrame(rows)
+
+
+def qc_field(wells, max_workers=None, **kwargs):
+    """Run `qc_well` on many wells in parallel.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset or mapping of curves
+    max_workers: int
+        Number of threads
+        Default is chosen by ThreadPoolExecutor
+    kwargs:
+        Passed to `qc_well`
+
+    Returns
+    -------
+    pd.DataFrame
+        The reports of all wells with a well column
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {name: pool.submit(qc_well, data, **kwargs)
+                   for name, data in wells.items()}
+        reports = [future.result().assign(well=name)
+                   for name, future in futures.items()]
+    if not reports:
+        return pd.DataFrame()
+    report = pd.concat(reports, ignore_index=True)
+    return report[['well'] + [c for c in report.columns if c != 'well']]
@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+
+from petrophys.data.store import list_wells, read_metadata, read_well
+
+
+def depth_slice(depth, top=None, base=None):
+    """Return the slice of <depth> between <top> and <base> (inclusive).
+
+    <depth> must be increasing, as in the processed store, so the bounds
+    are found by binary search without reading the whole curve.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    top: float
+        Default is the start of the curve
+    base: float
+        Default is the end of the curve
+
+    Returns
+    -------
+    slice
+    """
+    start = 0 if top is None else int(np.searchsorted(depth, top, 'left'))
+    stop = len(depth) if base is None else \
+        int(np.searchsorted(depth, base, 'right'))
+    return slice(start, max(start, stop))
+
+
+def _interval(well, top, base, zone, catalog):
+    if zone is None:
+        return top, base
+    if isinstance(zone, dict):
+        interval = zone.get(well)
+    else:
+        interval = catalog.unit_interval(well, zone)
+    if interval is None:
+        return None
+    ztop, zbase = interval
+    # a zone and a depth range together select their overlap
+    ztop = ztop if top is None else max(ztop, top)
+    zbase = base if zbase is None else (zbase if base is None
+                                        else min(zbase, base))
+    return ztop, zbase
+
+
+def _selections(root, wells, curves, top, base, zone, catalog):
+    if isinstance(zone, str) and catalog is None:
+        raise ValueError('a zone name needs a catalog with tops')
+    for well in wells:
+        interval = _interval(well, top, base, zone, catalog)
+        if interval is None:
+            continue
+        metadata = read_metadata(root, well)
+        data = read_well(root, well,
+                         curves=[c for c in curves if c in metadata['curves']])
+        index = metadata['index']
+        rows = depth_slice(data[index], *interval)
+        if rows.stop > rows.start:
+            yield well, index, data, rows
+
+
+def iter_query(root, curves, wells=None, top=None, base=None, zone=None,
+               catalog=None):
+    """Yield the selected samples well by well.
+
+    Parameters
+    ----------
+    See `query`
+
+    Yields
+    ------
+    tuple of str and dict of np.ndarray
+        Well name and its depth plus curves, absent curves are NaN
+    """
+    wells = list_wells(root) if wells is None else wells
+    for well, index, data, rows in _selections(root, wells, curves, top,
+                                               base, zone, catalog):
+        size = rows.stop - rows.start
+        chunk = {'DEPT': np.array(data[index][rows])}
+        for curve in curves:
+            if curve in data:
+                chunk[curve] = np.array(data[curve][rows])
+            else:
+                chunk[curve] = np.full(size, np.nan, dtype=np.float32)
+        yield well, chunk
+
+
+def query(root, curves, wells=None, top=None, base=None, zone=None,
+          catalog=None, dtype=np.float32):
+    """Return the samples of <curves> in a depth range across many wells.
+
+    The curves are memory-mapped from the processed store and the depth
+    range is located by binary search on the depth index, so only the
+    selected samples are read and the cost follows the size of the
+    selection, not of the store.
+
+    Parameters
+    ----------
+    root: str or Path
+        Directory of the processed store
+    curves: list of str
+        Mnemonics to return, absent curves are NaN
+    wells: list of str
+        Wells to query
+        Default is all wells in the store
+    top: float
+        Top of the depth range
+        Default is None
+    base: float
+        Base of the depth range
+        Default is None
+    zone: str or dict
+        Stratigraphic unit looked up per well in <catalog>, or a dict of
+        well name to (top, base). Combined with top and base the overlap
+        is selected. Wells without the zone are skipped.
+        Default is None
+    catalog: WellCatalog
+        Catalog with the tops, required for a zone name
+        Default is None
+    dtype: numpy dtype
+        dtype of the returned columns
+        Default is float32
+
+    Returns
+    -------
+    pd.DataFrame
+        Columns well (categorical), DEPT and one per curve
+    """
+    wells = list_wells(root) if wells is None else list(wells)
+    selections = list(_selections(root, wells, curves, top, base, zone,
+                                  catalog))
+    sizes = [rows.stop - rows.start for _, _, _, rows in selections]
+    total = sum(sizes)
+
+    names = [well for well, _, _, _ in selections]
+    codes = np.repeat(np.arange(len(names), dtype=np.int32), sizes)
+    columns = {'DEPT': np.empty(total, dtype=dtype)}
+    for curve in curves:
+        columns[curve] = np.full(total, np.nan, dtype=dtype)
+
+    start = 0
+    for (well, index, data, rows), size in zip(selections, sizes):
+        out = slice(start, start + size)
+        columns['DEPT'][out] = data[index][rows]
+        for curve in curves:
+            if curve in data:
+                columns[curve][out] = data[curve][rows]
+        start += size
+
+    frame = pd.DataFrame(columns)
+    frame.insert(0, 'well', pd.Categorical.from_codes(codes, names))
+    return frame
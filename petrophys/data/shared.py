@@ -0,0 +1,219 @@
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedWell:
+    """Picklable description of a well held in shared memory.
+
+    Only this small object is sent to the workers, which attach to the
+    buffer with `attach_well`.
+
+    Parameters
+    ----------
+    well: str
+        Name of the well
+    buffer: str
+        Name of the shared memory block
+    curves: tuple
+        (mnemonic, offset in bytes, length) of every curve
+    dtype: str
+        dtype of all curves
+    """
+    well: str
+    buffer: str
+    curves: tuple
+    dtype: str
+
+
+# blocks attached by this process, by name, kept open for the views
+_ATTACHED = {}
+_ATTACHED_LOCK = threading.Lock()
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # before Python 3.13 attaching registers the block with the
+        # resource tracker again, pool workers share the tracker of the
+        # process that created the block so this is a no-op there
+        return shared_memory.SharedMemory(name=name)
+
+
+def _views(shm, spec):
+    views = {}
+    for mnemonic, offset, length in spec.curves:
+        view = np.ndarray((length,), dtype=spec.dtype, buffer=shm.buf,
+                          offset=offset)
+        view.flags.writeable = False
+        views[mnemonic] = view
+    return views
+
+
+def attach_well(spec):
+    """Return the curves of a shared well as zero-copy read-only arrays.
+
+    The block stays attached for the life of the process, so later tasks
+    on the same well attach for free.
+
+    Parameters
+    ----------
+    spec: SharedWell
+
+    Returns
+    -------
+    dict
+        Mnemonic to np.ndarray
+    """
+    with _ATTACHED_LOCK:
+        shm = _ATTACHED.get(spec.buffer)
+        if shm is None:
+            shm = _ATTACHED[spec.buffer] = _attach(spec.buffer)
+    return _views(shm, spec)
+
+
+def detach_all():
+    """Close the blocks attached by this process."""
+    with _ATTACHED_LOCK:
+        for shm in _ATTACHED.values():
+            try:
+                shm.close()
+            except BufferError:
+                # arrays still refer to the block, it closes with them
+                pass
+        _ATTACHED.clear()
+
+
+def _release(blocks):
+    for shm in blocks:
+        try:
+            shm.close()
+        except BufferError:
+            pass
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedCurves:
+    """Registry of well curves in named shared memory blocks.
+
+    Every well is copied once into one block, after which any number of
+    worker processes read it through `attach_well` without copying or
+    pickling the arrays. The blocks are removed by `close`, at the end of
+    a with statement, or when the registry is garbage collected.
+
+    Parameters
+    ----------
+    dtype: numpy dtype
+        dtype of the shared curves
+        Default is float64
+    """
+
+    def __init__(self, dtype=np.float64):
+        self.dtype = np.dtype(dtype)
+        self.wells = {}
+        self._blocks = []
+        self._finalizer = weakref.finalize(self, _release, self._blocks)
+
+    def add(self, well, data, curves=None):
+        """Copy the curves of <well> into a shared block.
+
+        Parameters
+        ----------
+        well: str
+            Name of the well
+        data: lasio dataset or mapping
+            Curves indexed by mnemonic, e.g. from
+            petrophys.data.store.read_well
+        curves: list of str
+            Curves to share
+            Default is all curves
+
+        Returns
+        -------
+        SharedWell
+        """
+        if well in self.wells:
+            raise ValueError(f'well {well!r} is already shared')
+        curves = list(data.keys()) if curves is None else list(curves)
+        arrays = [np.asarray(data[c]) for c in curves]
+        sizes = [a.size * self.dtype.itemsize for a in arrays]
+        # curves start on 64 byte boundaries for aligned vector loads
+        offsets = np.concatenate(([0], np.cumsum([-(-s // 64) * 64
+                                                  for s in sizes])))
+        shm = shared_memory.SharedMemory(create=True,
+                                         size=max(int(offsets[-1]), 1))
+        self._blocks.append(shm)
+
+        spec = SharedWell(
+            well, shm.name,
+            tuple((c, int(o), a.size)
+                  for c, o, a in zip(curves, offsets, arrays)),
+            self.dtype.str)
+        for (mnemonic, offset, length), values in zip(spec.curves, arrays):
+            target = np.ndarray((length,), dtype=self.dtype, buffer=shm.buf,
+                                offset=offset)
+            target[:] = values
+        self.wells[well] = spec
+        return spec
+
+    def __getitem__(self, well):
+        return self.wells[well]
+
+    def __contains__(self, well):
+        return well in self.wells
+
+    def nbytes(self):
+        """Return the total size of the shared blocks."""
+        return sum(shm.size for shm in self._blocks)
+
+    def close(self):
+        """Remove all shared blocks, workers must be done with them."""
+        self._finalizer()
+        self.wells.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _call(func, spec, args, kwargs):
+    return func(attach_well(spec), *args, **kwargs)
+
+
+def map_wells(func, specs, *args, max_workers=None, **kwargs):
+    """Run func(curves, *args, **kwargs) for shared wells in a process pool.
+
+    Only the SharedWell descriptions travel to the workers, the curves
+    are attached there as zero-copy views.
+
+    Parameters
+    ----------
+    func: function
+        Module-level function taking the dict of curves of one well
+    specs: dict or list of SharedWell
+        e.g. SharedCurves.wells
+    max_workers: int
+        Number of processes
+        Default is chosen by ProcessPoolExecutor
+
+    Returns
+    -------
+    dict
+        Well name to the result of <func>
+    """
+    specs = list(specs.values()) if isinstance(specs, dict) else list(specs)
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {spec.well: pool.submit(_call, func, spec, args, kwargs)
+                   for spec in specs}
+        return {well: future.result() for well, future in futures.items()}
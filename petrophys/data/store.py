@@ -0,0 +1,166 @@
+import json
+import re
+from pathlib import Path
+
+import numpy as np
+
+
+METADATA = 'curves.json'
+
+
+def well_name(lasfile):
+    """Return a file system friendly name for the well of <lasfile>.
+
+    E.g. 'CAPELLE- 1' becomes 'CAPELLE-1'
+
+    Parameters
+    ----------
+    lasfile: lasio dataset
+
+    Returns
+    -------
+    str
+    """
+    name = str(lasfile.well['WELL'].value).strip()
+    return re.sub(r'[^\w.-]+', '', name.replace(' ', '')) or 'UNKNOWN'
+
+
+def _curve_file(mnemonic):
+    return re.sub(r'[^\w.-]+', '_', mnemonic) + '.npy'
+
+
+def compact_curves(lasfile, dtype=np.float32, curves=None):
+    """Return the curves of <lasfile> as read-only arrays of <dtype>.
+
+    Absent values are already NaN in a lasio dataset. Storing in float32
+    halves the memory of a well compared with the float64 arrays of
+    lasio, which is enough precision for log values and depths in m.
+
+    Parameters
+    ----------
+    lasfile: lasio dataset
+    dtype: numpy dtype
+        dtype of the returned arrays
+        Default is float32
+    curves: list
+        Mnemonics to return
+        Default is all curves
+
+    Returns
+    -------
+    dict of np.ndarray
+    """
+    out = {}
+    for curve in lasfile.curves:
+        if curves is not None and curve.mnemonic not in curves:
+            continue
+        arr = np.asarray(curve.data, dtype=dtype)
+        if arr is curve.data:
+            arr = arr.view()
+        arr.flags.writeable = False
+        out[curve.mnemonic] = arr
+    return out
+
+
+def write_well(lasfile, root, name=None, dtype=np.float32):
+    """Write the curves of <lasfile> to the processed store at <root>.
+
+    Every curve is saved as <root>/<name>/<mnemonic>.npy in increasing
+    depth order, with units and well header values in curves.json.
+
+    Parameters
+    ----------
+    lasfile: lasio dataset
+    root: str or Path
+        Directory of the processed store, e.g. data/processed
+    name: str
+        Name of the well in the store
+        Default is derived from the WELL header
+    dtype: numpy dtype
+        dtype of the stored curves
+        Default is float32
+
+    Returns
+    -------
+    Path
+        Directory of the stored well
+    """
+    name = name or well_name(lasfile)
+    directory = Path(root) / name
+    directory.mkdir(parents=True, exist_ok=True)
+
+    index = lasfile.curves[0].mnemonic
+    depth = np.asarray(lasfile.curves[0].data)
+    order = slice(None, None, -1) if depth[0] > depth[-1] else slice(None)
+
+    curves = {}
+    for curve in lasfile.curves:
+        filename = _curve_file(curve.mnemonic)
+        data = np.ascontiguousarray(np.asarray(curve.data)[order], dtype=dtype)
+        np.save(directory / filename, data)
+        curves[curve.mnemonic] = {
+            'file': filename,
+            'unit': curve.unit,
+            'descr': curve.descr,
+        }
+
+    well = {item.mnemonic: str(item.value) for item in lasfile.well}
+    metadata = {
+        'well': name,
+        'index': index,
+        'size': int(depth.size),
+        'dtype': np.dtype(dtype).name,
+        'header': well,
+        'curves': curves,
+    }
+    (directory / METADATA).write_text(json.dumps(metadata, indent=2))
+    return directory
+
+
+def read_metadata(root, name):
+    """Return the curves.json metadata of well <name> in the store."""
+    return json.loads((Path(root) / name / METADATA).read_text())
+
+
+def list_wells(root):
+    """Return the names of the wells in the processed store at <root>."""
+    return sorted(p.parent.name for p in Path(root).glob('*/' + METADATA))
+
+
+def read_well(root, name, curves=None, mmap=True):
+    """Return the stored curves of well <name> as read-only arrays.
+
+    With mmap the arrays are memory-mapped views of the .npy files, so
+    nothing is read from disk until a slice of the curve is used and
+    several sessions share the same pages of the OS cache.
+
+    Parameters
+    ----------
+    root: str or Path
+        Directory of the processed store
+    name: str
+        Name of the well in the store
+    curves: list
+        Mnemonics to return, the depth index is always included
+        Default is all curves
+    mmap: Boolean
+        Defines wether or not to memory-map the curves
+        Default is True
+
+    Returns
+    -------
+    dict of np.ndarray
+    """
+    metadata = read_metadata(root, name)
+    directory = Path(root) / name
+    wanted = metadata['curves'].keys() if curves is None else curves
+
+    out = {}
+    for mnemonic in [metadata['index'], *wanted]:
+        if mnemonic in out:
+            continue
+        filename = metadata['curves'][mnemonic]['file']
+        arr = np.load(directory / filename, mmap_mode='r' if mmap else None)
+        arr.flags.writeable = False
+        out[mnemonic] = arr
+    return out
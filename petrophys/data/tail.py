@@ -0,0 +1,151 @@
+from pathlib import Path
+
+import lasio
+import numpy as np
+
+
+class GrowableCurves:
+    """Curves in a preallocated buffer that grows by doubling.
+
+    Appending n rows costs O(n) amortized, and the curves are returned as
+    views of the filled part, so they can be used like a lasio dataset.
+
+    Parameters
+    ----------
+    mnemonics: list of str
+    capacity: integer
+        Number of rows allocated up front
+        Default is 4096
+    dtype: numpy dtype
+        Default is float64
+    """
+
+    def __init__(self, mnemonics, capacity=4096, dtype=np.float64):
+        self.mnemonics = list(mnemonics)
+        self._index = {m: i for i, m in enumerate(self.mnemonics)}
+        self._buffer = np.empty((max(capacity, 1), len(self.mnemonics)),
+                                dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return self._buffer.shape[0]
+
+    def append(self, rows):
+        """Append an (n, ncurves) block of rows."""
+        rows = np.asarray(rows, dtype=self._buffer.dtype)
+        end = self.size + len(rows)
+        if end > self.capacity:
+            grown = np.empty((max(end, 2 * self.capacity),
+                              self._buffer.shape[1]),
+                             dtype=self._buffer.dtype)
+            grown[:self.size] = self._buffer[:self.size]
+            self._buffer = grown
+        self._buffer[self.size:end] = rows
+        self.size = end
+
+    def clear(self):
+        self.size = 0
+
+    def keys(self):
+        return list(self.mnemonics)
+
+    def __contains__(self, mnemonic):
+        return mnemonic in self._index
+
+    def __getitem__(self, mnemonic):
+        """Return curve <mnemonic> as a view of the filled rows."""
+        return self._buffer[:self.size, self._index[mnemonic]]
+
+    def rows(self, start, stop=None):
+        """Return the rows <start> to <stop> as an (n, ncurves) view."""
+        return self._buffer[start:self.size if stop is None else stop]
+
+
+class LasTail:
+    """Follow a LAS file that is being appended to during logging.
+
+    The header is read once, after which `update` parses only the bytes
+    appended since the previous call, up to the last complete line, into
+    a `GrowableCurves` buffer. The cost of an update follows the number
+    of new rows, not the size of the file. A file that shrinks (rewritten)
+    is read again from the start.
+
+    Parameters
+    ----------
+    path: str or Path
+    capacity: integer
+        Rows allocated up front, see `GrowableCurves`
+        Default is 4096
+    """
+
+    def __init__(self, path, capacity=4096):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.offset = None
+        self.header = None
+        self.curves = None
+        self.null = None
+
+    def _read_header(self):
+        # the header ends at the line starting with ~A
+        with open(self.path, 'rb') as f:
+            header = []
+            for line in f:
+                if line.lstrip().upper().startswith(b'~A'):
+                    offset = f.tell()
+                    break
+                header.append(line)
+            else:
+                return False
+        text = b''.join(header).decode('utf-8', errors='replace')
+        las = lasio.read(text + '~ASCII\n', ignore_data=True)
+        wrap = las.version['WRAP'].value if 'WRAP' in las.version else 'NO'
+        if str(wrap).strip().upper() == 'YES':
+            raise ValueError('wrapped LAS files cannot be followed')
+        self.header = las
+        self.null = las.well['NULL'].value if 'NULL' in las.well else None
+        self.curves = GrowableCurves(las.keys(), self.capacity)
+        self.offset = offset
+        return True
+
+    def update(self):
+        """Parse the rows appended since the last update.
+
+        Returns
+        -------
+        int
+            Number of new rows
+        """
+        size = self.path.stat().st_size
+        if self.offset is not None and size < self.offset:
+            self.offset = None
+        if self.offset is None and not self._read_header():
+            return 0
+        if size <= self.offset:
+            return 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            chunk = f.read(size - self.offset)
+        # a partly written last line is left for the next update
+        end = chunk.rfind(b'\n') + 1
+        if end == 0:
+            return 0
+        chunk = chunk[:end]
+        if b'#' in chunk:
+            chunk = b'\n'.join(line for line in chunk.splitlines()
+                               if not line.lstrip().startswith(b'#'))
+        values = np.array(chunk.split(), dtype=float)
+        ncurves = len(self.curves.mnemonics)
+        if values.size % ncurves:
+            raise ValueError(f'{values.size} values do not fill rows of '
+                             f'{ncurves} curves after byte {self.offset}')
+        if self.null is not None:
+            values[values == float(self.null)] = np.nan
+        self.offset += end
+        self.curves.append(values.reshape(-1, ncurves))
+        return len(values) // ncurves
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+
+# Dutch headers of the stratigraphy exports mapped to canonical names
+TOPS_COLUMNS = {
+    'Stratigrafische eenheid': 'unit',
+    'Bovenkant (m)': 'top',
+    'Onderkant (m)': 'base',
+    'Anomaliecode': 'anomaly',
+}
+
+
+def read_tops(path):
+    """Read a stratigraphy file such as Diepte_stratigrafische_eenheden.csv.
+
+    Leading empty rows are skipped and the Dutch headers renamed to unit,
+    top, base and anomaly.
+
+    Parameters
+    ----------
+    path: str or Path
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per stratigraphic unit sorted by top
+    """
+    with open(path, encoding='utf-8') as f:
+        skip = 0
+        for line in f:
+            if line.strip(' ,\n\r'):
+                break
+            skip += 1
+    frame = pd.read_csv(path, skiprows=skip)
+    frame = frame.rename(columns=lambda c: TOPS_COLUMNS.get(c.strip(), c))
+    frame = frame.dropna(subset=['unit', 'top'])
+    frame['unit'] = frame['unit'].str.strip()
+    return frame.sort_values('top', ignore_index=True)
+
+
+def top_depth(tops, unit):
+    """Return the top depth of <unit> in <tops> (NaN when absent).
+
+    Parameters
+    ----------
+    tops: pd.DataFrame
+        Output of `read_tops`
+    unit: str
+        Name of the stratigraphic unit, case insensitive
+
+    Returns
+    -------
+    float
+    """
+    match = tops['unit'].str.lower() == unit.strip().lower()
+    if not match.any():
+        return np.nan
+    return float(tops.loc[match, 'top'].iloc[0])
@@ -0,0 +1,266 @@
+from collections import deque
+from functools import lru_cache
+
+import numpy as np
+
+
+# Spellings found in LAS headers mapped to one canonical unit
+ALIASES = {
+    'M': 'm',
+    'F': 'ft',
+    'FT': 'ft',
+    'FEET': 'ft',
+    'US/F': 'us/ft',
+    'US/FT': 'us/ft',
+    'USEC/FT': 'us/ft',
+    'US/M': 'us/m',
+    'USEC/M': 'us/m',
+    'M/S': 'm/s',
+    'KM/S': 'km/s',
+    'F/S': 'ft/s',
+    'FT/S': 'ft/s',
+    'FT/SEC': 'ft/s',
+    'G/C3': 'g/cm3',
+    'G/CC': 'g/cm3',
+    'G/CM3': 'g/cm3',
+    'G/CM³': 'g/cm3',
+    'KG/M3': 'kg/m3',
+    'V/V': 'v/v',
+    'FRAC': 'v/v',
+    'DEC': 'v/v',
+    '%': '%',
+    'PU': '%',
+    'GAPI': 'gAPI',
+    'API': 'gAPI',
+    'PA': 'Pa',
+    'MPA': 'MPa',
+    'GPA': 'GPa',
+}
+
+# Direct conversions y = (a*x + b) / (c*x + d) stored as (a, b, c, d).
+# Chains of these compose like 2x2 matrices, so any planned conversion
+# is again a single (a, b, c, d) applied in one pass.
+CONVERSIONS = {
+    ('ft', 'm'): (0.3048, 0.0, 0.0, 1.0),
+    ('us/ft', 'us/m'): (1 / 0.3048, 0.0, 0.0, 1.0),
+    ('us/m', 'm/s'): (0.0, 1e6, 1.0, 0.0),
+    ('ft/s', 'm/s'): (0.3048, 0.0, 0.0, 1.0),
+    ('km/s', 'm/s'): (1000.0, 0.0, 0.0, 1.0),
+    ('v/v', '%'): (100.0, 0.0, 0.0, 1.0),
+    ('g/cm3', 'kg/m3'): (1000.0, 0.0, 0.0, 1.0),
+    ('MPa', 'Pa'): (1e6, 0.0, 0.0, 1.0),
+    ('GPa', 'MPa'): (1000.0, 0.0, 0.0, 1.0),
+}
+
+
+def normalize_unit(unit):
+    """Return the canonical spelling of <unit>, e.g. 'US/F' -> 'us/ft'.
+
+    Unknown units are returned stripped but otherwise unchanged.
+    """
+    unit = (unit or '').strip()
+    return ALIASES.get(unit.upper(), unit)
+
+
+def _compose(first, second):
+    # second(first(x)) as a product of the 2x2 matrices
+    a1, b1, c1, d1 = first
+    a2, b2, c2, d2 = second
+    return (
+        a2 * a1 + b2 * c1,
+        a2 * b1 + b2 * d1,
+        c2 * a1 + d2 * c1,
+        c2 * b1 + d2 * d1,
+    )
+
+
+def _invert(conversion):
+    a, b, c, d = conversion
+    return (d, -b, -c, a)
+
+
+def _graph():
+    graph = {}
+    for (src, dst), conversion in CONVERSIONS.items():
+        graph.setdefault(src, {})[dst] = conversion
+        graph.setdefault(dst, {})[src] = _invert(conversion)
+    return graph
+
+
+@lru_cache(maxsize=None)
+def plan_conversion(from_unit, to_unit):
+    """Plan the conversion of values in <from_unit> to <to_unit>.
+
+    The shortest chain of registered conversions is fused into one
+    (a, b, c, d) tuple meaning y = (a*x + b) / (c*x + d).
+
+    Parameters
+    ----------
+    from_unit: str
+    to_unit: str
+
+    Returns
+    -------
+    tuple of 4 floats
+
+    Raises
+    ------
+    ValueError
+        When no chain of conversions connects the units
+    """
+    src, dst = normalize_unit(from_unit), normalize_unit(to_unit)
+    identity = (1.0, 0.0, 0.0, 1.0)
+    if src == dst:
+        return identity
+
+    graph = _graph()
+    queue = deque([(src, identity)])
+    seen = {src}
+    while queue:
+        unit, conversion = queue.popleft()
+        for nxt, step in graph.get(unit, {}).items():
+            if nxt in seen:
+                continue
+            fused = _compose(conversion, step)
+            if nxt == dst:
+                a, b, c, d = fused
+                # normalise so pure scalings read as (factor, 0, 0, 1)
+                norm = d if c == 0 else c
+                return (a / norm, b / norm, c / norm, d / norm)
+            seen.add(nxt)
+            queue.append((nxt, fused))
+    raise ValueError(f'no conversion from {from_unit!r} to {to_unit!r}')
+
+
+def scale_factor(from_unit, to_unit):
+    """Return the factor of the conversion, or None if it is not a scaling.
+
+    Pure scalings can be drawn with the x_factor of `subplot_curve`
+    without converting the data.
+    """
+    a, b, c, d = plan_conversion(from_unit, to_unit)
+    if b == 0 and c == 0:
+        return a / d
+    return None
+
+
+def convert(values, from_unit, to_unit, out=None):
+    """Convert <values> from <from_unit> to <to_unit>.
+
+    The planned conversion is applied with ufuncs writing into a single
+    buffer, so a chain such as us/ft -> us/m -> m/s costs one pass and
+    one array.
+
+    Parameters
+    ----------
+    values: np.ndarray
+    from_unit: str
+    to_unit: str
+    out: np.ndarray
+        Buffer for the result, may be <values> itself
+        Default is a new float array
+
+    Returns
+    -------
+    np.ndarray
+    """
+    a, b, c, d = plan_conversion(from_unit, to_unit)
+    values = np.asarray(values)
+    if out is None:
+        out = np.empty(values.shape, dtype=np.result_type(values, float))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if c == 0:
+            np.multiply(values, a / d, out=out)
+            if b != 0:
+                np.add(out, b / d, out=out)
+        else:
+            # (a*x + b) / (c*x + d) = a/c + (b - a*d/c) / (c*x + d)
+            np.multiply(values, c, out=out)
+            if d != 0:
+                np.add(out, d, out=out)
+            np.divide(b - a * d / c, out, out=out)
+            if a != 0:
+                np.add(out, a / c, out=out)
+    return out
+
+
+class CurveRegistry:
+    """Curves of one well together with their units.
+
+    Converted curves are computed once and cached per (mnemonic, unit),
+    so plotting the same curve again does not repeat the arithmetic.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    units: dict
+        Units per mnemonic, overrides the units of the lasio curve headers
+        Default is None
+    """
+
+    def __init__(self, data, units=None):
+        self.data = data
+        self.units = {}
+        for curve in getattr(data, 'curves', ()):
+            self.units[curve.mnemonic] = normalize_unit(curve.unit)
+        for mnemonic, unit in (units or {}).items():
+            self.units[mnemonic] = normalize_unit(unit)
+        self._cache = {}
+
+    def unit(self, mnemonic):
+        """Return the canonical unit of <mnemonic> ('' when unknown)."""
+        return self.units.get(mnemonic, '')
+
+    def get(self, mnemonic, unit=None):
+        """Return <mnemonic> in <unit> as a read-only array.
+
+        Parameters
+        ----------
+        mnemonic: str
+        unit: str
+            Target unit
+            Default is the unit of the curve header
+
+        Returns
+        -------
+        np.ndarray
+        """
+        source = self.unit(mnemonic)
+        target = normalize_unit(unit) if unit else source
+        if target == source:
+            return self.data[mnemonic]
+
+        key = (mnemonic, target)
+        if key not in self._cache:
+            values = convert(self.data[mnemonic], source, target)
+            values.flags.writeable = False
+            self._cache[key] = values
+        return self._cache[key]
+
+    def for_plot(self, mnemonic, unit=None):
+        """Return (data, x_factor) to draw <mnemonic> in <unit>.
+
+        Pure scalings are left to the x_factor of `subplot_curve` so the
+        curve is not copied, other conversions come from the cache.
+        """
+        source = self.unit(mnemonic)
+        if not unit or not source:
+            return self.data[mnemonic], 1.0
+        factor = scale_factor(source, unit)
+        if factor is not None:
+            return self.data[mnemonic], factor
+        return self.get(mnemonic, unit), 1.0
+
+    def label(self, mnemonic, unit=None, name=None):
+        """Return an axes label such as 'DT (us/m)'."""
+        # without a known source unit the curve is drawn unconverted
+        source = self.unit(mnemonic)
+        unit = normalize_unit(unit) if unit and source else source
+        name = name or mnemonic
+        return f'{name} ({unit})' if unit else name
+
+    def clear(self):
+        """Drop all cached conversions."""
+        self._cache.clear()
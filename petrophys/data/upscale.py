@@ -0,0 +1,259 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from petrophys.data.geomech import well_elastic_properties
+
+
+METHODS = ('arithmetic', 'harmonic', 'geometric')
+
+
+def uniform_layers(top, base, thickness):
+    """Return layers of equal <thickness> from <top> to <base>.
+
+    Parameters
+    ----------
+    top: float
+    base: float
+    thickness: float
+        Cell thickness, the last layer ends at <base>
+
+    Returns
+    -------
+    pd.DataFrame
+        top and base of every layer
+    """
+    if thickness <= 0:
+        raise ValueError(f'thickness must be positive, not {thickness}')
+    tops = np.arange(top, base, thickness, dtype=float)
+    return pd.DataFrame({'top': tops,
+                         'base': np.minimum(tops + thickness, base)})
+
+
+def sample_thickness(depth):
+    """Return the thickness each sample of a sorted <depth> stands for.
+
+    A sample reaches half way to its neighbours, the first and last
+    sample as far outward as inward.
+    """
+    depth = np.asarray(depth, dtype=float)
+    if len(depth) < 2:
+        return np.ones(len(depth))
+    spacing = np.diff(depth)
+    half = np.concatenate(([spacing[0]], spacing, [spacing[-1]])) / 2
+    return half[:-1] + half[1:]
+
+
+def _prepare(depth, values):
+    # sorted depth without NaN, values as a stack of curves
+    depth = np.asarray(depth, dtype=float)
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    keep = ~np.isnan(depth)
+    depth, values = depth[keep], values[:, keep]
+    if np.any(np.diff(depth) < 0):
+        order = np.argsort(depth, kind='stable')
+        depth, values = depth[order], values[:, order]
+    return depth, values
+
+
+def _transform(values, method):
+    if method not in METHODS:
+        raise ValueError(f'unknown method {method!r}, use one of '
+                         f'{", ".join(METHODS)}')
+    if method == 'arithmetic':
+        return values
+    # means of 1/x and log(x) are only defined for positive values
+    positive = np.where(values > 0, values, np.nan)
+    return 1.0 / positive if method == 'harmonic' else np.log(positive)
+
+
+def _invert(mean, method):
+    if method == 'harmonic':
+        with np.errstate(divide='ignore'):
+            return 1.0 / mean
+    if method == 'geometric':
+        return np.exp(mean)
+    return mean
+
+
+def _interval_sums(depth, top, base, weighted):
+    """Sum every curve of <weighted> over the samples in [top, base)."""
+    start = np.searchsorted(depth, top, side='left')
+    stop = np.searchsorted(depth, base, side='left')
+    cumulative = np.pad(np.cumsum(weighted, axis=-1), ((0, 0), (1, 0)))
+    return cumulative[:, stop] - cumulative[:, start]
+
+
+def upscale(depth, values, top, base, method='arithmetic'):
+    """Average curves into layers, weighted by sample thickness.
+
+    Samples belong to the layer holding their depth, layer i holds
+    top[i] <= depth < base[i]. All layer sums come from one cumulative
+    sum per curve read at the searchsorted layer bounds, so the cost is
+    O(n + layers). NaN samples are left out of the average, layers
+    without valid samples are NaN.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    values: np.ndarray
+        One curve, or curves stacked along the first axis
+    top: array-like
+        Top depth of every layer
+    base: array-like
+        Base depth of every layer
+    method: str or list of str
+        arithmetic (e.g. porosity), harmonic (permeability across the
+        layering) or geometric (permeability of random media), one per
+        curve for stacked curves. Harmonic and geometric means ignore
+        values <= 0.
+        Default is arithmetic
+
+    Returns
+    -------
+    np.ndarray
+        One value per layer (per curve)
+    """
+    single = np.ndim(values) == 1
+    depth, values = _prepare(depth, values)
+    top = np.asarray(top, dtype=float)
+    base = np.asarray(base, dtype=float)
+    methods = [method] * len(values) if isinstance(method, str) \
+        else list(method)
+    if len(methods) != len(values):
+        raise ValueError(f'{len(methods)} methods for {len(values)} curves')
+
+    transformed = np.stack([_transform(row, m)
+                            for row, m in zip(values, methods)])
+    valid = ~np.isnan(transformed)
+    thickness = sample_thickness(depth)
+    total = _interval_sums(depth, top, base,
+                           np.where(valid, transformed * thickness, 0.0))
+    weight = _interval_sums(depth, top, base, valid * thickness)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(weight > 0, total / weight, np.nan)
+    result = np.stack([_invert(row, m) for row, m in zip(mean, methods)])
+    return result[0] if single else result
+
+
+def backus(depth, vp, vs, rho, top, base):
+    """Backus average of thin elastic layers into thick layers.
+
+    The vertical P-wave and shear moduli of the effective medium are the
+    harmonic means of rho * Vp**2 and rho * Vs**2, the density is the
+    arithmetic mean.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    vp: np.ndarray
+        compressional velocity in m/s
+    vs: np.ndarray
+        shear velocity in m/s
+    rho: np.ndarray
+        bulk density in kg/m3
+    top: array-like
+    base: array-like
+
+    Returns
+    -------
+    dict of np.ndarray
+        Vertical Vp and Vs (m/s) and rho (kg/m3) per layer
+    """
+    rho = np.asarray(rho, dtype=float)
+    moduli = np.stack([rho * np.asarray(vp, dtype=float) ** 2,
+                       rho * np.asarray(vs, dtype=float) ** 2, rho])
+    p_modulus, shear, density = upscale(
+        depth, moduli, top, base, ['harmonic', 'harmonic', 'arithmetic'])
+    with np.errstate(invalid='ignore'):
+        return {'Vp': np.sqrt(p_modulus / density),
+                'Vs': np.sqrt(shear / density),
+                'rho': density}
+
+
+def upscale_well(data, layers, methods=None, depth='DEPT', elastic=False):
+    """Upscale the curves of a well into layers.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    layers: pd.DataFrame
+        Layers with top and base, e.g. from `uniform_layers`,
+        petrophys.data.tops.read_tops or petrophys.data.blocking.block_well
+    methods: dict
+        Mnemonic to averaging method, see `upscale`, e.g.
+        {'NPHI': 'arithmetic', 'PERM': 'harmonic'}
+        Default is arithmetic for every curve except the depth
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    elastic: Boolean
+        Defines wether or not to add the Backus averaged Vp, Vs and rho
+        of petrophys.data.geomech.well_elastic_properties
+        Default is False
+
+    Returns
+    -------
+    pd.DataFrame
+        <layers> with the upscaled curves as columns
+    """
+    if methods is None:
+        methods = {c: 'arithmetic' for c in data.keys() if c != depth}
+    result = layers.reset_index(drop=True).copy()
+    top = result['top'].to_numpy(dtype=float)
+    base = result['base'].to_numpy(dtype=float)
+    curves = list(methods)
+    if curves:
+        # all curves of the well in one stacked pass
+        stacked = np.stack([np.asarray(data[c], dtype=float) for c in curves])
+        values = upscale(data[depth], stacked, top, base,
+                         [methods[c] for c in curves])
+        for mnemonic, upscaled in zip(curves, values):
+            result[mnemonic] = upscaled
+    if elastic:
+        properties = well_elastic_properties(data)
+        averaged = backus(properties['DEPT'], properties['Vp'],
+                          properties['Vs'], properties['rho'], top, base)
+        for name, upscaled in averaged.items():
+            result[name] = upscaled
+    return result
+
+
+def upscale_field(wells, layers, methods=None, max_workers=None, **kwargs):
+    """Run `upscale_well` on many wells in parallel.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset or mapping of curves
+    layers: pd.DataFrame or dict
+        One grid for every well, or well name to the layers of the well
+        (e.g. its tops)
+    methods: dict
+        See `upscale_well`
+    max_workers: int
+        Number of threads
+        Default is chosen by ThreadPoolExecutor
+    kwargs:
+        Passed to `upscale_well`
+
+    Returns
+    -------
+    pd.DataFrame
+        The layers of all wells with a well column
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            name: pool.submit(upscale_well, data,
+                              layers[name] if isinstance(layers, dict)
+                              else layers, methods, **kwargs)
+            for name, data in wells.items()
+        }
+        upscaled = [future.result().assign(well=name)
+                    for name, future in futures.items()]
+    if not upscaled:
+        return pd.DataFrame()
+    upscaled = pd.concat(upscaled, ignore_index=True)
+    return upscaled[['well'] + [c for c in upscaled.columns if c != 'well']]
@@ -22,7 +22,8 @@ def convert_value_to_nan(arr: np.ndarray, value: float = -999.25):
     arr[arr==value] = np.nan
     return arr
 
-def get_values(measure_data, data_key, mini=False, maxi=False):
+def get_values(measure_data, data_key, mini=False, maxi=False, dtype=float,
+               copy=True):
     """Return values of a single column of a dataset 
 
 
@@ -38,16 +39,72 @@ def get_values(measure_data, data_key, mini=False, maxi=False):
     maxi: Boolean
         If true remove outliners
         Default is False
+    dtype: numpy dtype
+        dtype of the returned values, e.g. np.float32 for compact storage
+        Default is float
+    copy: Boolean
+        If false the column is returned without copying when it already
+        has the requested dtype
+        Default is True
 
     Returns
     -------
     np.array
 
     """
-    value = np.array(measure_data[data_key], dtype=float)
+    if copy:
+        value = np.array(measure_data[data_key], dtype=dtype)
+    else:
+        value = np.asarray(measure_data[data_key], dtype=dtype)
     if mini:
         np.nanmin(value)
     if maxi:
         np.nanmax(value)
 
     return value
+
+def decimate_minmax(depth, values, nbins):
+    """Reduce a curve to the minimum and maximum of <nbins> depth bins.
+
+    Drawing 2 points per bin, with a bin per pixel, looks the same as
+    drawing every sample. Bins are consecutive samples, bins without
+    valid values are NaN so gaps in the curve are kept.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+    values: np.ndarray
+    nbins: int
+        Number of bins, e.g. the height of the plot in pixels
+
+    Returns
+    -------
+    tuple of np.ndarray
+        depth and values of at most 2 * nbins points
+    """
+    depth = np.asarray(depth, dtype=float)
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if nbins <= 0 or n <= 2 * nbins:
+        return depth, values
+
+    size = -(-n // nbins)
+    nbins = -(-n // size)
+    padded = np.full(nbins * size, np.nan)
+    padded[:n] = values
+    padded = padded.reshape(nbins, size)
+
+    # fmin/fmax ignore NaN and give NaN for all-NaN bins without warnings
+    low = np.fmin.reduce(padded, axis=1)
+    high = np.fmax.reduce(padded, axis=1)
+
+    start = np.arange(0, n, size)
+    middle = np.minimum(start + size // 2, n - 1)
+
+    out_depth = np.empty(2 * nbins)
+    out_values = np.empty(2 * nbins)
+    out_depth[0::2] = depth[start]
+    out_depth[1::2] = depth[middle]
+    out_values[0::2] = low
+    out_values[1::2] = high
+    return out_depth, out_values
@@ -0,0 +1,217 @@
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+from petrophys.data.tops import top_depth
+from petrophys.data.utils import decimate_minmax
+
+
+def _normalize(values, curve):
+    """Map the values of <curve> to 0-1 within its track."""
+    low, high = curve.xlim_low, curve.xlim_high
+    values = np.asarray(values, dtype=float)
+    if curve.x_scale == 'log':
+        with np.errstate(divide='ignore', invalid='ignore'):
+            values = np.log10(values)
+        low = None if low is None else np.log10(low)
+        high = None if high is None else np.log10(high)
+    if low is None:
+        low = np.nanmin(values)
+    if high is None:
+        high = np.nanmax(values)
+    span = (high - low) or 1.0
+    return np.clip((values - low) / span, 0.0, 1.0)
+
+
+def _segments(depth, x):
+    """Split a curve at its NaN values into (n, 2) segments."""
+    valid = ~(np.isnan(x) | np.isnan(depth))
+    if not valid.any():
+        return []
+    edges = np.flatnonzero(np.diff(valid.astype(np.int8)))
+    bounds = np.concatenate(([0], edges + 1, [len(x)]))
+    points = np.column_stack((x, depth))
+    return [points[a:b] for a, b in zip(bounds[:-1], bounds[1:])
+            if valid[a] and b - a > 1]
+
+
+def correlation_panel(
+        wells,
+        curves,
+        tops=None,
+        flatten_on=None,
+        zones=(),
+        gap=0.6,
+        xsize=None,
+        ysize=10,
+        dpi=100,
+        ylim_low=None,
+        ylim_high=None,
+        zone_alpha=0.25,
+        show=True,
+        ):
+    """Plot many wells side by side in one figure for correlation.
+
+    Every curve type is drawn for all wells as a single LineCollection
+    with per-well offsets, after reducing each curve to the pixel
+    resolution of the panel, so 100 wells cost a handful of artists.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to its curves (lasio dataset or mapping with DEPT),
+        drawn from left to right
+    curves: list of CurveSpec
+        Tracks drawn for every well, see
+        petrophys.visualization.layout.CurveSpec. xlim_low and xlim_high
+        set the scale of the track (default the range of the data).
+    tops: dict
+        Well name to its tops (petrophys.data.tops.read_tops)
+        Default is None
+    flatten_on: str
+        Stratigraphic unit whose top becomes depth 0 in every well,
+        wells without this top are left out
+        Default is None
+    zones: list of str
+        Stratigraphic units shaded in and between the wells
+        Default is empty
+    gap: float
+        Space between wells in track widths
+        Default is 0.6
+    xsize: float or integer
+        size of the figure in the horizontal direction
+        Default grows with the number of tracks
+    ysize: float or integer
+        size of the figure in the vertical direction
+        Default is 10
+    dpi: integer
+        resolution of the figure, it sets the decimation of the curves
+        Default is 100
+    ylim_low: float
+        Defines the low limit of the (flattened) depth axes
+        Default is None
+    ylim_high: float
+        Defines the high limit of the (flattened) depth axes
+        Default is None
+    zone_alpha: float
+        Alpha of the zone shading, the range is from 0.0-1.0.
+        Default is 0.25
+    show: Boolean
+        Defines wether or not to call plt.show()
+        Default is True
+
+    Returns
+    -------
+    matplotlib figure
+    """
+    if flatten_on is not None and tops is None:
+        raise ValueError('flattening needs the tops of the wells')
+
+    shifts = {}
+    for name in wells:
+        shift = 0.0
+        if flatten_on is not None:
+            shift = top_depth(tops[name], flatten_on) if name in tops \
+                else np.nan
+        if not np.isnan(shift):
+            shifts[name] = shift
+    names = list(shifts)
+
+    ntracks = len(curves)
+    width = ntracks + gap
+    if xsize is None:
+        xsize = min(max(8, 0.35 * width * len(names)), 120)
+
+    f1, ax = plt.subplots(figsize=(xsize, ysize), dpi=dpi)
+    f1.subplots_adjust(left=0.05, right=0.99, top=0.95, bottom=0.03)
+    mpl.rcParams['xtick.labelsize'] = 6
+
+    # pixel rows available to every curve
+    nbins = int(ysize * dpi)
+
+    segments = [[] for _ in curves]
+    for i, name in enumerate(names):
+        data = wells[name]
+        depth = np.asarray(data['DEPT'], dtype=float) - shifts[name]
+        if ylim_low is not None or ylim_high is not None:
+            keep = np.ones(depth.shape, dtype=bool)
+            if ylim_low is not None:
+                keep &= depth >= ylim_low
+            if ylim_high is not None:
+                keep &= depth <= ylim_high
+            depth_kept = depth[keep]
+        else:
+            keep, depth_kept = slice(None), depth
+        for j, curve in enumerate(curves):
+            if curve.mnemonic not in data.keys():
+                continue
+            values = np.asarray(data[curve.mnemonic], dtype=float)[keep]
+            y, x = decimate_minmax(depth_kept, _normalize(values, curve),
+                                   nbins)
+            segments[j].extend(_segments(y, x + i * width + j))
+
+    for j, curve in enumerate(curves):
+        ax.add_collection(LineCollection(
+            segments[j], colors=curve.color, linewidths=curve.linewidth,
+            label=curve.label or curve.mnemonic))
+
+    # track frames, one call for all wells
+    edges = np.array([i * width + j for i in range(len(names))
+                      for j in range(ntracks + 1)])
+    ax.vlines(edges, 0, 1, transform=ax.get_xaxis_transform(),
+              colors='grey', linewidths=0.5)
+
+    if zones and tops is not None:
+        colors = plt.get_cmap('tab20')
+        polygons, facecolors = [], []
+        for k, zone in enumerate(zones):
+            previous = None
+            for i, name in enumerate(names):
+                well_tops = tops.get(name)
+                if well_tops is None:
+                    previous = None
+                    continue
+                match = well_tops['unit'].str.lower() == zone.lower()
+                if not match.any():
+                    previous = None
+                    continue
+                top = float(well_tops.loc[match, 'top'].iloc[0]) \
+                    - shifts[name]
+                base = float(well_tops.loc[match, 'base'].iloc[0]) \
+                    - shifts[name]
+                if np.isnan(top) or np.isnan(base):
+                    previous = None
+                    continue
+                left, right = i * width, i * width + ntracks
+                polygons.append([(left, top), (right, top), (right, base),
+                                 (left, base)])
+                if previous is not None:
+                    p_right, p_top, p_base = previous
+                    polygons.append([(p_right, p_top), (left, top),
+                                     (left, base), (p_right, p_base)])
+                    facecolors.append(colors(k % 20))
+                facecolors.append(colors(k % 20))
+                previous = (right, top, base)
+        ax.add_collection(PolyCollection(
+            polygons, facecolors=facecolors, alpha=zone_alpha,
+            edgecolors='none', zorder=0))
+
+    ax.set_xticks([i * width + ntracks / 2 for i in range(len(names))])
+    ax.set_xticklabels(names, rotation=90)
+    ax.xaxis.tick_top()
+    ax.set_xlim(-gap / 2, len(names) * width - gap / 2)
+    ax.autoscale(axis='y')
+    if ylim_low is not None or ylim_high is not None:
+        ax.set_ylim(ylim_high, ylim_low)
+    elif not ax.yaxis_inverted():
+        ax.invert_yaxis()
+    label = 'DEPTH (m)' if flatten_on is None else \
+        f'DEPTH below {flatten_on} (m)'
+    ax.set_ylabel(label)
+    ax.legend(loc='lower right', fontsize=6)
+
+    if show:
+        plt.show()
+
+    return f1
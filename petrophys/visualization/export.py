@@ -0,0 +1,172 @@
+from pathlib import Path
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.collections import Collection
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+
+from petrophys.visualization.visualize import well_curve
+
+
+# settings for small vector files: compressed streams, TrueType fonts
+# embedded once per document and text kept as text in SVG
+EXPORT_RC = {
+    'pdf.compression': 9,
+    'pdf.fonttype': 42,
+    'svg.fonttype': 'none',
+    'path.simplify': True,
+}
+
+
+def _size(artist):
+    """Return the number of vertices or markers of a data artist."""
+    if isinstance(artist, Line2D):
+        return len(artist.get_xdata(orig=False))
+    if isinstance(artist, Collection):
+        # a scatter draws one marker path at every offset
+        markers = len(artist.get_offsets())
+        paths = artist.get_paths()
+        return max(markers, sum(len(path.vertices) for path in paths))
+    return 0
+
+
+def rasterize_data(fig, min_points=1000):
+    """Rasterize the dense data artists of <fig> in vector output.
+
+    Curves and fills with at least <min_points> vertices and scatters
+    with at least <min_points> markers are drawn as an image at the dpi
+    of savefig, axes, ticks, labels, tops and annotations stay vector.
+
+    Parameters
+    ----------
+    fig: matplotlib figure
+    min_points: integer
+        Smallest number of vertices or markers rasterized
+        Default is 1000
+
+    Returns
+    -------
+    int
+        Number of rasterized artists
+    """
+    count = 0
+    for ax in fig.get_axes():
+        for artist in ax.get_children():
+            if isinstance(artist, AxesImage) or _size(artist) >= min_points:
+                artist.set_rasterized(True)
+                count += 1
+    return count
+
+
+def save_figure(fig, path, dpi=150, rasterize=True, min_points=1000,
+                **kwargs):
+    """Save <fig> with its dense data rasterized, see `rasterize_data`.
+
+    Parameters
+    ----------
+    fig: matplotlib figure
+    path: str or Path
+        Output file, the format follows the suffix (pdf, svg, png, ...)
+    dpi: integer
+        Resolution of the rasterized data
+        Default is 150
+    rasterize: Boolean
+        Defines wether or not to rasterize the dense data artists
+        Default is True
+    min_points: integer
+        See `rasterize_data`
+        Default is 1000
+    kwargs:
+        Passed to savefig
+    """
+    if rasterize:
+        rasterize_data(fig, min_points)
+    with mpl.rc_context(EXPORT_RC):
+        fig.savefig(path, dpi=dpi, **kwargs)
+
+
+def pdf_report(figures, path, dpi=150, rasterize=True, min_points=1000,
+               close=True, metadata=None):
+    """Write the figures to one multi-page PDF.
+
+    The fonts are embedded once for the whole document. <figures> may be
+    a generator so only one figure is in memory at a time.
+
+    Parameters
+    ----------
+    figures: iterable of matplotlib figure
+    path: str or Path
+    dpi: integer
+        See `save_figure`
+        Default is 150
+    rasterize: Boolean
+        See `save_figure`
+        Default is True
+    min_points: integer
+        See `rasterize_data`
+        Default is 1000
+    close: Boolean
+        Defines wether or not to close every figure once written
+        Default is True
+    metadata: dict
+        PDF metadata such as Title and Author
+        Default is None
+
+    Returns
+    -------
+    int
+        Number of pages
+    """
+    pages = 0
+    with mpl.rc_context(EXPORT_RC), \
+            PdfPages(Path(path), metadata=metadata) as pdf:
+        for fig in figures:
+            if rasterize:
+                rasterize_data(fig, min_points)
+            pdf.savefig(fig, dpi=dpi)
+            pages += 1
+            if close:
+                plt.close(fig)
+    return pages
+
+
+def well_report(wells, path, plot=well_curve, dpi=150, rasterize=True,
+                metadata=None, **kwargs):
+    """Write one page per well to a multi-page PDF in a single pass.
+
+    Parameters
+    ----------
+    wells: dict
+        Well name to lasio dataset
+    path: str or Path
+    plot: function
+        Returns the figure of a well, called as
+        plot(data, show=False, **kwargs)
+        Default is well_curve
+    dpi: integer
+        See `save_figure`
+        Default is 150
+    rasterize: Boolean
+        See `save_figure`
+        Default is True
+    metadata: dict
+        See `pdf_report`
+        Default is None
+    kwargs:
+        Passed to <plot>
+
+    Returns
+    -------
+    int
+        Number of pages
+    """
+    def figures():
+        for name, data in wells.items():
+            fig = plot(data, show=False, **kwargs)
+            fig.suptitle(name)
+            yield fig
+
+    return pdf_report(figures(), path, dpi=dpi, rasterize=rasterize,
+                      metadata=metadata)
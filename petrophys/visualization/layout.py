@@ -0,0 +1,463 @@
+import json
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import transforms
+
+from petrophys.visualization.visualize import subplot_curve
+
+
+SCALES = ('linear', 'log')
+
+
+@dataclass(frozen=True)
+class CurveSpec:
+    """Declarative description of one curve inside a track.
+
+    Parameters
+    ----------
+    mnemonic: str
+        Key of the curve in the well data (e.g. 'GR' for a lasio file)
+    color: str
+        color of the curve line
+        Default is k (black)
+    label: str
+        label printed on the x axes
+        Default is the mnemonic
+    linewidth: float
+        Defines the linewidth of the curve
+        Default is 0.5
+    xlim_low: float
+        sets the low limit of the x axes, above xlim_high the axes is
+        inverted (e.g. NPHI from 0.45 to -0.15)
+        Default is None
+    xlim_high: float
+        sets the high limit of the x axes
+        Default is None
+    x_scale: str
+        scale of the x axes, can take 'linear' or 'log'
+        Default is linear
+    hide_tick: integer
+        Defines ticks to skip in the x axes.
+        Default is 0
+    legend: Boolean
+        Defines wether or not to plot a legend for the curve
+        Default is False
+    depth: str
+        Key of the depth curve, overrides the depth of the layout
+        Default is None
+    fill_to: float
+        When given, shade between the curve and this x value
+        Default is None
+    fill_color: str
+        color of the shading
+        Default is the curve color
+    fill_alpha: float
+        Alpha of the shading, the range is from 0.0-1.0.
+        Default is 0.3
+    x_factor: float
+        Factor applied to the curve by its artist transform
+        Default is 1.0
+    depth_label: str
+        label printed on the y axes, overrides the label of the layout
+        Default is None
+    spine: integer
+        Offset of the top spine
+        Default is the twin axes index of the curve
+    """
+
+    mnemonic: str
+    color: str = 'k'
+    label: str = ''
+    linewidth: float = 0.5
+    xlim_low: Optional[float] = None
+    xlim_high: Optional[float] = None
+    x_scale: str = 'linear'
+    hide_tick: int = 0
+    legend: bool = False
+    depth: Optional[str] = None
+    fill_to: Optional[float] = None
+    fill_color: Optional[str] = None
+    fill_alpha: float = 0.3
+    x_factor: float = 1.0
+    depth_label: Optional[str] = None
+    spine: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class TrackSpec:
+    """Declarative description of one track (one column of the figure).
+
+    Parameters
+    ----------
+    curves: tuple of CurveSpec
+        Curves drawn in the track, the first one on the track axes
+    title: str
+        Title of the track
+        Default is empty
+    twiny: Boolean
+        If True every curve after the first gets its own twin x-axes
+        with a shifted top spine, otherwise all curves share the axes
+        Default is True
+    """
+
+    curves: tuple = ()
+    title: str = ''
+    twiny: bool = True
+
+
+@dataclass(frozen=True)
+class LayoutSpec:
+    """Declarative description of a multi-track well figure.
+
+    Parameters
+    ----------
+    tracks: tuple of TrackSpec
+        Tracks of the figure from left to right
+    depth: str
+        Key of the depth curve shared by all tracks
+        Default is DEPT
+    depth_label: str
+        label printed on the y axes
+        Default is 'DEPTH (m)'
+    invert_y: Boolean
+        Defines wether or not to invert the y-axes
+        Default is True
+    invert_x: Boolean
+        Defines wether or not to invert the x-axes
+        Default is False
+    xsize: float or integer
+        size of the figure in the horizontal direction
+        Default is 18
+    ysize: float or integer
+        size of the figure in the vertical direction
+        Default is 16
+    """
+
+    tracks: tuple = ()
+    depth: str = 'DEPT'
+    depth_label: str = 'DEPTH (m)'
+    invert_y: bool = True
+    invert_x: bool = False
+    xsize: float = 18
+    ysize: float = 16
+
+
+@dataclass(frozen=True)
+class RenderPlan:
+    """Validated layout compiled into the calls needed to draw it.
+
+    Every step holds the track index, the twin index and the keyword
+    arguments of `subplot_curve`, so binding a well only adds the data.
+    """
+
+    steps: tuple
+    ntracks: int
+    mnemonics: frozenset
+    figsize: tuple
+    invert_y: bool
+    invert_x: bool
+    spec: LayoutSpec = field(compare=False)
+
+
+def _check_limits(low, high, where):
+    # reversed limits are allowed, they draw the track inverted
+    if low is not None and high is not None and low == high:
+        raise ValueError(
+            f'{where}: xlim_low and xlim_high must differ, both are {low}'
+        )
+
+
+def validate_layout(spec):
+    """Raise ValueError when <spec> can not be drawn.
+
+    Parameters
+    ----------
+    spec: LayoutSpec
+    """
+    if not spec.tracks:
+        raise ValueError('layout has no tracks')
+    for i, track in enumerate(spec.tracks):
+        if not track.curves:
+            raise ValueError(f'track {i} has no curves')
+        for j, curve in enumerate(track.curves):
+            where = f'track {i} curve {j} ({curve.mnemonic!r})'
+            if not curve.mnemonic:
+                raise ValueError(f'{where}: empty mnemonic')
+            if curve.x_scale not in SCALES:
+                raise ValueError(
+                    f'{where}: x_scale must be one of {SCALES}, '
+                    f'not {curve.x_scale!r}'
+                )
+            if curve.hide_tick < 0:
+                raise ValueError(f'{where}: hide_tick must be >= 0')
+            if curve.x_factor == 0:
+                raise ValueError(f'{where}: x_factor must not be 0')
+            if curve.linewidth <= 0:
+                raise ValueError(f'{where}: linewidth must be > 0')
+            _check_limits(curve.xlim_low, curve.xlim_high, where)
+
+
+@lru_cache(maxsize=64)
+def compile_layout(spec):
+    """Validate <spec> and compile it once into a RenderPlan.
+
+    Compiled plans are cached per spec, so rendering the same layout for
+    many wells only pays for data binding and drawing.
+
+    Parameters
+    ----------
+    spec: LayoutSpec
+
+    Returns
+    -------
+    RenderPlan
+    """
+    validate_layout(spec)
+
+    steps = []
+    mnemonics = {spec.depth}
+    for i, track in enumerate(spec.tracks):
+        for j, curve in enumerate(track.curves):
+            depth = curve.depth or spec.depth
+            mnemonics.update((curve.mnemonic, depth))
+            twin = j if track.twiny else 0
+            kwargs = dict(
+                color=curve.color,
+                x_label=curve.label or curve.mnemonic,
+                y_label=spec.depth_label if curve.depth_label is None
+                else curve.depth_label,
+                graph_label=track.title,
+                hide_tick=curve.hide_tick,
+                xlim_low=curve.xlim_low,
+                xlim_high=curve.xlim_high,
+                x_scale=curve.x_scale,
+                invert_x=spec.invert_x,
+                linewidth=curve.linewidth,
+                legend_curve=curve.legend,
+                spine=twin if curve.spine is None else curve.spine,
+                x_factor=curve.x_factor,
+            )
+            fill = None
+            if curve.fill_to is not None:
+                fill = (curve.fill_to, curve.fill_color or curve.color,
+                        curve.fill_alpha)
+            steps.append((i, twin, curve.mnemonic, depth, kwargs, fill))
+
+    return RenderPlan(
+        steps=tuple(steps),
+        ntracks=len(spec.tracks),
+        mnemonics=frozenset(mnemonics),
+        figsize=(spec.xsize, spec.ysize),
+        invert_y=spec.invert_y,
+        invert_x=spec.invert_x,
+        spec=spec,
+    )
+
+
+def render_layout(plan, data, ylim_low=None, ylim_high=None, show=True):
+    """Bind the curves of one well to <plan> and draw them.
+
+    Parameters
+    ----------
+    plan: RenderPlan or LayoutSpec
+        Compiled plan, a LayoutSpec is compiled (and cached) first
+    data: mapping
+        Well data indexed by mnemonic, e.g. a lasio dataset or a dict
+    ylim_low: float
+        Defines the low limit of the y-axes
+        Default is None
+    ylim_high: float
+        Defines the high limit of the y-axes
+        Default is None
+    show: Boolean
+        Defines wether or not to call plt.show()
+        Default is True
+
+    Returns
+    -------
+    matplotlib figure
+    """
+    if isinstance(plan, LayoutSpec):
+        plan = compile_layout(plan)
+
+    keys = data.keys() if hasattr(data, 'keys') else data
+    missing = sorted(m for m in plan.mnemonics if m not in keys)
+    if missing:
+        raise KeyError(f'curves missing from well data: {missing}')
+
+    f1, axs = plt.subplots(ncols=plan.ntracks, nrows=1, sharey=True,
+                           figsize=plan.figsize, squeeze=False)
+    axs = axs[0]
+    f1.subplots_adjust(wspace=0.02)
+
+    # So that y-tick labels appear on left and right
+    plt.tick_params(labelright=True)
+
+    # Change tick-label globally
+    mpl.rcParams['xtick.labelsize'] = 6
+
+    twins = {}
+    for i, twin, mnemonic, depth, kwargs, fill in plan.steps:
+        if twin == 0:
+            plot_graph = axs[i]
+        else:
+            if (i, twin) not in twins:
+                twins[i, twin] = axs[i].twiny()
+            plot_graph = twins[i, twin]
+
+        xdata = data[mnemonic]
+        ydata = data[depth]
+        subplot_curve(
+            plot=plot_graph,
+            fig=f1,
+            xdata=xdata,
+            ydata=ydata,
+            ylim_low=ylim_low,
+            ylim_high=ylim_high,
+            invert_y=plan.invert_y,
+            **kwargs
+            )
+        if fill is not None:
+            fill_to, fill_color, fill_alpha = fill
+            factor = kwargs['x_factor']
+            shade = plot_graph.fill_betweenx(
+                np.asarray(ydata), np.asarray(xdata), fill_to / factor,
+                color=fill_color, alpha=fill_alpha, linewidth=0
+                )
+            if factor != 1.0:
+                shade.set_transform(
+                    transforms.Affine2D().scale(factor, 1.0)
+                    + plot_graph.transData
+                )
+
+    if plan.invert_y and ylim_low is None and ylim_high is None:
+        if not axs[0].yaxis_inverted():
+            axs[0].invert_yaxis()
+
+    if show:
+        plt.show()
+
+    return f1
+
+
+def layout_to_dict(spec):
+    """Return <spec> as plain dicts and lists, ready for JSON or YAML."""
+    return asdict(spec)
+
+
+def layout_from_dict(data):
+    """Build a LayoutSpec from the output of `layout_to_dict`."""
+    data = dict(data)
+    tracks = []
+    for track in data.pop('tracks', ()):
+        track = dict(track)
+        curves = tuple(CurveSpec(**c) for c in track.pop('curves', ()))
+        tracks.append(TrackSpec(curves=curves, **track))
+    return LayoutSpec(tracks=tuple(tracks), **data)
+
+
+def save_layout(spec, path):
+    """Write <spec> to <path> as JSON, or YAML for .yaml/.yml files.
+
+    YAML support requires the optional pyyaml package.
+    """
+    path = Path(path)
+    data = layout_to_dict(spec)
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        import yaml
+        path.write_text(yaml.safe_dump(data, sort_keys=False))
+    else:
+        path.write_text(json.dumps(data, indent=2))
+
+
+def load_layout(path):
+    """Read a LayoutSpec written by `save_layout`."""
+    path = Path(path)
+    if path.suffix.lower() in ('.yaml', '.yml'):
+        import yaml
+        data = yaml.safe_load(path.read_text())
+    else:
+        data = json.loads(path.read_text())
+    return layout_from_dict(data)
+
+
+def layout_from_graphs(GRAPHS, twiny=True, invert_x=False, invert_y=False,
+                       xsize=18, ysize=16):
+    """Translate a positional GRAPHS list into a LayoutSpec and its data.
+
+    The x and y data of the GRAPHS entries are stored in the returned
+    dict under generated keys, so the result can be passed straight to
+    `render_layout`.
+
+    Parameters
+    ----------
+    GRAPHS: list
+        List of Lists of graph data, see `well_curve2`
+    twiny: Boolean
+        Defines wether or not to draw extra curves on twin axes, as
+        `well_curve2` does for more than one graph. Every curve keeps
+        its own y label and top spine offset.
+    invert_x: Boolean
+        Defines wether or not to invert the x-axes
+    invert_y: Boolean
+        Defines wether or not to invert the y-axes
+    xsize: float or integer
+        size of the figure in the horizontal direction
+    ysize: float or integer
+        size of the figure in the vertical direction
+
+    Returns
+    -------
+    tuple of LayoutSpec and dict
+    """
+    data = {}
+    tracks = []
+    # a single graph draws all its curves on one axes
+    twin_axes = twiny and len(GRAPHS) > 1
+    for i, graphs in enumerate(GRAPHS):
+        curves = []
+        title = ''
+        for j, graph in enumerate(graphs):
+            if len(graph) < 10:
+                raise ValueError(
+                    f'GRAPHS[{i}][{j}] has {len(graph)} fields, expected '
+                    'at least 10'
+                )
+            key = f'track{i}_curve{j}'
+            data[key] = graph[5]
+            data[key + '_depth'] = graph[7]
+            if not twiny:
+                title = title + graph[3]
+            curves.append(CurveSpec(
+                mnemonic=key,
+                color=graph[1],
+                label=graph[4],
+                linewidth=graph[0],
+                xlim_low=graph[8],
+                xlim_high=graph[9],
+                hide_tick=graph[2],
+                legend=not twiny and len(graph) > 10 and bool(graph[10]),
+                depth=key + '_depth',
+                depth_label=graph[6],
+                spine=j if twiny else None,
+            ))
+        tracks.append(TrackSpec(curves=tuple(curves), title=title,
+                                twiny=twin_axes))
+
+    first = GRAPHS[0][0] if GRAPHS and GRAPHS[0] else None
+    spec = LayoutSpec(
+        tracks=tuple(tracks),
+        depth='track0_curve0_depth' if first is not None else 'DEPT',
+        depth_label=first[6] if first is not None else '',
+        invert_y=invert_y,
+        invert_x=invert_x,
+        xsize=xsize,
+        ysize=ysize,
+    )
+    return spec, data
@@ -0,0 +1,160 @@
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import numpy as np
+
+
+class LiveWellPlot:
+    """Tracks of a growing LAS file that are extended as rows arrive.
+
+    Every update draws the new rows as a new line segment per track
+    (starting at the last drawn sample, so the curve stays connected)
+    and extends the depth limits. Existing artists are not touched, and
+    once a track holds <max_segments> segments they are merged into one.
+
+    Parameters
+    ----------
+    tail: LasTail
+        See petrophys.data.tail.LasTail
+    curves: list of CurveSpec
+        One track per curve, see petrophys.visualization.layout.CurveSpec
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    xsize: float or integer
+        size of the figure in the horizontal direction
+        Default is 3 per track
+    ysize: float or integer
+        size of the figure in the vertical direction
+        Default is 10
+    max_segments: integer
+        Number of segments per track before they are merged
+        Default is 32
+    """
+
+    def __init__(self, tail, curves, depth='DEPT', xsize=None, ysize=10,
+                 max_segments=32):
+        self.tail = tail
+        self.curves = list(curves)
+        self.depth = depth
+        self.max_segments = max_segments
+        self.drawn = 0
+        self._buffer = None
+
+        xsize = 3 * len(self.curves) if xsize is None else xsize
+        self.figure, axes = plt.subplots(1, len(self.curves), sharey=True,
+                                         figsize=(xsize, ysize),
+                                         squeeze=False)
+        self.figure.subplots_adjust(wspace=0.02)
+        mpl.rcParams['xtick.labelsize'] = 6
+        self.axes = list(axes[0])
+        self.segments = [[] for _ in self.curves]
+        for ax, curve in zip(self.axes, self.curves):
+            ax.xaxis.tick_top()
+            ax.xaxis.set_label_position('top')
+            ax.set_xlabel(curve.label or curve.mnemonic)
+            ax.grid(True, c='g', alpha=0.3)
+            if curve.x_scale == 'log':
+                ax.set_xscale('log')
+            if curve.xlim_low is not None or curve.xlim_high is not None:
+                ax.set_xlim(curve.xlim_low, curve.xlim_high)
+        self.axes[0].set_ylabel('DEPTH (m)')
+        self._xlims = [[np.inf, -np.inf] for _ in self.curves]
+        self._ylim = [np.inf, -np.inf]
+
+    def _reset(self):
+        for ax, segments in zip(self.axes, self.segments):
+            for line in segments:
+                line.remove()
+            segments.clear()
+        self.drawn = 0
+        self._xlims = [[np.inf, -np.inf] for _ in self.curves]
+        self._ylim = [np.inf, -np.inf]
+
+    def _merge(self, j):
+        # one artist for the whole curve, at the cost of one copy
+        data = self.tail.curves
+        for line in self.segments[j]:
+            line.remove()
+        line, = self.axes[j].plot(data[self.curves[j].mnemonic][:self.drawn],
+                                  data[self.depth][:self.drawn],
+                                  color=self.curves[j].color,
+                                  linewidth=self.curves[j].linewidth)
+        self.segments[j] = [line]
+
+    def update(self, draw=True):
+        """Read the new rows of the file and draw them.
+
+        Parameters
+        ----------
+        draw: Boolean
+            Defines wether or not to redraw the canvas
+            Default is True
+
+        Returns
+        -------
+        int
+            Number of new rows
+        """
+        new = self.tail.update()
+        data = self.tail.curves
+        if data is None:
+            return 0
+        if data is not self._buffer:
+            # the file was read again from the start
+            self._reset()
+            self._buffer = data
+        if len(data) == self.drawn:
+            return 0
+
+        start = max(self.drawn - 1, 0)
+        depth = np.array(data[self.depth][start:])
+        self._extend(self._ylim, depth)
+        for j, (ax, curve) in enumerate(zip(self.axes, self.curves)):
+            values = np.array(data[curve.mnemonic][start:])
+            line, = ax.plot(values, depth, color=curve.color,
+                            linewidth=curve.linewidth)
+            self.segments[j].append(line)
+            if curve.xlim_low is None and curve.xlim_high is None:
+                if self._extend(self._xlims[j], values):
+                    low, high = self._xlims[j]
+                    ax.set_xlim(low, high if high > low else low + 1)
+        self.drawn = len(data)
+        for j, segments in enumerate(self.segments):
+            if len(segments) > self.max_segments:
+                self._merge(j)
+
+        low, high = self._ylim
+        if np.isfinite(low):
+            self.axes[0].set_ylim(high if high > low else low + 1, low)
+        if draw:
+            self.figure.canvas.draw_idle()
+        return new
+
+    @staticmethod
+    def _extend(limits, values):
+        """Widen [low, high] to <values>, return wether it changed."""
+        with np.errstate(invalid='ignore'):
+            low, high = np.nanmin(values, initial=np.inf), \
+                np.nanmax(values, initial=-np.inf)
+        changed = low < limits[0] or high > limits[1]
+        limits[0], limits[1] = min(limits[0], low), max(limits[1], high)
+        return changed
+
+    def follow(self, interval=5.0, count=None):
+        """Update the figure every <interval> seconds.
+
+        Parameters
+        ----------
+        interval: float
+            Seconds between updates
+            Default is 5.0
+        count: integer
+            Number of updates
+            Default is None (until the figure is closed)
+        """
+        done = 0
+        while plt.fignum_exists(self.figure.number) and \
+                (count is None or done < count):
+            self.update()
+            plt.pause(interval)
+            done += 1
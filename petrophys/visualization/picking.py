@@ -0,0 +1,298 @@
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.lines import Line2D
+
+
+class GridIndex:
+    """Nearest-point lookup on a uniform grid of display coordinates.
+
+    Points are bucketed in square cells of <cell> pixels, sorted by cell,
+    so a query only measures the points of the 3x3 cells around it.
+
+    Parameters
+    ----------
+    xy: np.ndarray
+        (n, 2) display coordinates in pixels
+    cell: float
+        Cell size in pixels, the largest pick distance
+        Default is 8
+    """
+
+    def __init__(self, xy, cell=8.0):
+        self.cell = float(cell)
+        xy = np.asarray(xy, dtype=float).reshape(-1, 2)
+        valid = np.flatnonzero(np.isfinite(xy).all(axis=1))
+        cells = np.floor(xy[valid] / self.cell).astype(np.int64)
+        # one integer key per cell, column by column
+        self.origin = cells.min(axis=0) - 1 if len(cells) else np.zeros(2)
+        self.height = int(np.ptp(cells[:, 1])) + 3 if len(cells) else 1
+        keys = self._key(cells[:, 0], cells[:, 1])
+        order = np.argsort(keys, kind='stable')
+        self.index = valid[order]
+        self.xy = xy[self.index]
+        keys = keys[order]
+        self.starts = np.flatnonzero(np.diff(keys, prepend=-1))
+        self.keys = keys[self.starts]
+        self.stops = np.append(self.starts[1:], len(self.index))
+
+    def _key(self, cx, cy):
+        return (cx - self.origin[0]) * self.height + (cy - self.origin[1])
+
+    def nearest(self, x, y):
+        """Return (index, distance) of the point nearest to (x, y).
+
+        Only points within one cell are found, otherwise (None, inf).
+        """
+        cx, cy = np.floor(x / self.cell), np.floor(y / self.cell)
+        if not (np.isfinite(cx) and np.isfinite(cy)) or not len(self.keys) \
+                or not 0 <= cy - self.origin[1] <= self.height - 1:
+            return None, np.inf
+        # the 3 cells of a column are neighbouring keys
+        low = self._key(cx + np.array([-1, 0, 1]), cy - 1)
+        first = np.searchsorted(self.keys, low)
+        last = np.searchsorted(self.keys, low + 3)
+        if (first == last).all():
+            return None, np.inf
+        rows = np.concatenate([np.arange(self.starts[a], self.stops[b - 1])
+                               for a, b in zip(first, last) if b > a])
+        distance = np.hypot(self.xy[rows, 0] - x, self.xy[rows, 1] - y)
+        best = int(np.argmin(distance))
+        if distance[best] > self.cell:
+            return None, np.inf
+        return int(self.index[rows[best]]), float(distance[best])
+
+
+class DepthIndex:
+    """Nearest-sample lookup on a depth track by binary search.
+
+    Parameters
+    ----------
+    depth: np.ndarray
+        Depth of every sample, in any order
+    """
+
+    def __init__(self, depth):
+        depth = np.asarray(depth, dtype=float)
+        valid = np.flatnonzero(~np.isnan(depth))
+        order = np.argsort(depth[valid], kind='stable')
+        self.index = valid[order]
+        self.depth = depth[self.index]
+
+    def nearest(self, depth):
+        """Return the index of the sample nearest to <depth>."""
+        if not len(self.depth):
+            return None
+        i = int(np.searchsorted(self.depth, depth))
+        if i == len(self.depth) or (i > 0 and depth - self.depth[i - 1]
+                                    < self.depth[i] - depth):
+            i -= 1
+        return int(self.index[i])
+
+
+class Picker:
+    """Hover tooltips and linked depth highlighting for dense figures.
+
+    Scatters are indexed on a `GridIndex` in display coordinates, depth
+    tracks on a `DepthIndex`. The grid indexes are rebuilt lazily when a
+    pick happens after the view (zoom, pan, resize) changed, so no
+    matplotlib containment test runs over all points.
+
+    Parameters
+    ----------
+    fig: matplotlib figure
+    radius: float
+        Largest pick distance on scatters in pixels
+        Default is 8
+    well: str
+        Name of the well shown in the tooltips
+        Default is None
+    """
+
+    def __init__(self, fig, radius=8.0, well=None):
+        self.fig = fig
+        self.radius = radius
+        self.well = well
+        self.scatters = []
+        self.tracks = []
+        self._grids = {}
+        self._tooltips = {}
+        self._highlights = {}
+        # matplotlib keeps only a weak reference to bound methods, the
+        # closure keeps the picker alive as long as the figure
+        self._cid = fig.canvas.mpl_connect(
+            'motion_notify_event', lambda event: self.on_move(event))
+
+    def add_scatter(self, collection, labels=None):
+        """Index a scatter, e.g. of depth_intervals_porosity.
+
+        Parameters
+        ----------
+        collection: PathCollection
+        labels: dict
+            Name to array of per-point values shown in the tooltip, e.g.
+            {'well': wells, 'depth': depths}
+            Default is None
+        """
+        self.scatters.append((collection, labels or {}))
+
+    def add_track(self, line, name=None, values=None):
+        """Index a depth track drawn as values (x) against depth (y).
+
+        Parameters
+        ----------
+        line: Line2D
+        name: str
+            Name of the curve in the tooltip
+            Default is the label of the line
+        values: dict
+            Other curves of the same samples shown in the tooltip
+            Default is None
+        """
+        if name is None:
+            name = line.get_label()
+            if name.startswith('_'):
+                name = line.axes.get_xlabel() or 'value'
+        depth = np.asarray(line.get_ydata(), dtype=float)
+        self.tracks.append((line, name, DepthIndex(depth), values or {}))
+
+    def _view(self, ax):
+        return (tuple(ax.get_xlim()), tuple(ax.get_ylim()),
+                tuple(ax.bbox.bounds))
+
+    def grid(self, collection):
+        """Return the grid index of <collection> for the current view."""
+        ax = collection.axes
+        view = self._view(ax)
+        cached = self._grids.get(id(collection))
+        if cached is None or cached[0] != view:
+            offsets = np.asarray(collection.get_offsets(), dtype=float)
+            xy = ax.transData.transform(offsets)
+            cached = (view, GridIndex(xy, self.radius))
+            self._grids[id(collection)] = cached
+        return cached[1]
+
+    def pick(self, event):
+        """Return the nearest point under a mouse event, or None.
+
+        Returns
+        -------
+        dict
+            axes, artist, index, data position (xy) and the values shown
+            in the tooltip
+        """
+        ax = event.inaxes
+        if ax is None:
+            return None
+        best = None
+        for collection, labels in self.scatters:
+            if collection.axes is not ax:
+                continue
+            index, distance = self.grid(collection).nearest(event.x, event.y)
+            if index is not None and (best is None or distance < best[0]):
+                x, y = collection.get_offsets()[index]
+                values = {'x': float(x), 'y': float(y)}
+                values.update({k: v[index] for k, v in labels.items()})
+                best = (distance, collection, index, values)
+        if best is not None:
+            _, artist, index, values = best
+            return {'axes': ax, 'artist': artist, 'index': index,
+                    'xy': (values['x'], values['y']), 'values': values}
+
+        for line, name, depth_index, others in self.tracks:
+            if line.axes is not ax or event.ydata is None:
+                continue
+            index = depth_index.nearest(event.ydata)
+            if index is None:
+                continue
+            # to data coordinates for curves drawn with a scaled x axis
+            to_data = line.get_transform() - ax.transData
+            x, depth = to_data.transform((line.get_xdata()[index],
+                                          line.get_ydata()[index]))
+            values = {'depth': float(depth), name: float(x)}
+            values.update({k: float(v[index]) for k, v in others.items()})
+            return {'axes': ax, 'artist': line, 'index': index,
+                    'xy': (float(x), float(depth)), 'values': values}
+        return None
+
+    def _text(self, values):
+        lines = [] if self.well is None else [f'well: {self.well}']
+        for key, value in values.items():
+            if isinstance(value, (float, np.floating)):
+                value = f'{value:.4g}'
+            lines.append(f'{key}: {value}')
+        return '\n'.join(lines)
+
+    def _tooltip(self, ax):
+        if ax not in self._tooltips:
+            self._tooltips[ax] = ax.annotate(
+                '', (0, 0), xytext=(10, 10), textcoords='offset points',
+                fontsize=7, bbox={'boxstyle': 'round', 'fc': 'w',
+                                  'alpha': 0.9},
+                annotation_clip=False, visible=False)
+        return self._tooltips[ax]
+
+    def highlight(self, depth):
+        """Draw a line at <depth> on every depth track."""
+        for line, _, _, _ in self.tracks:
+            ax = line.axes
+            if ax not in self._highlights:
+                self._highlights[ax] = ax.axhline(depth, color='m',
+                                                  linewidth=0.8, alpha=0.8)
+            self._highlights[ax].set_ydata([depth, depth])
+            self._highlights[ax].set_visible(True)
+
+    def on_move(self, event):
+        """Show the tooltip of the point under the mouse."""
+        picked = self.pick(event)
+        shown = [t for t in self._tooltips.values() if t.get_visible()]
+        for tooltip in shown:
+            tooltip.set_visible(False)
+        if picked is None and not shown:
+            return None
+        if picked is not None:
+            values = picked['values']
+            tooltip = self._tooltip(picked['axes'])
+            tooltip.xy = picked['xy']
+            if 'depth' in values:
+                self.highlight(values['depth'])
+            tooltip.set_text(self._text(values))
+            tooltip.set_visible(True)
+        self.fig.canvas.draw_idle()
+        return picked
+
+    def disconnect(self):
+        self.fig.canvas.mpl_disconnect(self._cid)
+
+
+def attach_picker(fig, well=None, radius=8.0, min_points=2):
+    """Add a `Picker` for all scatters and curves of <fig>.
+
+    Curves (Line2D with at least <min_points> points) are indexed as
+    depth tracks, scatters (PathCollection) on display grids.
+
+    Parameters
+    ----------
+    fig: matplotlib figure
+    well: str
+        Name of the well shown in the tooltips
+        Default is None
+    radius: float
+        See `Picker`
+        Default is 8
+    min_points: integer
+        Shortest curve indexed
+        Default is 2
+
+    Returns
+    -------
+    Picker
+    """
+    picker = Picker(fig, radius=radius, well=well)
+    for ax in fig.get_axes():
+        for artist in ax.get_children():
+            if isinstance(artist, PathCollection):
+                picker.add_scatter(artist)
+            elif isinstance(artist, Line2D) and \
+                    len(artist.get_ydata()) >= min_points:
+                picker.add_track(artist)
+    return picker
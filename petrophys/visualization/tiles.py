@@ -0,0 +1,263 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from petrophys.data.query import depth_slice
+from petrophys.data.utils import decimate_minmax
+
+
+class TileRenderer:
+    """Render the tracks of a well as fixed-height PNG depth tiles.
+
+    Level 0 shows the whole well in a single tile and every next level
+    doubles the number of tiles, like the zoom levels of a web map. Each
+    level draws a min/max decimated copy of the curves at the resolution
+    of its tiles (see petrophys.data.utils.decimate_minmax), computed
+    once per level, so a tile only costs the points it shows and no
+    request renders the full well.
+
+    Rendered tiles are kept in a bounded in-memory LRU cache and, with
+    <cache_dir>, on disk where the least recently used tiles beyond
+    <disk_size> are removed.
+
+    Parameters
+    ----------
+    data: lasio dataset or mapping
+        Curves of the well indexed by mnemonic
+    curves: list of CurveSpec
+        One track per curve, see petrophys.visualization.layout.CurveSpec.
+        xlim_low and xlim_high fix the scale of the track (default the
+        range of the data) so neighbouring tiles line up.
+    name: str
+        Name of the well in the disk cache
+        Default is well
+    depth: str
+        Mnemonic of the depth curve
+        Default is DEPT
+    tile_px: integer
+        Height of a tile in pixels
+        Default is 256
+    track_px: integer
+        Width of a track in pixels
+        Default is 96
+    dpi: integer
+        Default is 100
+    cache_size: integer
+        Number of tiles kept in memory
+        Default is 256
+    cache_dir: str or Path
+        Directory of the disk cache
+        Default is None (no disk cache)
+    disk_size: integer
+        Number of tiles kept on disk per renderer
+        Default is 10000
+    """
+
+    def __init__(self, data, curves, name='well', depth='DEPT', tile_px=256,
+                 track_px=96, dpi=100, cache_size=256, cache_dir=None,
+                 disk_size=10000):
+        self.curves = list(curves)
+        self.tile_px = tile_px
+        self.track_px = track_px
+        self.dpi = dpi
+        self.cache_size = cache_size
+        self.disk_size = disk_size
+
+        self.depth = np.asarray(data[depth], dtype=float)
+        order = slice(None, None, -1) if self.depth[0] > self.depth[-1] \
+            else slice(None)
+        self.depth = self.depth[order]
+        self.values = {c.mnemonic: np.asarray(data[c.mnemonic],
+                                              dtype=float)[order]
+                       for c in self.curves}
+        self.top = float(np.nanmin(self.depth))
+        self.base = float(np.nanmax(self.depth))
+        self.xlims = {c.mnemonic: self._xlim(c) for c in self.curves}
+
+        self._memory = OrderedDict()
+        self._pyramid = {}
+        self._lock = threading.Lock()
+        self.cache_dir = None
+        if cache_dir is not None:
+            self.cache_dir = Path(cache_dir) / f'{name}-{self._key()}'
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._disk_count = len(list(self.cache_dir.glob('*.png')))
+
+    def _xlim(self, curve):
+        values = self.values[curve.mnemonic]
+        low, high = curve.xlim_low, curve.xlim_high
+        if curve.x_scale == 'log':
+            values = values[values > 0]
+        if low is None:
+            low = float(np.nanmin(values)) if values.size else 0.0
+        if high is None:
+            high = float(np.nanmax(values)) if values.size else 1.0
+        return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+    def _key(self):
+        # the tiles change with the drawing settings and the data
+        h = hashlib.blake2b(digest_size=8)
+        h.update(repr((self.curves, self.tile_px, self.track_px, self.dpi,
+                       self.xlims)).encode())
+        h.update(self.depth.tobytes())
+        for values in self.values.values():
+            h.update(values.tobytes())
+        return h.hexdigest()
+
+    @property
+    def max_level(self):
+        """Shallowest level with at most one sample per pixel.
+
+        Deeper levels would not add detail, this one shows every sample.
+        """
+        steps = np.diff(self.depth)
+        step = float(np.median(steps)) if steps.size else 1.0
+        span = self.base - self.top
+        pixels = max(span / (step or 1.0) / self.tile_px, 1.0)
+        return int(np.ceil(np.log2(pixels)))
+
+    def ntiles(self, level):
+        """Return the number of tiles of <level>."""
+        return 2 ** level
+
+    def tile_bounds(self, level, index):
+        """Return the (top, base) depth of tile <index> of <level>."""
+        height = (self.base - self.top) / self.ntiles(level)
+        return self.top + index * height, self.top + (index + 1) * height
+
+    def tiles_for(self, top, base, level):
+        """Return the tile indices of <level> covering <top> to <base>."""
+        height = (self.base - self.top) / self.ntiles(level)
+        first = int(np.floor((top - self.top) / height))
+        last = int(np.ceil((base - self.top) / height))
+        return list(range(max(first, 0), min(last, self.ntiles(level))))
+
+    def level_data(self, level):
+        """Return the depth and curves decimated for <level>."""
+        with self._lock:
+            if level in self._pyramid:
+                return self._pyramid[level]
+        nbins = self.tile_px * self.ntiles(level)
+        pyramid = {}
+        for mnemonic, values in self.values.items():
+            pyramid[mnemonic] = decimate_minmax(self.depth, values, nbins)
+        with self._lock:
+            return self._pyramid.setdefault(level, pyramid)
+
+    def render(self, level, index):
+        """Render tile <index> of <level> without the caches.
+
+        Returns
+        -------
+        bytes
+            PNG image of tile_px high and track_px wide per track
+        """
+        if not 0 <= level <= self.max_level:
+            raise ValueError(f'level {level} outside 0-{self.max_level}')
+        if not 0 <= index < self.ntiles(level):
+            raise ValueError(f'tile {index} outside level {level}')
+        top, base = self.tile_bounds(level, index)
+
+        ntracks = len(self.curves)
+        fig = Figure(figsize=(ntracks * self.track_px / self.dpi,
+                              self.tile_px / self.dpi), dpi=self.dpi)
+        for j, curve in enumerate(self.curves):
+            ax = fig.add_axes((j / ntracks, 0, 1 / ntracks, 1))
+            depth, values = self.level_data(level)[curve.mnemonic]
+            rows = depth_slice(depth, top, base)
+            # one point beyond each edge so curves continue across tiles
+            rows = slice(max(rows.start - 1, 0), rows.stop + 1)
+            ax.plot(values[rows], depth[rows], color=curve.color,
+                    linewidth=curve.linewidth)
+            if curve.x_scale == 'log':
+                ax.set_xscale('log')
+            ax.set_xlim(*self.xlims[curve.mnemonic])
+            ax.set_ylim(base, top)
+            ax.set_axis_off()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=self.dpi)
+        return buffer.getvalue()
+
+    def _disk_file(self, level, index):
+        return self.cache_dir / f'{level}-{index}.png'
+
+    def _remember(self, key, png):
+        with self._lock:
+            self._memory[key] = png
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.cache_size:
+                self._memory.popitem(last=False)
+
+    def _trim_disk(self):
+        # tiles are touched when read, so the oldest are least recently used
+        files = sorted(self.cache_dir.glob('*.png'),
+                       key=lambda p: p.stat().st_mtime_ns)
+        # remove a tenth more than needed so trimming is rare
+        remove = len(files) - self.disk_size + self.disk_size // 10
+        for path in files[:max(remove, 0)]:
+            path.unlink(missing_ok=True)
+        self._disk_count = len(files) - max(remove, 0)
+
+    def tile(self, level, index):
+        """Return tile <index> of <level> from the caches or rendered.
+
+        Returns
+        -------
+        bytes
+            PNG image
+        """
+        key = (level, index)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+
+        if self.cache_dir is not None:
+            path = self._disk_file(level, index)
+            if path.exists():
+                png = path.read_bytes()
+                path.touch()
+                self._remember(key, png)
+                return png
+
+        png = self.render(level, index)
+        self._remember(key, png)
+        if self.cache_dir is not None:
+            tmp = path.with_suffix(f'.{threading.get_ident()}.tmp')
+            tmp.write_bytes(png)
+            tmp.replace(path)
+            with self._lock:
+                self._disk_count += 1
+                if self._disk_count > self.disk_size:
+                    self._trim_disk()
+        return png
+
+    def prewarm(self, levels, max_workers=None):
+        """Render all tiles of <levels> into the caches in parallel.
+
+        Parameters
+        ----------
+        levels: list of int
+            e.g. the levels the viewer opens at
+        max_workers: int
+            Number of threads
+            Default is chosen by ThreadPoolExecutor
+
+        Returns
+        -------
+        int
+            Number of tiles
+        """
+        keys = [(level, i) for level in levels
+                for i in range(self.ntiles(level))]
+        for level in levels:
+            self.level_data(level)
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(lambda key: self.tile(*key), keys))
+        return len(keys)
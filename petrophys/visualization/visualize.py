@@ -1,5 +1,19 @@
 import matplotlib.pyplot as plt
 import matplotlib as mpl
+from matplotlib import transforms
+from matplotlib.collections import PathCollection
+from matplotlib.patches import Patch
+import numpy as np
+
+from petrophys.data.blocking import step_curve
+from petrophys.data.filters import filter_curve
+from petrophys.data.qc import qc_masks
+from petrophys.data.units import CurveRegistry
+from petrophys.visualization.picking import Picker, attach_picker
+
+
+# shading of the quality-control masks in well_curve
+QC_COLORS = {'nan': 'grey', 'flat': 'orange', 'spike': 'red'}
 
 
 def remove_last(ax, which='upper'):
@@ -63,6 +77,10 @@ def subplot_curve(
         invert_x=False,
         invert_y=False,
         spine=0,
+        x_factor=1.0,
+        filtered=None,
+        filter_window=11,
+        filter_color='k',
         ):
 
     """Function to plot a graph based on the given parameters
@@ -197,13 +215,39 @@ def subplot_curve(
     invert_y: Boolean
         Defines wether or not to invert the y-axes
         Default is False,
+    x_factor: float
+        Factor applied to xdata by the transform of the curve, so unit
+        or scale changes (e.g. v/v to %) do not copy the data
+        Default is 1.0
+    filtered: str
+        Filter of petrophys.data.filters drawn over the curve, e.g.
+        'median', 'mean', 'savgol' or 'despike'
+        Default is None
+    filter_window: integer
+        Window of the filter in samples, odd
+        Default is 11
+    filter_color: str
+        color of the filtered curve
+        Default is k (black)
     """
 
     if cores != []:
         plot.plot(*cores, linewidth=core_linewidth, alpha=core_alpha)
 
     if plot_curve:
-        plot.plot(xdata, ydata, color, label=x_label, linewidth=linewidth)
+        line, = plot.plot(xdata, ydata, color, label=x_label, linewidth=linewidth)
+        if x_factor != 1.0:
+            line.set_transform(
+                transforms.Affine2D().scale(x_factor, 1.0) + plot.transData
+            )
+            plot.relim()
+            plot.autoscale_view()
+        if filtered is not None:
+            smooth, = plot.plot(filter_curve(xdata, filtered, filter_window),
+                                ydata, color=filter_color,
+                                linewidth=2 * linewidth,
+                                label=f'{x_label} ({filtered})')
+            smooth.set_transform(line.get_transform())
 
     if scatter and not color_bar:
         if scatter_cmap == '':
@@ -312,52 +356,23 @@ def well_curve3(GRAPHS, invert_x=False, invert_y=False, xlim_high=None, xlim_low
     ysize: float or integer
         size of the figure in the vertical direction
         Default is 16
-    """
-    f1, (axs) = plt.subplots(ncols=len(GRAPHS), nrows=1, sharey=True, figsize=(xsize, ysize))
-
-    f1.subplots_adjust(wspace=0.02)
-
-    # So that y-tick labels appear on left and right
-    plt.tick_params(labelright=True)
-
-    # Change tick-label globally
-    mpl.rcParams['xtick.labelsize'] = 6
 
-    number_of_graphs = len(GRAPHS)
-
-    for i in range(number_of_graphs):
-        graphlabel = ''
-        for j in range(len(GRAPHS[i])):
-            if len(GRAPHS[i]) > 1:
-                graphlabel = graphlabel + GRAPHS[i][j][3]
-            else:
-                graphlabel = GRAPHS[i][j][3]
-
-            if number_of_graphs == 1:
-                plot_graph=axs
-            else:
-                plot_graph=axs[i]
-
-            subplot_curve(
-                plot=plot_graph,
-                xdata=GRAPHS[i][j][5],
-                ydata=GRAPHS[i][j][7],
-                color=GRAPHS[i][j][1],
-                x_label=GRAPHS[i][j][4],
-                y_label=GRAPHS[i][j][6],
-                graph_label=graphlabel,
-                hide_tick=GRAPHS[i][j][2],
-                ylim_low=ylim_low,
-                ylim_high=ylim_high,
-                xlim_low=GRAPHS[i][j][8],
-                xlim_high=GRAPHS[i][j][9],
-                invert_x=invert_x,
-                invert_y=invert_y,
-                linewidth=GRAPHS[i][j][0],
-                legend_curve=GRAPHS[i][j][10]
-                )
-
-    plt.show()
+    The GRAPHS list is translated into a LayoutSpec, see
+    petrophys.visualization.layout for the declarative equivalent.
+    """
+    from petrophys.visualization.layout import (
+        layout_from_graphs, render_layout
+        )
+
+    spec, data = layout_from_graphs(
+            GRAPHS,
+            twiny=False,
+            invert_x=invert_x,
+            invert_y=invert_y,
+            xsize=xsize,
+            ysize=ysize
+            )
+    render_layout(spec, data, ylim_low=ylim_low, ylim_high=ylim_high)
 
 def well_curve2(GRAPHS, invert_x=False, invert_y=False, xlim_high=None, xlim_low=None, ylim_high=None, ylim_low=None, xsize=18, ysize=16):
     """ Plots the  graphs given in the GRAPHS variable
@@ -405,71 +420,85 @@ def well_curve2(GRAPHS, invert_x=False, invert_y=False, xlim_high=None, xlim_low
     ysize: float or integer
         size of the figure in the vertical direction
         Default is 16
-    """
-    number_of_graphs = len(GRAPHS)
-
-    f1, (axs) = plt.subplots(ncols=number_of_graphs, nrows=1, sharey=True, figsize=(xsize, ysize))
 
-    f1.subplots_adjust(wspace=0.02)
-
-    # So that y-tick labels appear on left and right
-    plt.tick_params(labelright=True)
-
-    # Change tick-label globally
-    mpl.rcParams['xtick.labelsize'] = 6
-
-    for i in range(number_of_graphs):
-        graphlabel = ''
-        for j in range(len(GRAPHS[i])):
-            #if len(GRAPHS[i]) > 1:
-                #graphlabel = graphlabel + GRAPHS[i][j][3]
-            #else:
-                #graphlabel = GRAPHS[i][j][3]
-
-            if number_of_graphs == 1:
-                plot_graph=axs
-            else:
-                if j > 0:
-                    plot_graph=axs[i].twiny()
-                else:
-                    plot_graph=axs[i]
-
-            subplot_curve(
-                plot=plot_graph,
-                xdata=GRAPHS[i][j][5],
-                ydata=GRAPHS[i][j][7],
-                color=GRAPHS[i][j][1],
-                x_label=GRAPHS[i][j][4],
-                y_label=GRAPHS[i][j][6],
-                graph_label=graphlabel,
-                hide_tick=GRAPHS[i][j][2],
-                ylim_low=ylim_low,
-                ylim_high=ylim_high,
-                xlim_low=GRAPHS[i][j][8],
-                xlim_high=GRAPHS[i][j][9],
-                invert_x=invert_x,
-                invert_y=invert_y,
-                linewidth=GRAPHS[i][j][0],
-                #legend_curve=GRAPHS[i][j][10],
-                spine=j
-                )
-
-    plt.show()
+    The GRAPHS list is translated into a LayoutSpec, see
+    petrophys.visualization.layout for the declarative equivalent.
+    """
+    from petrophys.visualization.layout import (
+        layout_from_graphs, render_layout
+        )
+
+    spec, data = layout_from_graphs(
+            GRAPHS,
+            twiny=True,
+            invert_x=invert_x,
+            invert_y=invert_y,
+            xsize=xsize,
+            ysize=ysize
+            )
+    render_layout(spec, data, ylim_low=ylim_low, ylim_high=ylim_high)
 
-def well_curve(lasfile, xsize=18, ysize=16):
+def well_curve(lasfile, xsize=18, ysize=16, dt_unit='us/m', qc=False,
+               show=True, pick=False, facies=None, facies_names=None,
+               n_facies=None, layers=None):
     """ Plots the GR, DT, RHOB, DRHO and NPHI vs Depth graphs of the given lasio file
 
+    The units of the curves are read from the curve headers, DT is
+    converted to dt_unit. With qc the absent (grey), flat (orange) and
+    spiky (red) samples found by petrophys.data.qc are shaded per track.
+
     Parameters
     ----------
     lasfile: lasio dataset
+    dt_unit: str
+        unit of the sonic track, e.g. 'us/m', 'us/ft' or 'm/s'
+        Default is us/m
     xsize: float or integer
         size of the figure in the horizontal direction
         Default is 18
     ysize: float or integer
         size of the figure in the vertical direction
         Default is 16
+    qc: Boolean
+        Defines wether or not to shade the quality-control masks
+        Default is False
+    show: Boolean
+        Defines wether or not to call plt.show()
+        Default is True
+    pick: Boolean
+        Defines wether or not to show the samples under the mouse in a
+        tooltip and highlight their depth on all tracks, see
+        petrophys.visualization.picking
+        Default is False
+    facies: np.ndarray
+        Facies code of every sample, e.g. from
+        petrophys.data.facies.Electrofacies.predict, drawn as a coloured
+        column right of the tracks
+        Default is None
+    facies_names: list of str
+        Legend of the facies column, see `facies_track`
+        Default is None
+    n_facies: integer
+        Number of facies of the colour scale, e.g. Electrofacies.n_facies,
+        see `facies_track`
+        Default is None
+    layers: pd.DataFrame
+        Upscaled curves from petrophys.data.upscale.upscale_well, drawn
+        as black step curves over the tracks they belong to
+        Default is None
+
+    Returns
+    -------
+    matplotlib figure
     """
-    f1, (ax1, ax2, ax3, ax4, ax5) = plt.subplots(1, 5, sharey=True, figsize=(xsize, ysize))
+    registry = CurveRegistry(lasfile)
+    dt, dt_factor = registry.for_plot('DT', dt_unit)
+
+    ncols = 5 if facies is None else 6
+    widths = [1] * 5 + [0.3] * (ncols - 5)
+    f1, axes = plt.subplots(1, ncols, sharey=True, figsize=(xsize, ysize),
+                            gridspec_kw={'width_ratios': widths})
+    ax1, ax2, ax3, ax4, ax5 = axes[:5]
     f1.subplots_adjust(wspace=0.02)
     plt.gca().invert_yaxis()
 
@@ -485,7 +514,7 @@ def well_curve(lasfile, xsize=18, ysize=16):
             xdata=lasfile['GR'],
             ydata=lasfile['DEPT'],
             color='c',
-            x_label='GR (API)',
+            x_label=registry.label('GR'),
             y_label='DEPTH (m)',
             hide_tick=2
             )
@@ -493,10 +522,11 @@ def well_curve(lasfile, xsize=18, ysize=16):
     # Track 2: Sonic (velocities)
     subplot_curve(
             plot=ax2,
-            xdata=lasfile['DT']/0.3048,
+            xdata=dt,
+            x_factor=dt_factor,
             ydata=lasfile['DEPT'],
             color='r',
-            x_label='DT (m/s)',
+            x_label=registry.label('DT', dt_unit),
             y_label='DEPTH (m)',
             graph_label='DTCO'
             )
@@ -507,7 +537,7 @@ def well_curve(lasfile, xsize=18, ysize=16):
             xdata=lasfile['RHOB'],
             ydata=lasfile['DEPT'],
             color='b',
-            x_label='RHOB (g/cm3',
+            x_label=registry.label('RHOB'),
             y_label='DEPTH (m)'
             )
 
@@ -517,7 +547,7 @@ def well_curve(lasfile, xsize=18, ysize=16):
             xdata=lasfile['DRHO'],
             ydata=lasfile['DEPT'],
             color='g',
-            x_label='DRHO (g/cm3)',
+            x_label=registry.label('DRHO'),
             y_label='DEPTH (m)'
             )
 
@@ -527,11 +557,100 @@ def well_curve(lasfile, xsize=18, ysize=16):
             xdata=lasfile['NPHI'],
             ydata=lasfile['DEPT'],
             color='k',
-            x_label='NPHI (v/v)',
+            x_label=registry.label('NPHI'),
             y_label='DEPTH (m)'
             )
 
-    plt.show()
+    tracks = list(zip((ax1, ax2, ax3, ax4, ax5),
+                      ('GR', 'DT', 'RHOB', 'DRHO', 'NPHI')))
+    if qc:
+        depth = np.asarray(lasfile['DEPT'], dtype=float)
+        for ax, mnemonic in tracks:
+            for name, mask in qc_masks(lasfile[mnemonic]).items():
+                ax.fill_betweenx(depth, 0, 1, where=mask,
+                                 color=QC_COLORS[name], alpha=0.3,
+                                 linewidth=0,
+                                 transform=ax.get_yaxis_transform())
+
+    if layers is not None:
+        # the layers are in the units of the curve headers
+        upscaled = CurveRegistry(layers, registry.units)
+        for ax, mnemonic in tracks:
+            if mnemonic not in layers:
+                continue
+            values, _ = upscaled.for_plot(
+                mnemonic, dt_unit if mnemonic == 'DT' else None)
+            x, y = step_curve(layers['top'], layers['base'], values)
+            step, = ax.plot(x, y, color='k', linewidth=1.5,
+                            label=f'{mnemonic} (upscaled)')
+            # same x scaling as the original curve, e.g. for DT
+            step.set_transform(ax.get_lines()[0].get_transform())
+
+    if facies is not None:
+        facies_track(axes[5], lasfile['DEPT'], facies, n_facies=n_facies,
+                     names=facies_names)
+
+    if pick:
+        well = lasfile.well['WELL'].value if 'WELL' in lasfile.well else None
+        attach_picker(f1, well=well)
+
+    if show:
+        plt.show()
+
+    return f1
+
+
+def facies_track(ax, depth, codes, n_facies=None, names=None):
+    """Draw a facies curve as a coloured column.
+
+    Runs of equal codes are drawn as one bar each. The colours are those
+    of the tab10 scatter of `youngs_modulus_vs_depth` with codes 0 to
+    n_facies - 1 as cdata, so both share one lithology legend.
+
+    Parameters
+    ----------
+    ax: matplotlib axes
+    depth: np.ndarray
+    codes: np.ndarray
+        Facies code of every sample, NaN is left blank
+    n_facies: integer
+        Number of facies, sets the colour scale so that wells without the
+        last facies are coloured alike
+        Default is the number of names, else the largest code + 1
+    names: list of str
+        Name of every facies, drawn as a legend below the column
+        Default is None
+    """
+    depth = np.asarray(depth, dtype=float)
+    codes = np.asarray(codes, dtype=float)
+    if n_facies is None:
+        n_facies = len(names) if names is not None \
+            else int(np.nanmax(codes, initial=0)) + 1
+    cmap = plt.get_cmap('tab10')
+    norm = mpl.colors.Normalize(0, max(n_facies - 1, 1))
+
+    # samples are the centres of their bars
+    edges = np.concatenate(([depth[0]], (depth[1:] + depth[:-1]) / 2,
+                            [depth[-1]]))
+    changed = (codes[1:] != codes[:-1]) & ~(np.isnan(codes[1:])
+                                            & np.isnan(codes[:-1]))
+    starts = np.concatenate(([0], np.flatnonzero(changed) + 1))
+    stops = np.append(starts[1:], len(codes))
+    run_codes = codes[starts]
+    drawn = ~np.isnan(run_codes)
+    ax.barh(edges[starts][drawn], 1.0,
+            height=edges[stops][drawn] - edges[starts][drawn], left=0.0,
+            align='edge', color=cmap(norm(run_codes[drawn])), linewidth=0)
+
+    ax.set_xlim(0, 1)
+    ax.set_xticks([])
+    ax.xaxis.set_label_position('top')
+    ax.set_xlabel('FACIES')
+    if names is not None:
+        handles = [Patch(color=cmap(norm(code)), label=name)
+                   for code, name in enumerate(names)]
+        ax.legend(handles=handles, loc='upper center',
+                  bbox_to_anchor=(0.5, 0.0), fontsize=6, frameon=False)
 
 
 def petro_measure_curve(
@@ -570,6 +689,8 @@ def petro_measure_curve(
          (0, 0), (cores['Bottom'][1], cores['Top'][1]), 'r',
          (0, 0), (cores['Bottom'][2], cores['Top'][2]), 'g']
 
+    nphi, nphi_factor = CurveRegistry(lasfile).for_plot('NPHI', '%')
+
     f1, (ax1, ax2, ax3) = plt.subplots(1, 3, sharey=True, figsize=(xsize, ysize))
     f1.subplots_adjust(wspace=0.1)
     plt.gca().invert_yaxis()
@@ -612,7 +733,8 @@ def petro_measure_curve(
     # Track 3: NPHI
     subplot_curve(
             plot=ax3,
-            xdata=lasfile['NPHI']*100,
+            xdata=nphi,
+            x_factor=nphi_factor,
             ydata=lasfile['DEPT'],
             color='c',
             x_label='Porosity (%)',
@@ -699,7 +821,7 @@ def depth_intervals_cores(
     plt.show()
 
 
-def depth_intervals_porosity(xdata, ydata, cdata, xlabel, ylabel, clabel, graphlabel, yscale='linear'):
+def depth_intervals_porosity(xdata, ydata, cdata, xlabel, ylabel, clabel, graphlabel, yscale='linear', poroperm=(), ci=0.9, pick=False):
 
     """Plot a scattered graph for xdata, ydata and cdata width a colorbar
 
@@ -726,6 +848,19 @@ def depth_intervals_porosity(xdata, ydata, cdata, xlabel, ylabel, clabel, graphl
     yscale: str
         scale of the y axes, can take "linear' or 'log'
         default is linear
+    poroperm: list
+        Poro-perm transforms drawn over the plugs, every entry is a
+        (label, PoroPermTransform) from petrophys.data.poroperm, fitted
+        on porosity in the unit of xdata. Transforms with bootstrap
+        samples are drawn with their confidence band.
+        default is empty
+    ci: float
+        Width of the confidence band, the range is from 0.0-1.0.
+        default is 0.9
+    pick: Boolean
+        Defines wether or not to show the point under the mouse in a
+        tooltip, see petrophys.visualization.picking
+        default is False
     """
 
     f1, (ax1) = plt.subplots(figsize=plt.figaspect(0.45))
@@ -751,9 +886,23 @@ def depth_intervals_porosity(xdata, ydata, cdata, xlabel, ylabel, clabel, graphl
             removelast=False,
             )
 
+    porosity = np.linspace(np.nanmin(np.asarray(xdata, dtype=float)),
+                           np.nanmax(np.asarray(xdata, dtype=float)), 100)
+    for label, transform in poroperm:
+        line, = ax1.plot(porosity, transform.apply(porosity), linewidth=1.5,
+                         label=f'{label} (R² {transform.r2:.2f})')
+        if transform.samples is not None:
+            ax1.fill_between(porosity, *transform.band(porosity, ci),
+                             color=line.get_color(), alpha=0.2, linewidth=0)
+    if poroperm:
+        ax1.legend(loc='upper left', fontsize=8)
+
+    if pick:
+        _attach_scatter_picker(ax1, cdata, clabel)
+
     plt.show()
 
-def youngs_modulus_vs_depth(xdata, ydata, cdata, xlabel, ylabel, clabel, graphlabel, legend_list=[]):
+def youngs_modulus_vs_depth(xdata, ydata, cdata, xlabel, ylabel, clabel, graphlabel, legend_list=[], log_data=[], pick=False):
 
     """Plot a scattered graph for xdata, ydata and cdata with a legend
 
@@ -780,6 +929,18 @@ def youngs_modulus_vs_depth(xdata, ydata, cdata, xlabel, ylabel, clabel, graphla
     legend_list: list
         Defines the values displayed on the legend
         default is empty
+    log_data: list
+        Log-derived curves drawn over the lab values, e.g. from
+        petrophys.data.geomech.well_elastic_properties. Every entry is
+        (depth, E) or (depth, E, codes), with codes the lithology code
+        of each sample (see petrophys.data.geomech.zone_values) so the
+        curve is coloured like the lab values. Depths must use the same
+        reference as xdata.
+        default is empty
+    pick: Boolean
+        Defines wether or not to show the point under the mouse in a
+        tooltip, see petrophys.visualization.picking
+        default is False
     """
 
     f1, (ax1) = plt.subplots(1, 1, figsize=(15, 9))
@@ -808,5 +969,28 @@ def youngs_modulus_vs_depth(xdata, ydata, cdata, xlabel, ylabel, clabel, graphla
             removelast=False,
             )
 
+    codes = np.asarray(cdata, dtype=float)
+    for entry in log_data:
+        if len(entry) > 2:
+            ax1.scatter(entry[0], entry[1], c=entry[2], s=1, alpha=0.5,
+                        cmap="tab10", vmin=np.nanmin(codes),
+                        vmax=np.nanmax(codes), rasterized=True)
+        else:
+            ax1.plot(entry[0], entry[1], color='grey', linewidth=0.5,
+                     alpha=0.7)
+
+    if pick:
+        _attach_scatter_picker(ax1, cdata, clabel)
+
     plt.show()
 
+
+
+def _attach_scatter_picker(ax, cdata, clabel):
+    # the colour values are shown in the tooltips of the main scatter
+    picker = Picker(ax.figure)
+    scatters = [c for c in ax.collections if isinstance(c, PathCollection)]
+    for j, collection in enumerate(scatters):
+        picker.add_scatter(collection,
+                           {clabel or 'c': np.asarray(cdata)} if j == 0 else None)
+    return picker
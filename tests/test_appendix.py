@@ -0,0 +1,43 @@
+import os
+
+import openpyxl
+
+from petrophys.data.appendix import normalize_column, read_sheet
+
+
+def _workbook(path, rows):
+    workbook = openpyxl.Workbook()
+    for row in rows:
+        workbook.active.append(row)
+    workbook.save(path)
+
+
+def test_normalize_column():
+    assert normalize_column('Young’s Modulus E (GPa)') == \
+        'youngs_modulus_e_gpa'
+    assert normalize_column('TVCSS_Top') == 'tvcss_top'
+    assert normalize_column('% log data over interval for\nE, KB, Mu') == \
+        'pct_log_data_over_interval_for_e_kb_mu'
+
+
+def test_read_sheet_is_cached_and_invalidated(tmp_path):
+    path = tmp_path / 'book.xlsx'
+    _workbook(path, [
+        ['Well', 'Lithology_type', 'Young’s Modulus E (GPa)', None],
+        ['AMR-12', 'Kleisteen ', 30.2, None],
+        [None, None, None, None],
+        ['AMR-12', 'Zandsteen', 28.6, None],
+    ])
+    frame = read_sheet(path, cache_dir=tmp_path / 'cache')
+    assert list(frame.columns) == ['well', 'lithology_type',
+                                   'youngs_modulus_gpa']
+    assert list(frame['lithology_type'].cat.categories) == \
+        ['Kleisteen', 'Zandsteen']
+    assert len(list((tmp_path / 'cache').glob('*.pkl'))) == 1
+
+    _workbook(path, [['Well', 'Lithology_type'], ['BLD-01', 'Kalksteen']])
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    frame = read_sheet(path, cache_dir=tmp_path / 'cache')
+    assert list(frame['well']) == ['BLD-01']
+    assert len(list((tmp_path / 'cache').glob('*.pkl'))) == 1
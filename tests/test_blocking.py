@@ -0,0 +1,71 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from petrophys.data.blocking import (  # noqa: E402
+    block_field,
+    block_values,
+    block_well,
+    blocked_curve,
+    segment,
+    step_curve,
+)
+from petrophys.visualization.visualize import subplot_curve  # noqa: E402
+
+
+def _beds(seed=0):
+    rng = np.random.default_rng(seed)
+    levels = np.repeat([50.0, 90.0, 60.0, 120.0], [300, 200, 400, 100])
+    gr = levels + rng.normal(0, 3, levels.size)
+    rhob = np.repeat([2.3, 2.6, 2.4, 2.7], [300, 200, 400, 100]) \
+        + rng.normal(0, 0.02, levels.size)
+    return {'DEPT': 2000.0 + 0.1 * np.arange(levels.size), 'GR': gr,
+            'RHOB': rhob}
+
+
+def test_segment_finds_boundaries():
+    data = _beds()
+    bounds = segment(data['GR'])
+    assert bounds.tolist() == [0, 300, 500, 900, 1000]
+    assert segment(data['GR'], max_beds=2).tolist() == [0, 900, 1000]
+    # a single curve and stacked curves give the same beds here
+    stacked = np.stack([data['GR'], data['RHOB']])
+    assert segment(stacked).tolist() == bounds.tolist()
+
+
+def test_block_values_ignore_nan():
+    values = np.array([1.0, np.nan, 3.0, 10.0, 10.0])
+    assert block_values(values, np.array([0, 3, 5])).tolist() == [2.0, 10.0]
+
+
+def test_block_well():
+    data = _beds()
+    beds = block_well(data, ['GR', 'RHOB'])
+    assert beds['top'].tolist() == [2000.0, 2030.0, 2050.0, 2090.0]
+    assert np.allclose(beds['GR'], [50, 90, 60, 120], atol=1.0)
+    assert np.allclose(beds['RHOB'], [2.3, 2.6, 2.4, 2.7], atol=0.01)
+
+    # the same beds when logged bottom up
+    reverse = {k: v[::-1] for k, v in data.items()}
+    assert np.allclose(block_well(reverse, ['GR', 'RHOB'])['top'],
+                       beds['top'])
+
+    blocked = blocked_curve(data['DEPT'], beds, 'GR')
+    assert np.allclose(blocked[:300], beds['GR'][0])
+    assert np.allclose(blocked[-100:], beds['GR'][3])
+
+
+def test_block_field_and_step_track():
+    beds = block_field({'A': _beds(1), 'B': _beds(2)}, ['GR'],
+                       max_workers=2)
+    assert beds.groupby('well').size().to_dict() == {'A': 4, 'B': 4}
+
+    one = beds[beds['well'] == 'A']
+    x, depth = step_curve(one['top'], one['base'], one['GR'])
+    assert len(x) == len(depth) == 8
+    assert depth[1] == depth[2]
+    fig, ax = plt.subplots()
+    subplot_curve(plot=ax, fig=fig, xdata=x, ydata=depth, invert_y=True)
+    plt.close(fig)
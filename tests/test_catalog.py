@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import pandas as pd
+
+from petrophys.data.catalog import WellCatalog
+
+RAW = Path(__file__).resolve().parents[1] / 'data' / 'raw'
+
+
+def _catalog():
+    catalog = WellCatalog()
+    catalog.add_alias('CAP-01', 'CAPELLE-01')
+    catalog.add_las(RAW / 'logs' / '2571_cap01_1985_comp.las')
+    catalog.add_cores(RAW / 'cores' / 'CAP-01_cores.csv', 'CAP-01')
+    catalog.add_tops(RAW / 'tops' / 'Diepte_stratigrafische_eenheden.csv',
+                     'CAP-01')
+    return catalog
+
+
+def test_select_curves_and_cores_in_range():
+    with _catalog() as catalog:
+        assert catalog.select(curves=['RHOB'], top=3000, base=3200,
+                              cores=True) == ['CAPELLE-01']
+        # no core between 3126 and 3150 m
+        assert catalog.select(curves=['RHOB'], top=3126, base=3150,
+                              cores=True) == []
+        assert catalog.select(curves=['SON']) == []
+
+
+def test_curve_range_uses_valid_data():
+    with _catalog() as catalog:
+        top, base = catalog.curve_range('CAP-01', 'GR')
+        assert 30.0 <= top < base <= 3689.0
+        assert catalog.unit_interval('CAPELLE-01', 'Formatie van Texel') == \
+            (516.0, 551.0)
+        assert catalog.unit_interval('CAPELLE-01', 'formatie van TEXEL') == \
+            (516.0, 551.0)
+
+
+def test_headers_only(tmp_path):
+    with WellCatalog(tmp_path / 'catalog.sqlite') as catalog:
+        well = catalog.add_las(RAW / 'logs' / 'CAPELLE__1.las',
+                               headers_only=True)
+        assert well == 'CAPELLE-1'
+        assert catalog.curve_range(well, 'SON') == (408.8892, 3681.984)
+    with WellCatalog(tmp_path / 'catalog.sqlite') as catalog:
+        assert catalog.wells() == ['CAPELLE-1']
+
+
+def test_appendix_a_is_not_duplicated():
+    catalog = WellCatalog()
+    frame = pd.DataFrame({
+        'well': ['CAP-01', 'CAP-01'],
+        'file_name': ['a.las', 'b.las'],
+        'interval_top': [1000.0, 2000.0],
+        'interval_base': [1500.0, 2500.0],
+        'target_formation': ['Slochteren', None],
+    })
+    catalog.add_appendix_a(frame)
+    catalog.add_appendix_a(frame)
+    rows = catalog.db.execute('SELECT file FROM files ORDER BY file')
+    assert [row[0] for row in rows] == ['a.las', 'b.las']
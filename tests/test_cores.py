@@ -0,0 +1,68 @@
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from petrophys.data.cores import (  # noqa: E402
+    read_core_files,
+    read_core_measurements,
+)
+from petrophys.visualization.visualize import petro_measure_curve  # noqa: E402
+
+RAW = Path(__file__).resolve().parents[1] / 'data' / 'raw'
+KERNMETINGEN = RAW / 'cores' / 'CAP-01_kernmetingen.csv'
+
+
+def test_read_core_measurements_raw():
+    km = read_core_measurements(KERNMETINGEN, aggregate=False)
+    assert list(km.columns) == ['plug', 'depth', 'porosity', 'permeability',
+                                'grain_density']
+    for column in ['depth', 'porosity', 'permeability', 'grain_density']:
+        assert km[column].dtype == np.float64
+    assert len(km) == 157
+    # '-' is absent
+    assert np.isnan(km.loc[km['plug'] == 'K-0001C', 'grain_density']).all()
+    assert km['depth'].is_monotonic_increasing
+
+
+def test_aggregate_plugs():
+    km = read_core_measurements(KERNMETINGEN)
+    assert km['plug'].is_unique
+    assert len(km) == 141
+    first = km.set_index('plug').loc['K-0002']
+    assert first['plugs'] == 2
+    assert np.isclose(first['porosity'], 12.55)
+    assert np.isclose(first['permeability'], np.sqrt(7.7 * 10))
+    # the absent grain density of the C variant is ignored
+    assert np.isclose(km.set_index('plug').loc['K-0001', 'grain_density'],
+                      2.65)
+
+
+def test_read_core_files(tmp_path):
+    other = tmp_path / 'CAP-02_kernmetingen.csv'
+    other.write_text('nummer,deipte (m),Porositeit (%),hor. Perm (mD),'
+                     'Korreldichtheid (g/cm³)\nK-0001,2000.5,-,1,2.7\n',
+                     encoding='utf-8')
+    frame = read_core_files([KERNMETINGEN, other], max_workers=2)
+    assert isinstance(frame['well'].dtype, pd.CategoricalDtype)
+    assert frame['well'].value_counts().to_dict() == {'CAP-01': 141,
+                                                      'CAP-02': 1}
+    assert np.isnan(frame['porosity'].iloc[-1])
+
+
+def test_petro_measure_curve(monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    km = read_core_measurements(KERNMETINGEN)
+    cores = pd.read_csv(RAW / 'cores' / 'CAP-01_cores.csv')
+    las = lasio.LASFile()
+    depth = np.arange(3100.0, 3230.0, 0.1)
+    las.append_curve('DEPT', depth, unit='m')
+    for mnemonic, unit in [('GR', 'gAPI'), ('RHOB', 'g/cm3'),
+                           ('NPHI', 'v/v')]:
+        las.append_curve(mnemonic, np.ones_like(depth), unit=unit)
+    petro_measure_curve(las, km['depth'], km['grain_density'],
+                        km['porosity'], cores)
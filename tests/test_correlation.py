@@ -0,0 +1,41 @@
+import matplotlib
+import numpy as np
+import pandas as pd
+
+matplotlib.use('Agg')
+
+from petrophys.data.utils import decimate_minmax  # noqa: E402
+from petrophys.visualization.correlation import correlation_panel  # noqa: E402
+from petrophys.visualization.layout import CurveSpec  # noqa: E402
+
+
+def test_decimate_minmax():
+    depth = np.arange(10.0)
+    values = np.array([1, 5, 2, 3, np.nan, np.nan, 0, 9, 4, 4], dtype=float)
+    y, x = decimate_minmax(depth, values, 2)
+    np.testing.assert_allclose(y, [0, 2, 5, 7])
+    np.testing.assert_allclose(x, [1, 5, 0, 9])
+    # short curves are returned unchanged
+    y, x = decimate_minmax(depth, values, 5)
+    assert x is not None and len(x) == 10
+
+
+def test_correlation_panel_flattens_and_shades():
+    depth = np.arange(0.0, 200.0, 0.5)
+    wells, tops = {}, {}
+    for i, shift in enumerate((0.0, 20.0, 40.0)):
+        wells[f'W{i}'] = {'DEPT': depth, 'GR': np.sin(depth) * 50 + 75}
+        tops[f'W{i}'] = pd.DataFrame({'unit': ['A', 'B'],
+                                      'top': [50.0 + shift, 80.0 + shift],
+                                      'base': [80.0 + shift, 120.0 + shift]})
+    del tops['W2']
+    fig = correlation_panel(wells, [CurveSpec('GR', xlim_low=0,
+                                              xlim_high=150)],
+                            tops=tops, flatten_on='B', zones=['B'],
+                            show=False)
+    ax = fig.axes[0]
+    # W2 has no top B and is left out
+    assert [t.get_text() for t in ax.get_xticklabels()] == ['W0', 'W1']
+    lines = ax.collections[0]
+    assert len(lines.get_segments()) == 2
+    assert min(seg[:, 1].min() for seg in lines.get_segments()) == -100.0
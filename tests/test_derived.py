@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+from petrophys.data.derived import DerivedCurves, standard_curves
+
+
+def _data():
+    return {
+        'DEPT': np.arange(6.0),
+        'GR': np.array([20.0, 70.0, 120.0, 150.0, 45.0, np.nan]),
+        'RHOB': np.array([2.65, 2.4, 2.3, 2.5, 2.2, 2.6]),
+        'NPHI': np.array([0.0, 0.1, 0.2, 0.3, 0.2, 0.1]),
+    }
+
+
+def test_standard_curves():
+    curves = standard_curves(_data())
+    np.testing.assert_allclose(curves['VSH_GR'],
+                               [0.0, 0.5, 1.0, 1.0, 0.25, np.nan])
+    np.testing.assert_allclose(curves['PHID'],
+                               (2.65 - _data()['RHOB']) / 1.65)
+
+
+def test_only_downstream_curves_recompute():
+    curves = standard_curves(_data())
+    phid = curves['PHID']
+    phie = curves['PHIE']
+    curves.set_params(gr_shale=170.0)
+    assert curves['PHID'] is phid
+    assert curves['PHIE'] is not phie
+    np.testing.assert_allclose(curves['VSH_GR'][1], 0.5 / 1.5 * 1.0)
+
+
+def test_chunked_matches_full():
+    full = standard_curves(_data())['PHIE']
+    chunked = standard_curves(_data()).evaluate('PHIE', chunk_size=4)
+    np.testing.assert_allclose(chunked, full)
+
+
+def test_define_rejects_cycles_and_unknown_names():
+    curves = DerivedCurves(_data())
+    curves.define('A', 'GR * 2')
+    with pytest.raises(ValueError):
+        curves.define('A', 'A + 1')
+    with pytest.raises(KeyError):
+        curves.define('B', 'GR * unknown')
+    # the failed definitions left the engine untouched
+    np.testing.assert_allclose(curves['A'], _data()['GR'] * 2)
+    assert 'B' not in curves.expressions
+
+
+def test_standard_curves_skips_missing_inputs():
+    data = _data()
+    del data['RHOB']
+    curves = standard_curves(data)
+    assert 'VSH_GR' in curves.expressions
+    assert 'PHID' not in curves.expressions
+    assert 'PHIE' not in curves.expressions
@@ -0,0 +1,58 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+
+from petrophys.visualization.export import (  # noqa: E402
+    rasterize_data,
+    save_figure,
+    well_report,
+)
+from petrophys.visualization.visualize import well_curve  # noqa: E402
+
+
+def _las(size=10000, seed=0):
+    rng = np.random.default_rng(seed)
+    las = lasio.LASFile()
+    las.append_curve('DEPT', 1000.0 + 0.1 * np.arange(size), unit='m')
+    for mnemonic, unit in [('GR', 'gAPI'), ('DT', 'us/ft'), ('RHOB', 'g/cm3'),
+                           ('DRHO', 'g/cm3'), ('NPHI', 'v/v')]:
+        las.append_curve(mnemonic, rng.random(size), unit=unit)
+    return las
+
+
+def test_rasterize_data_keeps_text_vector():
+    fig = well_curve(_las(), show=False)
+    assert rasterize_data(fig) == 5
+    for ax in fig.get_axes():
+        assert not ax.xaxis.label.get_rasterized()
+        assert not any(t.get_rasterized() for t in ax.texts)
+
+
+def test_save_figure_is_smaller(tmp_path):
+    las = _las()
+    for suffix in ['pdf', 'svg']:
+        vector = tmp_path / f'vector.{suffix}'
+        raster = tmp_path / f'raster.{suffix}'
+        save_figure(well_curve(las, show=False), vector, rasterize=False)
+        save_figure(well_curve(las, show=False), raster, dpi=72)
+        assert raster.stat().st_size < vector.stat().st_size / 2
+
+
+def test_well_report(tmp_path):
+    path = tmp_path / 'report.pdf'
+    wells = {'A': _las(2000, 1), 'B': _las(2000, 2), 'C': _las(2000, 3)}
+    assert well_report(wells, path) == 3
+    assert path.read_bytes().startswith(b'%PDF')
+
+
+def test_rasterize_data_counts_scatter_markers():
+    fig, ax = plt.subplots()
+    rng = np.random.default_rng(0)
+    dense = ax.scatter(*rng.random((2, 100000)))
+    sparse = ax.scatter(*rng.random((2, 10)))
+    assert rasterize_data(fig) == 1
+    assert dense.get_rasterized() and not sparse.get_rasterized()
+    plt.close(fig)
@@ -0,0 +1,167 @@
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from petrophys.data.facies import (  # noqa: E402
+    Electrofacies, RunningStats, curve_rows, iter_chunks)
+from petrophys.visualization.visualize import (  # noqa: E402
+    facies_track, well_curve)
+
+
+DATA = Path(__file__).resolve().parents[1] / 'data'
+
+CENTERS = np.array([[30.0, 2.3, 0.25, 300.0],
+                    [70.0, 2.6, 0.10, 220.0],
+                    [120.0, 2.5, 0.30, 350.0]])
+SPREAD = np.array([3.0, 0.02, 0.01, 8.0])
+
+
+def _field(nwells=4, size=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    wells, labels = {}, {}
+    for i in range(nwells):
+        truth = rng.integers(0, 3, size)
+        rows = CENTERS[truth] + rng.normal(0, 1, (size, 4)) * SPREAD
+        rows[:10, 2] = np.nan
+        wells[f'W{i}'] = dict(zip(('GR', 'RHOB', 'NPHI', 'DT'), rows.T))
+        labels[f'W{i}'] = truth
+    return wells, labels
+
+
+def test_running_stats_match_numpy():
+    rng = np.random.default_rng(1)
+    rows = rng.normal([10.0, -5.0], [2.0, 0.5], (5000, 2))
+    rows[::7, 1] = np.nan
+    stats = RunningStats(2)
+    for chunk in np.array_split(rows, 9):
+        stats.update(chunk)
+    np.testing.assert_allclose(stats.mean, np.nanmean(rows, axis=0))
+    np.testing.assert_allclose(stats.std, np.nanstd(rows, axis=0))
+    assert np.array_equal(RunningStats(2).std, [1.0, 1.0])
+
+
+def test_chunks_skip_incomplete_rows():
+    wells, _ = _field(nwells=2, size=1000)
+    chunks = list(iter_chunks(wells, chunk_size=300))
+    assert max(len(c) for c in chunks) == 300
+    assert sum(len(c) for c in chunks) == 2 * 990
+    assert not any(np.isnan(c).any() for c in chunks)
+
+
+def test_curve_rows_converts_units():
+    las = lasio.LASFile()
+    las.append_curve('DEPT', [1.0, 2.0], unit='m')
+    las.append_curve('DT', [100.0, 200.0], unit='US/F')
+    rows = curve_rows(las, ['DT'])
+    np.testing.assert_allclose(rows[:, 0], [100 / 0.3048, 200 / 0.3048])
+
+    # counts cannot be converted to API units
+    las.append_curve('GR', [10.0, 20.0], unit='CPS')
+    rows = curve_rows(las, ['GR', 'DT'])
+    assert np.isnan(rows[:, 0]).all() and not np.isnan(rows[:, 1]).any()
+
+
+def test_fit_and_predict_recovers_facies():
+    wells, labels = _field()
+    model = Electrofacies(n_facies=3, chunk_size=500, sample_size=1000,
+                          seed=0).fit(wells)
+    # facies are numbered by increasing GR like CENTERS
+    table = model.table()
+    np.testing.assert_allclose(table[['GR', 'RHOB', 'NPHI', 'DT']],
+                               CENTERS, rtol=0.02)
+    assert table['count'].sum() == 3 * 4 * 2990
+
+    codes = model.predict_field(wells, max_workers=2)
+    for name, truth in labels.items():
+        assert np.isnan(codes[name][:10]).all()
+        assert (codes[name][10:] == truth[10:]).mean() > 0.99
+
+
+def test_well_without_curve_is_nan():
+    wells, _ = _field(nwells=2, size=1000)
+    wells['NOGR'] = {k: v for k, v in wells['W0'].items() if k != 'GR'}
+    model = Electrofacies(n_facies=3, seed=0).fit(wells)
+    assert model.stats.count[0] == 2 * 990
+    assert np.isnan(model.predict(wells['NOGR'])).all()
+
+    # CAPELLE-1 has only DEPT and SON
+    las = lasio.read(DATA / 'raw' / 'logs' / 'CAPELLE__1.las')
+    codes = model.predict(las)
+    assert len(codes) == len(las.index) and np.isnan(codes).all()
+
+
+def test_refit_resets_statistics():
+    wells, _ = _field(nwells=2, size=1000)
+    model = Electrofacies(n_facies=3, seed=0).fit(wells)
+    count, mean = model.stats.count.copy(), model.stats.mean.copy()
+    model.fit(wells)
+    np.testing.assert_array_equal(model.stats.count, count)
+    np.testing.assert_allclose(model.stats.mean, mean)
+
+
+def test_predict_needs_fit():
+    wells, _ = _field(nwells=1, size=100)
+    with pytest.raises(ValueError):
+        Electrofacies().predict(wells['W0'])
+    with pytest.raises(ValueError):
+        Electrofacies(n_facies=200).fit({'W0': {k: v[:50] for k, v in
+                                                wells['W0'].items()}})
+
+
+def test_facies_track_runs_and_colours():
+    fig, ax = plt.subplots()
+    depth = 1000.0 + np.arange(8.0)
+    codes = np.array([0, 0, 1, 1, np.nan, 2, 2, 0])
+    facies_track(ax, depth, codes, names=['sand', 'silt', 'shale'])
+    bars = ax.patches
+    assert len(bars) == 4
+    assert bars[0].get_y() == 1000.0 and bars[0].get_height() == 1.5
+    cmap = plt.get_cmap('tab10')
+    assert bars[0].get_facecolor() == cmap(0.0)
+    assert bars[1].get_facecolor() == cmap(0.5)
+    assert bars[2].get_facecolor() == cmap(1.0)
+    assert bars[3].get_facecolor() == bars[0].get_facecolor()
+    assert len(ax.get_legend().get_texts()) == 3
+    plt.close(fig)
+
+
+def test_facies_track_colours_follow_n_facies():
+    cmap = plt.get_cmap('tab10')
+    depth = np.arange(4.0)
+    codes = np.array([0.0, 1.0, 2.0, 2.0])
+    names = ['a', 'b', 'c', 'd', 'e']
+    fig, (ax1, ax2) = plt.subplots(1, 2)
+    # the legend of 5 names sets the scale, also without facies 3 and 4
+    facies_track(ax1, depth, codes, names=names)
+    facies_track(ax2, depth, codes, n_facies=5)
+    for ax in (ax1, ax2):
+        assert ax.patches[2].get_facecolor() == cmap(0.5)
+    colours = [h.get_facecolor() for h in ax1.get_legend().get_patches()]
+    assert colours == [cmap(i / 4) for i in range(5)]
+    plt.close(fig)
+
+
+def test_well_curve_with_facies():
+    size = 200
+    las = lasio.LASFile()
+    las.append_curve('DEPT', 1000.0 + 0.1 * np.arange(size), unit='m')
+    for mnemonic, unit in (('GR', 'gAPI'), ('DT', 'us/m'),
+                           ('RHOB', 'g/cm3'), ('DRHO', 'g/cm3'),
+                           ('NPHI', 'v/v')):
+        las.append_curve(mnemonic, np.linspace(1, 2, size), unit=unit)
+    codes = np.repeat([0.0, 1.0], size // 2)
+    fig = well_curve(las, show=False, facies=codes)
+    assert len(fig.axes) == 6
+    assert len(fig.axes[5].patches) == 2
+    plt.close(fig)
+
+    fig = well_curve(las, show=False, facies=codes, n_facies=5)
+    cmap = plt.get_cmap('tab10')
+    assert fig.axes[5].patches[1].get_facecolor() == cmap(0.25)
+    plt.close(fig)
@@ -0,0 +1,91 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from petrophys.data.filters import (  # noqa: E402
+    despike,
+    filter_well,
+    rolling_mad,
+    rolling_mean,
+    rolling_median,
+    rolling_percentile,
+    savgol,
+)
+from petrophys.visualization.visualize import subplot_curve  # noqa: E402
+
+
+def _curve(size=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.sin(np.linspace(0, 20, size)) + rng.normal(0, 0.1, size)
+    values[500:520] = np.nan
+    return values
+
+
+@pytest.mark.parametrize('window', [1, 5, 11])
+def test_rolling_matches_pandas(window):
+    values = _curve()
+    rolling = pd.Series(values).rolling(window, center=True, min_periods=1)
+    assert np.allclose(rolling_mean(values, window), rolling.mean(),
+                       equal_nan=True)
+    assert np.allclose(rolling_median(values, window), rolling.median(),
+                       equal_nan=True)
+    assert np.allclose(rolling_percentile(values, window, 10),
+                       rolling.quantile(0.1), equal_nan=True)
+
+
+def test_window_must_be_odd():
+    with pytest.raises(ValueError):
+        rolling_mean(_curve(), 4)
+
+
+def test_savgol_keeps_polynomials():
+    x = np.linspace(-1, 1, 101)
+    quadratic = 3 * x ** 2 - x + 2
+    assert np.allclose(savgol(quadratic, 11, 2), quadratic)
+    noisy = _curve()
+    smoothed = savgol(noisy, 21, 3)
+    assert np.nanstd(np.diff(smoothed)) < np.nanstd(np.diff(noisy))
+    # gaps keep the raw samples
+    assert np.isnan(smoothed[510])
+
+
+def test_despike_and_mad():
+    values = np.sin(np.linspace(0, 20, 2000))
+    values[100] = 50.0
+    cleaned, spikes = despike(values)
+    assert spikes[100] and spikes.sum() == 1
+    assert abs(cleaned[100] - np.nanmedian(values[95:106])) < 1e-12
+
+    values = _curve()
+    median, mad = rolling_mad(values, 11)
+    window = values[200:211]
+    assert median[205] == pytest.approx(np.median(window))
+    assert mad[205] == pytest.approx(np.median(np.abs(window
+                                                      - np.median(window))))
+
+
+def test_filter_well_stacks_curves():
+    data = {'DEPT': np.arange(2000.0), 'GR': _curve(seed=1),
+            'RHOB': _curve(seed=2)}
+    filtered = filter_well(data, method='mean', window=5)
+    assert list(filtered) == ['GR', 'RHOB']
+    assert np.allclose(filtered['RHOB'], rolling_mean(data['RHOB'], 5),
+                       equal_nan=True)
+    with pytest.raises(ValueError):
+        filter_well(data, method='gaussian')
+
+
+def test_subplot_curve_filtered_overlay():
+    fig, ax = plt.subplots()
+    values = _curve()
+    subplot_curve(plot=ax, fig=fig, xdata=values, ydata=np.arange(2000.0),
+                  filtered='median', filter_window=21, x_factor=2.0)
+    raw, smooth = ax.get_lines()
+    assert np.allclose(smooth.get_xdata(), rolling_median(values, 21),
+                       equal_nan=True)
+    assert smooth.get_transform() == raw.get_transform()
+    plt.close(fig)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from petrophys.data.geomech import (
+    castagna_vs,
+    elastic_properties,
+    field_elastic_properties,
+    well_elastic_properties,
+    zone_values,
+)
+
+
+def test_elastic_properties():
+    vp, vs, rho = np.array([4000.0]), np.array([2400.0]), np.array([2500.0])
+    props = elastic_properties(vp, vs, rho)
+    G = 2500.0 * 2400.0 ** 2
+    PR = (4000.0 ** 2 - 2 * 2400.0 ** 2) / (2 * (4000.0 ** 2 - 2400.0 ** 2))
+    np.testing.assert_allclose(props['G'], G / 1e9)
+    np.testing.assert_allclose(props['PR'], PR)
+    np.testing.assert_allclose(props['E'], 2 * G * (1 + PR) / 1e9)
+
+
+def test_elastic_properties_rejects_vs_above_vp():
+    props = elastic_properties([2000.0], [2500.0], [2500.0])
+    assert np.isnan(props['E'][0])
+    assert np.isnan(props['PR'][0])
+
+
+def test_well_elastic_properties_from_slowness():
+    data = {
+        'DEPT': np.array([100.0, 101.0]),
+        'DT': np.array([60.0, np.nan]),
+        'DTS': np.array([100.0, 100.0]),
+        'RHOB': np.array([2.5, 2.5]),
+    }
+    units = {'DT': 'US/F', 'DTS': 'US/F', 'RHOB': 'G/C3'}
+    props = well_elastic_properties(data, units=units)
+    np.testing.assert_allclose(props['Vp'][0], 0.3048e6 / 60.0)
+    np.testing.assert_allclose(props['rho'], [2500.0, 2500.0])
+    assert np.isnan(props['E'][1])
+
+    wells = field_elastic_properties({'A': data, 'B': data}, units=units)
+    np.testing.assert_allclose(wells['B']['E'], props['E'])
+
+
+def test_well_elastic_properties_castagna():
+    data = {'DEPT': np.array([1.0]), 'VP': np.array([4000.0]),
+            'RHOB': np.array([2.5])}
+    units = {'VP': 'M/S', 'RHOB': 'G/C3'}
+    props = well_elastic_properties(data, units=units, vs_estimate='castagna')
+    np.testing.assert_allclose(props['Vs'], castagna_vs([4000.0]))
+    with pytest.raises(ValueError):
+        well_elastic_properties(data, units=units, vs_estimate='unknown')
+
+
+def test_zone_values():
+    codes = zone_values([1.0, 5.0, 12.0, 25.0], [10.0, 0.0], [20.0, 9.0],
+                        [1, 2])
+    np.testing.assert_array_equal(codes, [2.0, 2.0, 1.0, np.nan])
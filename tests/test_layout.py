@@ -0,0 +1,136 @@
+import matplotlib
+import numpy as np
+import pytest
+
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+
+from petrophys.visualization.layout import (  # noqa: E402
+    CurveSpec,
+    LayoutSpec,
+    TrackSpec,
+    compile_layout,
+    layout_from_graphs,
+    load_layout,
+    render_layout,
+    save_layout,
+)
+from petrophys.visualization.visualize import (  # noqa: E402
+    well_curve2,
+    well_curve3,
+)
+
+
+def _spec():
+    return LayoutSpec(tracks=(
+        TrackSpec(curves=(CurveSpec('GR', color='c', fill_to=0.0),
+                          CurveSpec('NPHI', xlim_low=0.0, xlim_high=0.5))),
+        TrackSpec(curves=(CurveSpec('RHOB'),)),
+    ))
+
+
+def _data():
+    depth = np.linspace(3000, 3100, 50)
+    return {
+        'DEPT': depth,
+        'GR': np.linspace(20, 120, 50),
+        'NPHI': np.full(50, 0.2),
+        'RHOB': np.full(50, 2.5),
+    }
+
+
+def test_compile_layout_is_cached():
+    plan = compile_layout(_spec())
+    assert plan is compile_layout(_spec())
+    assert plan.mnemonics == {'DEPT', 'GR', 'NPHI', 'RHOB'}
+    assert [step[:2] for step in plan.steps] == [(0, 0), (0, 1), (1, 0)]
+
+
+def test_validate_layout_rejects_bad_limits():
+    spec = LayoutSpec(tracks=(
+        TrackSpec(curves=(CurveSpec('GR', xlim_low=10, xlim_high=10),)),
+    ))
+    with pytest.raises(ValueError):
+        compile_layout(spec)
+
+
+def test_render_layout_missing_curve():
+    data = _data()
+    del data['RHOB']
+    with pytest.raises(KeyError):
+        render_layout(_spec(), data, show=False)
+
+
+def test_render_layout_draws_tracks():
+    fig = render_layout(_spec(), _data(), show=False)
+    # two tracks plus one twin axes for NPHI
+    assert len(fig.axes) == 3
+    assert fig.axes[0].yaxis_inverted()
+
+
+def test_layout_json_roundtrip(tmp_path):
+    path = tmp_path / 'layout.json'
+    save_layout(_spec(), path)
+    assert load_layout(path) == _spec()
+
+
+def test_layout_from_graphs():
+    depth = np.arange(5.0)
+    GRAPHS = [[[0.5, 'c', 2, 'GR', 'GR (API)', depth, 'DEPTH (m)', depth,
+                0, 150, True]]]
+    spec, data = layout_from_graphs(GRAPHS, twiny=False)
+    curve = spec.tracks[0].curves[0]
+    assert curve.label == 'GR (API)'
+    assert curve.legend
+    assert data[curve.mnemonic] is depth
+
+
+def _graph(label, color, ylabel, depth):
+    return [0.5, color, 0, label, label, np.linspace(0, 1, depth.size),
+            ylabel, depth, None, None, False]
+
+
+def test_well_curve2_keeps_legacy_rendering(monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    depth = np.arange(10.0)
+
+    # one graph: every curve on the same axes, the last y label wins
+    well_curve2([[_graph('GR', 'c', 'DEPTH (m)', depth),
+                  _graph('NPHI', 'k', 'TVD (m)', depth)]])
+    fig = plt.gcf()
+    assert len(fig.axes) == 1
+    assert len(fig.axes[0].get_lines()) == 2
+    assert fig.axes[0].get_ylabel() == 'TVD (m)'
+    plt.close(fig)
+
+    # several graphs: extra curves on twin axes, y labels per graph
+    well_curve2([[_graph('GR', 'c', 'DEPTH (m)', depth),
+                  _graph('NPHI', 'k', 'DEPTH (m)', depth)],
+                 [_graph('RHOB', 'b', 'TVD (m)', depth)]])
+    fig = plt.gcf()
+    assert len(fig.axes) == 3
+    assert fig.axes[1].get_ylabel() == 'TVD (m)'
+    plt.close(fig)
+
+    well_curve3([[_graph('GR', 'c', 'DEPTH (m)', depth),
+                  _graph('NPHI', 'k', 'DEPTH (m)', depth)],
+                 [_graph('RHOB', 'b', 'TVD (m)', depth)]])
+    fig = plt.gcf()
+    assert len(fig.axes) == 2
+    assert fig.axes[0].get_title() == 'GRNPHI'
+    assert fig.axes[1].get_ylabel() == 'TVD (m)'
+    plt.close(fig)
+
+
+def test_reversed_limits_invert_the_track(monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    depth = np.arange(10.0)
+    graph = _graph('NPHI', 'k', 'DEPTH (m)', depth)
+    graph[8:10] = [0.45, -0.15]
+    well_curve2([[graph]])
+    fig = plt.gcf()
+    assert fig.axes[0].get_xlim() == (0.45, -0.15)
+    assert fig.axes[0].xaxis_inverted()
+    plt.close(fig)
+
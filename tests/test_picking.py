@@ -0,0 +1,124 @@
+import time
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+from matplotlib.backend_bases import MouseEvent  # noqa: E402
+
+from petrophys.visualization.picking import (  # noqa: E402
+    DepthIndex, GridIndex, Picker, attach_picker)
+
+
+def _move(fig, x, y):
+    event = MouseEvent('motion_notify_event', fig.canvas, x, y)
+    fig.canvas.callbacks.process('motion_notify_event', event)
+    return event
+
+
+def test_grid_index_matches_brute_force():
+    rng = np.random.default_rng(0)
+    xy = rng.uniform(0, 1000, (200000, 2))
+    xy[5] = np.nan
+    grid = GridIndex(xy, cell=8)
+    queries = rng.uniform(0, 1000, (200, 2))
+
+    start = time.perf_counter()
+    found = [grid.nearest(x, y) for x, y in queries]
+    assert (time.perf_counter() - start) / len(queries) < 1e-3
+
+    for (x, y), (index, distance) in zip(queries, found):
+        brute = np.hypot(xy[:, 0] - x, xy[:, 1] - y)
+        best = np.nanargmin(brute)
+        if brute[best] <= 8:
+            assert index == best
+            assert np.isclose(distance, brute[best])
+        else:
+            assert index is None
+    assert GridIndex(np.empty((0, 2))).nearest(1, 1) == (None, np.inf)
+
+
+def test_depth_index_nearest():
+    depth = np.array([1003.0, 1000.0, np.nan, 1001.0, 1002.0])
+    index = DepthIndex(depth)
+    assert index.nearest(1000.4) == 1
+    assert index.nearest(1000.6) == 3
+    assert index.nearest(990.0) == 1
+    assert index.nearest(1010.0) == 0
+
+
+def test_scatter_tooltip_and_rebuild_on_zoom():
+    fig, ax = plt.subplots()
+    x = np.arange(100.0)
+    collection = ax.scatter(x, x ** 2)
+    depth = 2000.0 + x
+    picker = Picker(fig, well='CAP-01')
+    picker.add_scatter(collection, {'depth': depth})
+    fig.canvas.draw()
+
+    px, py = ax.transData.transform((10.0, 100.0))
+    picked = picker.pick(_move(fig, px + 2, py))
+    assert picked['index'] == 10
+    assert picked['values']['depth'] == 2010.0
+    tooltip = picker._tooltips[ax]
+    assert tooltip.get_visible()
+    assert 'well: CAP-01' in tooltip.get_text()
+    assert 'depth: 2010' in tooltip.get_text()
+
+    grid = picker.grid(collection)
+    assert picker.grid(collection) is grid
+    ax.set_xlim(50, 60)
+    ax.set_ylim(2500, 3600)
+    assert picker.grid(collection) is not grid
+    px, py = ax.transData.transform((55.0, 3025.0))
+    assert picker.pick(_move(fig, px, py))['index'] == 55
+
+    # far from every point the tooltip is hidden
+    _move(fig, *ax.transAxes.transform((0.01, 0.99)))
+    assert not tooltip.get_visible()
+    plt.close(fig)
+
+
+def test_tracks_are_linked():
+    depth = 1000.0 + 0.5 * np.arange(400)
+    fig, (ax1, ax2) = plt.subplots(1, 2, sharey=True)
+    ax1.plot(np.sin(depth), depth, label='GR')
+    line, = ax2.plot(np.cos(depth), depth, label='RHOB')
+    ax2.set_xlim(-2, 2)
+    picker = attach_picker(fig, well='CAP-01')
+    assert len(picker.tracks) == 2
+    fig.canvas.draw()
+
+    px, py = ax2.transData.transform((0.0, 1050.2))
+    picked = picker.pick(_move(fig, px, py))
+    assert picked['artist'] is line
+    assert picked['values']['depth'] == 1050.0
+    assert np.isclose(picked['values']['RHOB'], np.cos(1050.0))
+    for ax in (ax1, ax2):
+        assert picker._highlights[ax].get_ydata()[0] == 1050.0
+    plt.close(fig)
+
+
+def test_well_curve_pick(monkeypatch):
+    import lasio
+    from petrophys.visualization.visualize import well_curve
+
+    size = 300
+    las = lasio.LASFile()
+    las.well['WELL'].value = 'TEST-1'
+    las.append_curve('DEPT', 1000.0 + 0.1 * np.arange(size), unit='m')
+    for mnemonic, unit in (('GR', 'gAPI'), ('DT', 'us/m'),
+                           ('RHOB', 'g/cm3'), ('DRHO', 'g/cm3'),
+                           ('NPHI', 'v/v')):
+        las.append_curve(mnemonic, np.linspace(1, 2, size), unit=unit)
+    fig = well_curve(las, show=False, pick=True)
+    fig.canvas.draw()
+    ax = fig.axes[2]
+    px, py = ax.transData.transform((1.5, 1010.0))
+    _move(fig, px, py)
+    texts = [child.get_text() for a in fig.axes for child in a.texts
+             if child.get_visible()]
+    assert any('well: TEST-1' in text and 'depth: 1010' in text
+               for text in texts)
+    plt.close(fig)
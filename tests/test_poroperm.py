@@ -0,0 +1,98 @@
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from petrophys.data.cores import read_core_measurements  # noqa: E402
+from petrophys.data.poroperm import (  # noqa: E402
+    fit_groups,
+    fit_poroperm,
+    permeability_curve,
+    transform_table,
+)
+from petrophys.visualization.visualize import (  # noqa: E402
+    depth_intervals_porosity,
+)
+
+RAW = Path(__file__).resolve().parents[1] / 'data' / 'raw'
+
+
+def _plugs(slope=0.15, intercept=-1.0, size=200, seed=0):
+    rng = np.random.default_rng(seed)
+    porosity = rng.uniform(2, 20, size)
+    permeability = 10 ** (slope * porosity + intercept
+                          + rng.normal(0, 0.1, size))
+    return porosity, permeability
+
+
+def test_fit_poroperm():
+    porosity, permeability = _plugs()
+    permeability[:5] = [np.nan, 0.0, -1.0, np.nan, np.nan]
+    transform = fit_poroperm(porosity, permeability, n_boot=200, seed=1)
+    assert transform.n == 195
+    assert transform.slope == pytest.approx(0.15, abs=0.01)
+    assert transform.intercept == pytest.approx(-1.0, abs=0.1)
+    assert transform.r2 > 0.9
+    assert transform.samples.shape == (200, 2)
+
+    low, high = transform.band([5.0, 15.0])
+    k = transform.apply([5.0, 15.0])
+    assert np.all(low < k) and np.all(k < high)
+    # v/v porosity is converted to the % of the fit
+    assert np.allclose(transform.apply([0.05, 0.15], unit='v/v'), k)
+    # the bootstrap samples are left out of equality and hashing
+    again = fit_poroperm(porosity, permeability, n_boot=200, seed=1)
+    assert transform == again and hash(transform) == hash(again)
+
+
+def test_fit_groups():
+    frames = []
+    for well, slope in [('A', 0.1), ('B', 0.2)]:
+        porosity, permeability = _plugs(slope=slope)
+        frames.append(pd.DataFrame({'well': well, 'porosity': porosity,
+                                    'permeability': permeability}))
+    frames.append(pd.DataFrame({'well': ['C'], 'porosity': [10.0],
+                                'permeability': [1.0]}))
+    frame = pd.concat(frames, ignore_index=True)
+    transforms = fit_groups(frame, n_boot=50, seed=0, max_workers=2)
+    assert list(transforms) == ['A', 'B']
+    assert transforms['A'].slope == pytest.approx(0.1, abs=0.01)
+    assert transforms['B'].slope == pytest.approx(0.2, abs=0.01)
+    table = transform_table(transforms)
+    assert list(table['group']) == ['A', 'B']
+    assert (table['slope_std'] > 0).all()
+
+    again = fit_groups(frame, n_boot=50, seed=0)
+    assert np.array_equal(again['A'].samples, transforms['A'].samples)
+
+
+def test_permeability_curve():
+    transforms = {
+        'upper': fit_poroperm(*_plugs(slope=0.1)),
+        'lower': fit_poroperm(*_plugs(slope=0.2)),
+    }
+    porosity = np.array([10.0, 10.0, 10.0, np.nan])
+    zones = np.array(['upper', 'lower', 'other', 'upper'])
+    k = permeability_curve(porosity, transforms, zones)
+    assert k[0] == pytest.approx(transforms['upper'].apply(10.0))
+    assert k[1] == pytest.approx(transforms['lower'].apply(10.0))
+    assert np.isnan(k[2]) and np.isnan(k[3])
+    with pytest.raises(ValueError):
+        permeability_curve(porosity, transforms)
+
+
+def test_depth_intervals_porosity(monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    km = read_core_measurements(
+        RAW / 'cores' / 'CAP-01_kernmetingen.csv')
+    transform = fit_poroperm(km['porosity'], km['permeability'], n_boot=100,
+                             seed=0)
+    assert transform.slope > 0
+    depth_intervals_porosity(km['porosity'], km['permeability'], km['depth'],
+                             'Porosity (%)', 'Permeability (mD)', 'Depth (m)',
+                             'CAP-01', yscale='log',
+                             poroperm=[('CAP-01', transform)])
@@ -0,0 +1,75 @@
+import threading
+import time
+
+import lasio
+import numpy as np
+
+from petrophys.data.prefetch import WellBrowser, data_nbytes
+
+
+class SlowLoader:
+    def __init__(self, delay=0.05, size=1000):
+        self.delay = delay
+        self.size = size
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, source):
+        with self.lock:
+            self.calls.append(source)
+        time.sleep(self.delay)
+        return {'DEPT': np.arange(self.size, dtype=float),
+                'GR': np.full(self.size, float(source))}
+
+
+def _wait(browser, indices, timeout=5.0):
+    end = time.monotonic() + timeout
+    while not all(browser.is_loaded(i) for i in indices):
+        assert time.monotonic() < end
+        time.sleep(0.01)
+
+
+def test_prefetch_ahead():
+    loader = SlowLoader()
+    with WellBrowser(range(10), loader=loader, ahead=2) as browser:
+        assert browser.get(0)['GR'][0] == 0.0
+        _wait(browser, [1, 2])
+        start = time.monotonic()
+        assert browser.next()['GR'][0] == 1.0
+        assert time.monotonic() - start < loader.delay
+        _wait(browser, [3])
+        assert sorted(set(loader.calls)) == [0, 1, 2, 3]
+        assert len(loader.calls) == 4
+
+
+def test_jump_cancels_and_memory_budget():
+    loader = SlowLoader(delay=0.1, size=1000)
+    well = 2 * 1000 * 8
+    with WellBrowser(range(20), loader=loader, ahead=3,
+                     max_bytes=3 * well, max_workers=1) as browser:
+        browser.get(0)
+        browser.get(10)
+        # let the remaining prefetches finish
+        browser._pool.shutdown(wait=True)
+        # most of the prefetches around 0 never ran
+        assert 2 not in loader.calls and 3 not in loader.calls
+        with browser._lock:
+            loaded = dict(browser._loaded)
+        assert 10 in loaded and 11 in loaded
+        assert sum(data_nbytes(d) for d in loaded.values()) <= 3 * well
+
+
+def test_iterate():
+    with WellBrowser(['a', 'b'], loader=str.upper) as browser:
+        assert list(browser) == [('a', 'A'), ('b', 'B')]
+        assert browser.next() is None
+        assert browser.previous() == 'A'
+
+
+def test_data_nbytes():
+    las = lasio.LASFile()
+    las.append_curve('DEPT', np.arange(100, dtype=float))
+    las.append_curve('GR', np.ones(100))
+    assert data_nbytes(las) == 2 * 100 * 8
+    assert data_nbytes(np.ones((3, 10))) == 240
+    assert data_nbytes({'GR': np.ones(10)}) == 80
@@ -0,0 +1,81 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import numpy as np  # noqa: E402
+
+from petrophys.data.qc import (  # noqa: E402
+    depth_report,
+    flat_mask,
+    qc_field,
+    qc_well,
+    run_lengths,
+    spike_mask,
+)
+from petrophys.visualization.visualize import well_curve  # noqa: E402
+
+
+def _well(size=500, seed=0):
+    rng = np.random.default_rng(seed)
+    depth = 1000.0 + 0.1 * np.arange(size)
+    gr = 60 + rng.normal(0, 2, size)
+    gr[100:130] = np.nan
+    gr[200:220] = 75.0
+    gr[300] = 500.0
+    return {'DEPT': depth, 'GR': gr}
+
+
+def test_run_lengths():
+    starts, lengths = run_lengths([0, 1, 1, 0, 1, 0, 1, 1, 1])
+    assert starts.tolist() == [1, 4, 6]
+    assert lengths.tolist() == [2, 1, 3]
+    starts, lengths = run_lengths([])
+    assert starts.size == 0 and lengths.size == 0
+
+
+def test_flat_and_spike_masks():
+    data = _well()
+    flat = flat_mask(data['GR'], min_length=10)
+    assert np.flatnonzero(flat).tolist() == list(range(200, 220))
+    assert not flat_mask(data['GR'], min_length=21).any()
+
+    spikes = spike_mask(data['GR'])
+    assert spikes[300]
+    assert spikes.sum() == 1
+
+
+def test_depth_report():
+    depth = 1000.0 + 0.1 * np.arange(50)
+    report = depth_report(depth)
+    assert report['monotonic'] and report['irregular_steps'] == 0
+    assert np.isclose(report['step'], 0.1)
+
+    depth[20:] += 0.5
+    report = depth_report(depth)
+    assert report['irregular_steps'] == 1
+    assert np.isclose(report['first_irregular'], 1001.9)
+    assert not depth_report([1.0, 3.0, 2.0])['monotonic']
+
+
+def test_qc_well_and_field():
+    report = qc_well(_well())
+    row = report.set_index('curve').loc['GR']
+    assert row['longest_nan_run'] == 30
+    assert row['longest_flat_run'] == 20
+    assert row['spikes'] == 1
+    assert np.isclose(row['pct_nan'], 6.0)
+
+    field = qc_field({'A': _well(seed=1), 'B': _well(seed=2)}, max_workers=2)
+    assert field['well'].tolist() == ['A', 'B']
+    assert field.columns[0] == 'well'
+
+
+def test_well_curve_qc(monkeypatch):
+    monkeypatch.setattr('matplotlib.pyplot.show', lambda: None)
+    las = lasio.LASFile()
+    data = _well()
+    las.append_curve('DEPT', data['DEPT'], unit='m')
+    for mnemonic, unit in [('GR', 'gAPI'), ('DT', 'us/ft'), ('RHOB', 'g/cm3'),
+                           ('DRHO', 'g/cm3'), ('NPHI', 'v/v')]:
+        las.append_curve(mnemonic, data['GR'], unit=unit)
+    well_curve(las, qc=True)
@@ -0,0 +1,58 @@
+import lasio
+import numpy as np
+import pytest
+
+from petrophys.data.query import depth_slice, iter_query, query
+from petrophys.data.store import write_well
+
+
+def _store(root):
+    for name, start in (('A', 100.0), ('B', 105.0)):
+        las = lasio.LASFile()
+        depth = np.arange(start, start + 10.0)
+        las.append_curve('DEPT', depth, unit='M')
+        las.append_curve('GR', depth * 2)
+        if name == 'A':
+            las.append_curve('NPHI', np.full(10, 0.2))
+        write_well(las, root, name=name)
+
+
+def test_depth_slice():
+    depth = np.arange(10.0)
+    assert depth_slice(depth, 2.0, 4.0) == slice(2, 5)
+    assert depth_slice(depth, 2.5) == slice(3, 10)
+    assert depth_slice(depth, 20.0, 30.0) == slice(10, 10)
+
+
+def test_query_concatenates_wells(tmp_path):
+    _store(tmp_path)
+    frame = query(tmp_path, ['GR', 'NPHI'], top=104.0, base=106.0)
+    assert list(frame['well']) == ['A', 'A', 'A', 'B', 'B']
+    np.testing.assert_allclose(frame['DEPT'], [104, 105, 106, 105, 106])
+    np.testing.assert_allclose(frame['GR'], frame['DEPT'] * 2)
+    assert frame['NPHI'].isna().sum() == 2
+
+
+def test_query_zone(tmp_path):
+    _store(tmp_path)
+    zones = {'B': (100.0, 106.0)}
+    frame = query(tmp_path, ['GR'], zone=zones)
+    np.testing.assert_allclose(frame['DEPT'], [105, 106])
+    with pytest.raises(ValueError):
+        query(tmp_path, ['GR'], zone='Slochteren')
+
+
+def test_query_zone_without_base(tmp_path):
+    _store(tmp_path)
+    # the zone runs to the bottom of the well, the base still applies
+    frame = query(tmp_path, ['GR'], base=108.0, zone={'A': (106.0, None)})
+    np.testing.assert_allclose(frame['DEPT'], [106, 107, 108])
+    frame = query(tmp_path, ['GR'], zone={'A': (107.0, None)})
+    np.testing.assert_allclose(frame['DEPT'], [107, 108, 109])
+
+
+def test_iter_query(tmp_path):
+    _store(tmp_path)
+    chunks = dict(iter_query(tmp_path, ['GR'], wells=['B'], base=106.0))
+    assert list(chunks) == ['B']
+    np.testing.assert_allclose(chunks['B']['GR'], [210.0, 212.0])
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from petrophys.data.shared import (
+    SharedCurves,
+    attach_well,
+    detach_all,
+    map_wells,
+)
+
+
+def _mean_gr(curves, offset=0.0):
+    return float(np.nanmean(curves['GR'])) + offset
+
+
+def _writeable(curves):
+    return curves['GR'].flags.writeable
+
+
+def _well(size=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {'DEPT': 1000.0 + 0.1 * np.arange(size),
+            'GR': rng.normal(60, 10, size)}
+
+
+def test_attach_is_zero_copy():
+    data = _well()
+    with SharedCurves() as shared:
+        spec = shared.add('A', data)
+        assert shared.nbytes() >= 2 * 1000 * 8
+        curves = attach_well(spec)
+        assert np.array_equal(curves['GR'], data['GR'])
+        assert not curves['GR'].flags.writeable
+        assert curves['DEPT'].ctypes.data % 64 == 0
+        assert curves['GR'].ctypes.data % 64 == 0
+
+        with pytest.raises(ValueError):
+            curves['GR'][0] = 1.0
+        # attaching again maps the same memory
+        assert np.shares_memory(attach_well(spec)['GR'], curves['GR'])
+        with pytest.raises(ValueError):
+            shared.add('A', data)
+        del curves
+        detach_all()
+
+
+def test_map_wells():
+    wells = {name: _well(seed=i) for i, name in enumerate('ABC')}
+    with SharedCurves(dtype=np.float32) as shared:
+        for name, data in wells.items():
+            shared.add(name, data, curves=['GR'])
+        result = map_wells(_mean_gr, shared.wells, 1.0, max_workers=2)
+        assert list(result) == ['A', 'B', 'C']
+        for name, data in wells.items():
+            assert result[name] == pytest.approx(
+                np.mean(data['GR'].astype(np.float32)) + 1.0, rel=1e-5)
+        assert not any(map_wells(_writeable, shared.wells).values())
+
+
+def test_close_removes_blocks():
+    shared = SharedCurves()
+    spec = shared.add('A', _well())
+    shared.close()
+    assert 'A' not in shared
+    with pytest.raises(FileNotFoundError):
+        from multiprocessing import shared_memory
+        shared_memory.SharedMemory(name=spec.buffer)
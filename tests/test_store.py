@@ -0,0 +1,47 @@
+import lasio
+import numpy as np
+import pytest
+
+from petrophys.data.store import (
+    compact_curves,
+    list_wells,
+    read_metadata,
+    read_well,
+    well_name,
+    write_well,
+)
+
+
+def _lasfile():
+    las = lasio.LASFile()
+    las.well['WELL'].value = 'TEST- 1'
+    las.append_curve('DEPT', np.array([12.0, 11.0, 10.0]), unit='M')
+    las.append_curve('GR', np.array([30.0, np.nan, 50.0]), unit='GAPI')
+    return las
+
+
+def test_well_name():
+    assert well_name(_lasfile()) == 'TEST-1'
+
+
+def test_compact_curves_is_float32_and_read_only():
+    las = _lasfile()
+    curves = compact_curves(las)
+    assert curves['GR'].dtype == np.float32
+    with pytest.raises(ValueError):
+        curves['GR'][0] = 1.0
+    # the lasio data itself stays writeable
+    las['GR'][0] = 1.0
+
+
+def test_write_and_read_well(tmp_path):
+    write_well(_lasfile(), tmp_path)
+    assert list_wells(tmp_path) == ['TEST-1']
+    assert read_metadata(tmp_path, 'TEST-1')['curves']['GR']['unit'] == 'GAPI'
+
+    curves = read_well(tmp_path, 'TEST-1', curves=['GR'])
+    assert isinstance(curves['GR'], np.memmap)
+    assert not curves['GR'].flags.writeable
+    # stored in increasing depth order
+    np.testing.assert_array_equal(curves['DEPT'], [10.0, 11.0, 12.0])
+    np.testing.assert_array_equal(curves['GR'], [50.0, np.nan, 30.0])
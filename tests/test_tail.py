@@ -0,0 +1,85 @@
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import numpy as np  # noqa: E402
+
+from petrophys.data.tail import GrowableCurves, LasTail  # noqa: E402
+from petrophys.visualization.layout import CurveSpec  # noqa: E402
+from petrophys.visualization.live import LiveWellPlot  # noqa: E402
+
+LAS = Path(__file__).resolve().parents[1] / 'data' / 'raw' / 'logs' \
+    / 'CAPELLE__1.las'
+
+
+def _split(path, first):
+    content = open(LAS, 'rb').read()
+    cut = content.index(b'~ASCII') + first
+    path.write_bytes(content[:cut])
+    return content[cut:]
+
+
+def test_growable_curves():
+    curves = GrowableCurves(['DEPT', 'GR'], capacity=2)
+    curves.append([[1.0, 10.0], [2.0, 20.0]])
+    curves.append([[3.0, 30.0]])
+    assert curves.capacity == 4
+    assert curves['GR'].tolist() == [10.0, 20.0, 30.0]
+    assert curves.rows(1).tolist() == [[2.0, 20.0], [3.0, 30.0]]
+    assert curves.keys() == ['DEPT', 'GR']
+
+
+def test_tail_reads_appended_rows(tmp_path):
+    path = tmp_path / 'live.las'
+    rest = _split(path, 5000)
+    tail = LasTail(path, capacity=16)
+    first = tail.update()
+    assert first > 0
+    assert tail.update() == 0
+
+    # half a line is kept for the next update
+    with open(path, 'ab') as f:
+        f.write(rest[:30])
+    partial = tail.update()
+    with open(path, 'ab') as f:
+        f.write(rest[30:])
+    total = first + partial + tail.update()
+
+    expected = lasio.read(LAS)
+    assert total == len(expected['DEPT'])
+    assert np.allclose(tail.curves['SON'], expected['SON'], equal_nan=True)
+    with open(path, 'ab') as f:
+        f.write(b'  3682.1364  -999.2500\n# comment\n')
+    assert tail.update() == 1
+    assert np.isnan(tail.curves['SON'][-1])
+
+    # a rewritten file is read from the start
+    _split(path, 1000)
+    assert tail.update() == len(tail.curves) > 0
+    assert len(tail.curves) < total
+
+
+def test_live_plot(tmp_path):
+    path = tmp_path / 'live.las'
+    rest = _split(path, 5000)
+    tail = LasTail(path)
+    plot = LiveWellPlot(tail, [CurveSpec('SON', 'r')], max_segments=3)
+    assert plot.update(draw=False) > 0
+    top = plot.axes[0].get_ylim()
+
+    step = len(rest) // 5
+    for i in range(5):
+        with open(path, 'ab') as f:
+            f.write(rest[i * step:(i + 1) * step])
+        plot.update()
+    with open(path, 'ab') as f:
+        f.write(rest[5 * step:])
+    plot.update()
+
+    assert plot.drawn == len(tail.curves)
+    assert len(plot.segments[0]) <= 3
+    low, high = plot.axes[0].get_ylim()
+    assert high == top[1] and low > top[0]
+    assert low == np.nanmax(tail.curves['DEPT'])
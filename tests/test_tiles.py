@@ -0,0 +1,69 @@
+import io
+
+import matplotlib
+matplotlib.use('Agg')
+
+import matplotlib.image  # noqa: E402
+import numpy as np  # noqa: E402
+import pytest  # noqa: E402
+
+from petrophys.visualization.layout import CurveSpec  # noqa: E402
+from petrophys.visualization.tiles import TileRenderer  # noqa: E402
+
+
+def _well(size=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {'DEPT': 1000.0 + 0.1 * np.arange(size),
+            'GR': rng.normal(60, 10, size),
+            'RHOB': rng.normal(2.5, 0.1, size)}
+
+
+CURVES = [CurveSpec('GR', 'g'), CurveSpec('RHOB', 'b')]
+
+
+def test_levels_and_bounds():
+    renderer = TileRenderer(_well(), CURVES, tile_px=100)
+    # 20000 samples over 100 px tiles need 200 tiles, so 8 levels
+    assert renderer.max_level == 8
+    pixels = renderer.tile_px * renderer.ntiles(renderer.max_level)
+    assert pixels / 2 < 20000 <= pixels
+    assert renderer.tile_bounds(0, 0) == (renderer.top, renderer.base)
+    assert renderer.tiles_for(1000.0, 2500.0, 1) == [0, 1]
+    assert renderer.tiles_for(1800.0, 1900.0, 3) == [3]
+    with pytest.raises(ValueError):
+        renderer.tile(9, 0)
+    with pytest.raises(ValueError):
+        renderer.tile(1, 2)
+
+
+def test_tile_is_png_of_tile_size():
+    renderer = TileRenderer(_well(), CURVES, tile_px=128, track_px=64)
+    png = renderer.tile(2, 1)
+    assert png.startswith(b'\x89PNG')
+    image = matplotlib.image.imread(io.BytesIO(png))
+    assert image.shape[:2] == (128, 128)
+    # a deep level only draws the points of its tile
+    depth, values = renderer.level_data(0)['GR']
+    assert len(depth) <= 2 * 128
+
+
+def test_memory_and_disk_cache(tmp_path):
+    renderer = TileRenderer(_well(), CURVES, name='A', tile_px=64,
+                            cache_size=4, cache_dir=tmp_path, disk_size=10)
+    assert renderer.prewarm([0, 1, 2], max_workers=4) == 7
+    assert len(renderer._memory) == 4
+    files = list(tmp_path.glob('A-*/*.png'))
+    assert len(files) == 7
+
+    # a new renderer of the same well reads the tiles from disk
+    again = TileRenderer(_well(), CURVES, name='A', tile_px=64,
+                         cache_dir=tmp_path)
+    again.render = None
+    assert again.tile(2, 3) == renderer.tile(2, 3)
+
+    renderer.prewarm([3])
+    assert len(list(tmp_path.glob('A-*/*.png'))) <= 10
+
+    # other data gets its own tiles
+    TileRenderer(_well(seed=1), CURVES, name='A', cache_dir=tmp_path)
+    assert len(list(tmp_path.glob('A-*'))) == 2
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from petrophys.data.units import (
+    CurveRegistry,
+    convert,
+    normalize_unit,
+    plan_conversion,
+    scale_factor,
+)
+
+
+def test_normalize_unit():
+    assert normalize_unit('US/F') == 'us/ft'
+    assert normalize_unit(' G/C3 ') == 'g/cm3'
+    assert normalize_unit('ohm.m') == 'ohm.m'
+
+
+def test_scale_factor():
+    assert scale_factor('V/V', '%') == pytest.approx(100)
+    assert scale_factor('US/F', 'us/m') == pytest.approx(1 / 0.3048)
+    assert scale_factor('us/ft', 'm/s') is None
+
+
+def test_convert_fused_slowness_to_velocity():
+    dt = np.array([50.0, 100.0, np.nan])
+    expected = 0.3048e6 / dt
+    np.testing.assert_allclose(convert(dt, 'US/F', 'M/S'), expected)
+    np.testing.assert_allclose(convert(expected, 'm/s', 'us/ft'), dt)
+
+
+def test_convert_in_place():
+    rho = np.array([2.5, 2.65])
+    out = convert(rho, 'g/cm3', 'kg/m3', out=rho)
+    assert out is rho
+    np.testing.assert_allclose(rho, [2500.0, 2650.0])
+
+
+def test_plan_conversion_unknown():
+    with pytest.raises(ValueError):
+        plan_conversion('gAPI', 'm')
+
+
+def test_curve_registry_caches_conversions():
+    registry = CurveRegistry({'DT': np.array([100.0])}, units={'DT': 'US/F'})
+    velocity = registry.get('DT', 'm/s')
+    assert velocity is registry.get('DT', 'M/S')
+    assert not velocity.flags.writeable
+    assert registry.label('DT', 'm/s') == 'DT (m/s)'
+    data, factor = registry.for_plot('DT', 'us/m')
+    assert factor == pytest.approx(1 / 0.3048)
@@ -0,0 +1,172 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import lasio  # noqa: E402
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+import pytest  # noqa: E402
+
+from petrophys.data.upscale import (  # noqa: E402
+    backus,
+    sample_thickness,
+    uniform_layers,
+    upscale,
+    upscale_field,
+    upscale_well,
+)
+from petrophys.visualization.visualize import well_curve  # noqa: E402
+
+
+def _brute(depth, values, top, base, method):
+    weight = sample_thickness(depth)
+    out = []
+    for t, b in zip(top, base):
+        inside = (depth >= t) & (depth < b) & ~np.isnan(values) & \
+            (values > 0 if method != 'arithmetic' else True)
+        w, x = weight[inside], values[inside]
+        if not w.sum():
+            out.append(np.nan)
+        elif method == 'arithmetic':
+            out.append((w * x).sum() / w.sum())
+        elif method == 'harmonic':
+            out.append(w.sum() / (w / x).sum())
+        else:
+            out.append(np.exp((w * np.log(x)).sum() / w.sum()))
+    return np.array(out)
+
+
+def test_uniform_layers():
+    layers = uniform_layers(1000.0, 1025.0, 10.0)
+    assert layers['top'].tolist() == [1000.0, 1010.0, 1020.0]
+    assert layers['base'].tolist() == [1010.0, 1020.0, 1025.0]
+    with pytest.raises(ValueError):
+        uniform_layers(0.0, 1.0, 0.0)
+
+
+def test_sample_thickness():
+    assert np.allclose(sample_thickness([0.0, 0.5, 1.0, 1.5]), 0.5)
+    assert np.allclose(sample_thickness([0.0, 1.0, 3.0]), [1.0, 1.5, 2.0])
+
+
+@pytest.mark.parametrize('method', ['arithmetic', 'harmonic', 'geometric'])
+def test_upscale_matches_brute_force(method):
+    rng = np.random.default_rng(0)
+    depth = np.sort(rng.uniform(1000, 1100, 2000))
+    values = rng.lognormal(0, 1, 2000)
+    values[::13] = np.nan
+    values[5] = -1.0
+    top = np.array([990.0, 1010.0, 1033.3, 1060.0, 1200.0])
+    base = np.array([1010.0, 1033.3, 1060.0, 1101.0, 1300.0])
+    result = upscale(depth, values, top, base, method)
+    np.testing.assert_allclose(result, _brute(depth, values, top, base,
+                                              method))
+    assert np.isnan(result[-1])
+    # depth logged bottom up gives the same layers
+    np.testing.assert_allclose(
+        upscale(depth[::-1], values[::-1], top, base, method), result)
+
+
+def test_upscale_stacked_methods():
+    depth = np.arange(10.0)
+    values = np.stack([np.arange(1.0, 11.0), np.arange(1.0, 11.0)])
+    result = upscale(depth, values, [0.0], [2.0], ['arithmetic', 'harmonic'])
+    np.testing.assert_allclose(result[:, 0], [1.5, 2 / (1 + 1 / 2)])
+    with pytest.raises(ValueError):
+        upscale(depth, values, [0.0], [2.0], ['arithmetic'])
+    with pytest.raises(ValueError):
+        upscale(depth, values[0], [0.0], [2.0], 'mean')
+
+
+def test_backus_of_alternating_beds():
+    depth = np.arange(100.0)
+    vp = np.where(depth % 2 == 0, 3000.0, 5000.0)
+    vs = vp / 2
+    rho = np.where(depth % 2 == 0, 2200.0, 2600.0)
+    result = backus(depth, vp, vs, rho, [0.0], [100.0])
+    p_modulus = 1 / np.mean(1 / (rho * vp ** 2))
+    np.testing.assert_allclose(result['rho'], 2400.0)
+    np.testing.assert_allclose(result['Vp'], np.sqrt(p_modulus / 2400.0))
+    np.testing.assert_allclose(result['Vs'], result['Vp'] / 2)
+    # slower than the thickness average of the velocities
+    assert result['Vp'][0] < 4000.0
+
+
+def _well(seed=0, size=1000):
+    rng = np.random.default_rng(seed)
+    return {'DEPT': 1000.0 + 0.1 * np.arange(size),
+            'NPHI': rng.uniform(0.1, 0.3, size),
+            'PERM': rng.lognormal(2, 1, size)}
+
+
+def test_upscale_well_and_field():
+    layers = uniform_layers(1000.0, 1100.0, 5.0)
+    data = _well()
+    result = upscale_well(data, layers,
+                          {'NPHI': 'arithmetic', 'PERM': 'harmonic'})
+    assert list(result.columns) == ['top', 'base', 'NPHI', 'PERM']
+    np.testing.assert_allclose(result['NPHI'][0], data['NPHI'][:50].mean())
+    np.testing.assert_allclose(result['PERM'][0],
+                               1 / np.mean(1 / data['PERM'][:50]))
+
+    wells = {'A': _well(1), 'B': _well(2)}
+    tops = pd.DataFrame({'unit': ['x', 'y'], 'top': [1000.0, 1040.0],
+                         'base': [1040.0, 1100.0]})
+    field = upscale_field(wells, {'A': layers, 'B': tops}, max_workers=2)
+    assert field.columns[0] == 'well'
+    assert (field['well'] == 'A').sum() == len(layers)
+    assert field.loc[field['well'] == 'B', 'unit'].tolist() == ['x', 'y']
+    assert upscale_field({}, layers).empty
+
+
+def test_upscale_well_elastic():
+    size = 500
+    las = lasio.LASFile()
+    las.append_curve('DEPT', 1000.0 + 0.2 * np.arange(size), unit='m')
+    las.append_curve('DT', np.full(size, 250.0), unit='us/m')
+    las.append_curve('RHOB', np.full(size, 2.4), unit='g/cm3')
+    result = upscale_well(las, uniform_layers(1000.0, 1100.0, 50.0),
+                          methods={}, elastic=True)
+    np.testing.assert_allclose(result['Vp'], 4000.0)
+    np.testing.assert_allclose(result['rho'], 2400.0)
+    assert np.isnan(result['Vs']).all()
+
+
+def test_well_curve_draws_layers():
+    size = 300
+    las = lasio.LASFile()
+    las.append_curve('DEPT', 1000.0 + 0.1 * np.arange(size), unit='m')
+    for mnemonic, unit in (('GR', 'gAPI'), ('DT', 'us/m'),
+                           ('RHOB', 'g/cm3'), ('DRHO', 'g/cm3'),
+                           ('NPHI', 'v/v')):
+        las.append_curve(mnemonic, np.linspace(1, 2, size), unit=unit)
+    layers = upscale_well(las, uniform_layers(1000.0, 1030.0, 10.0),
+                          {'GR': 'arithmetic'})
+    fig = well_curve(las, show=False, layers=layers)
+    step = fig.axes[0].get_lines()[-1]
+    assert step.get_label() == 'GR (upscaled)'
+    assert len(step.get_xdata()) == 2 * len(layers)
+    assert len(fig.axes[1].get_lines()) == 1
+    plt.close(fig)
+
+
+def test_well_curve_converts_upscaled_dt():
+    size = 300
+    las = lasio.LASFile()
+    las.append_curve('DEPT', 1000.0 + 0.1 * np.arange(size), unit='m')
+    for mnemonic, unit in (('GR', 'gAPI'), ('DT', 'us/ft'),
+                           ('RHOB', 'g/cm3'), ('DRHO', 'g/cm3'),
+                           ('NPHI', 'v/v')):
+        las.append_curve(mnemonic, np.linspace(80, 100, size), unit=unit)
+    layers = upscale_well(las, uniform_layers(1000.0, 1030.0, 10.0),
+                          {'DT': 'arithmetic'})
+    fig = well_curve(las, show=False, dt_unit='m/s', layers=layers)
+    ax = fig.axes[1]
+    raw, step = ax.get_lines()
+    assert step.get_label() == 'DT (upscaled)'
+    np.testing.assert_allclose(step.get_xdata()[::2],
+                               1e6 * 0.3048 / layers['DT'])
+    low, high = sorted(ax.get_xlim())
+    assert low <= step.get_xdata().min() and step.get_xdata().max() <= high
+    assert step.get_transform() == raw.get_transform()
+    plt.close(fig)